@@ -0,0 +1,62 @@
+"""Synthetic data for the benchmarks.
+
+Generated data is cached between benchmarks and must not be modified.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+@lru_cache(maxsize=None)
+def make_frame(n_rows: int, n_cols: int=4, seed: int=0) -> pd.DataFrame:
+    """Create a data frame with ``n_cols`` columns of each of the types
+    float, int, string (object), and category.
+
+    Columns are named ``f0, i0, s0, c0, f1, ...``.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(n_cols):
+        data[f"f{i}"] = rng.normal(size=n_rows)
+        data[f"i{i}"] = rng.integers(0, 100, size=n_rows)
+        data[f"s{i}"] = rng.choice(["alpha", "beta", "gamma", "delta"], size=n_rows).astype(object)
+        data[f"c{i}"] = pd.Categorical(rng.choice(list("abcdefgh"), size=n_rows))
+    return pd.DataFrame(data)
+
+
+def make_labels(n: int, prefix: str="label_") -> list:
+    return [f"{prefix}{i:06d}" for i in range(n)]
+
+
+@lru_cache(maxsize=None)
+def make_wide_frame(n_cols: int, n_rows: int=10, seed: int=0) -> pd.DataFrame:
+    """Create a data frame with ``n_cols`` columns of alternating float and
+    object dtype."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i, label in enumerate(make_labels(n_cols)):
+        if i % 2:
+            data[label] = rng.choice(["x", "y"], size=n_rows).astype(object)
+        else:
+            data[label] = rng.normal(size=n_rows)
+    return pd.DataFrame(data)
+
+
+@lru_cache(maxsize=None)
+def make_multiindex(n: int) -> pd.MultiIndex:
+    """Create a 3-level multi-index with ``n`` entries."""
+    n_outer = max(1, int(round(n ** (1 / 3))))
+    n_inner = max(1, n // (n_outer * n_outer))
+    return pd.MultiIndex.from_product(
+        [make_labels(n_outer, "a"), make_labels(n_outer, "b"), range(n_inner)],
+        names=["one", "two", "three"],
+    )
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"rows={n}")
+def frame(request) -> pd.DataFrame:
+    return make_frame(request.param)
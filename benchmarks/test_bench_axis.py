@@ -0,0 +1,98 @@
+"""Column and index selection with ``C`` and ``I``."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles import C, I
+
+from conftest import SIZES, make_labels, make_multiindex, make_wide_frame
+
+# Number of labels to select from the frames
+N_SELECTED = 100
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"labels={n}")
+def n_labels(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def wide_frame(n_labels) -> pd.DataFrame:
+    return make_wide_frame(n_labels)
+
+
+@pytest.fixture
+def long_frame(n_labels) -> pd.DataFrame:
+    return pd.DataFrame({"x": np.arange(n_labels)}, index=make_labels(n_labels))
+
+
+@pytest.fixture
+def mi_frame(n_labels) -> pd.DataFrame:
+    index = make_multiindex(n_labels)
+    return pd.DataFrame({"x": np.arange(len(index))}, index=index)
+
+
+@pytest.mark.benchmark(group="select-columns")
+def test_columns_by_label(benchmark, wide_frame):
+    step = len(wide_frame.columns) // N_SELECTED
+    labels = list(wide_frame.columns[::step])
+    benchmark(lambda: wide_frame.loc[:, C[labels]])
+
+
+@pytest.mark.benchmark(group="select-columns")
+def test_columns_startswith(benchmark, wide_frame):
+    benchmark(lambda: wide_frame.loc[:, C.startswith("label_00")])
+
+
+@pytest.mark.benchmark(group="select-columns")
+def test_columns_combined(benchmark, wide_frame):
+    sel = (C.startswith("label_00") | C.endswith("5")) & ~C.contains("7")
+    benchmark(lambda: wide_frame.loc[:, sel])
+
+
+@pytest.mark.benchmark(group="select-dtypes")
+def test_dtype_float(benchmark, wide_frame):
+    benchmark(lambda: wide_frame.loc[:, C.dtype == float])
+
+
+@pytest.mark.benchmark(group="select-dtypes")
+def test_dtype_str(benchmark, wide_frame):
+    # Samples the values of all object columns
+    benchmark(lambda: wide_frame.loc[:, C.dtype == str])
+
+
+@pytest.mark.benchmark(group="select-dtypes")
+def test_dtype_isin(benchmark, wide_frame):
+    benchmark(lambda: wide_frame.loc[:, C.dtype.isin([float, str])])
+
+
+@pytest.mark.benchmark(group="select-index")
+def test_index_by_label(benchmark, long_frame):
+    step = len(long_frame.index) // N_SELECTED
+    labels = list(long_frame.index[::step])
+    benchmark(lambda: long_frame.loc[I[labels]])
+
+
+@pytest.mark.benchmark(group="select-index")
+def test_index_slice(benchmark, long_frame):
+    labels = long_frame.index
+    sel = I[labels[len(labels) // 4]:labels[len(labels) // 2]]
+    benchmark(lambda: long_frame.loc[sel])
+
+
+@pytest.mark.benchmark(group="select-index")
+def test_index_union(benchmark, long_frame):
+    labels = long_frame.index
+    sel = I[list(labels[:10])] | I[list(labels[-10:])] | ...
+    benchmark(lambda: long_frame.loc[sel])
+
+
+@pytest.mark.benchmark(group="select-index-levels")
+def test_index_level(benchmark, mi_frame):
+    values = list(mi_frame.index.levels[1][::2])
+    benchmark(lambda: mi_frame.loc[I.levels["two"][values]])
+
+
+@pytest.mark.benchmark(group="select-index-levels")
+def test_index_level_startswith(benchmark, mi_frame):
+    benchmark(lambda: mi_frame.loc[I.levels[0].startswith("a00000")])
@@ -0,0 +1,52 @@
+"""Expressions and selections with dask data frames."""
+import pytest
+
+dd = pytest.importorskip("dask.dataframe")
+
+from pandas_paddles import C, I
+from pandas_paddles.dask import DF, compute_aggregates
+
+from conftest import make_frame
+
+
+@pytest.fixture(params=[10_000, 100_000], ids=lambda n: f"rows={n}")
+def ddf(request):
+    df = make_frame(request.param)
+    df.index = df.index.astype("int64")
+    return dd.from_pandas(df, npartitions=8)
+
+
+@pytest.mark.benchmark(group="dask-graph")
+def test_build_row_wise(benchmark, ddf):
+    expr = (DF["f0"] * 2 + DF["f1"]).clip(0) > DF["f2"]
+    benchmark(expr, ddf)
+
+
+@pytest.mark.benchmark(group="dask-compute")
+def test_compute_row_wise(benchmark, ddf):
+    expr = (DF["f0"] * 2 + DF["f1"]).clip(0) > DF["f2"]
+    benchmark(lambda: expr(ddf).compute())
+
+
+@pytest.mark.benchmark(group="dask-compute")
+def test_compute_row_wise_lambda(benchmark, ddf):
+    benchmark(lambda: ((ddf["f0"] * 2 + ddf["f1"]).clip(0) > ddf["f2"]).compute())
+
+
+@pytest.mark.benchmark(group="dask-compute")
+def test_compute_aggregates(benchmark, ddf):
+    exprs = [
+        DF["f0"].clip(upper=DF["f0"].quantile(0.99)),
+        DF["f1"] > DF["f1"].mean(),
+    ]
+    benchmark(lambda: ddf.assign(**dict(zip("ab", compute_aggregates(ddf, *exprs)))).compute())
+
+
+@pytest.mark.benchmark(group="dask-select")
+def test_select_dtype(benchmark, ddf):
+    benchmark(lambda: ddf.loc[:, C.dtype == float])
+
+
+@pytest.mark.benchmark(group="dask-select")
+def test_select_index_slice(benchmark, ddf):
+    benchmark(lambda: ddf.loc[I[100:2000]].compute())
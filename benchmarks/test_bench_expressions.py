@@ -0,0 +1,85 @@
+"""Construction and evaluation of ``DF``- and ``S``-expressions."""
+import pytest
+
+from pandas_paddles import DF, S
+
+
+@pytest.mark.benchmark(group="construct")
+@pytest.mark.parametrize("depth", [1, 10, 100])
+def test_construct_chain(benchmark, depth):
+    def build():
+        expr = DF["f0"]
+        for _ in range(depth):
+            expr = expr.abs()
+        return expr
+    benchmark(build)
+
+
+@pytest.mark.benchmark(group="construct")
+@pytest.mark.parametrize("depth", [1, 10, 100])
+def test_construct_operators(benchmark, depth):
+    def build():
+        expr = DF["f0"]
+        for i in range(depth):
+            expr = expr + i
+        return expr
+    benchmark(build)
+
+
+@pytest.mark.benchmark(group="construct")
+def test_str(benchmark):
+    expr = (DF["f0"] * 2 + DF["f1"]).clip(0, upper=DF["f1"].max()) > DF["f2"]
+    benchmark(str, expr)
+
+
+# Evaluation overhead against the equivalent lambda
+@pytest.mark.benchmark(group="evaluate-column")
+def test_eval_column_DF(benchmark, frame):
+    benchmark(DF["f0"], frame)
+
+
+@pytest.mark.benchmark(group="evaluate-column")
+def test_eval_column_lambda(benchmark, frame):
+    benchmark(lambda df: df["f0"], frame)
+
+
+@pytest.mark.benchmark(group="evaluate-arithmetic")
+def test_eval_arithmetic_DF(benchmark, frame):
+    expr = (DF["f0"] * 2 + DF["f1"]).clip(0, upper=DF["f1"].max()) > DF["f2"]
+    benchmark(expr, frame)
+
+
+@pytest.mark.benchmark(group="evaluate-arithmetic")
+def test_eval_arithmetic_lambda(benchmark, frame):
+    func = lambda df: (df["f0"] * 2 + df["f1"]).clip(0, upper=df["f1"].max()) > df["f2"]
+    benchmark(func, frame)
+
+
+@pytest.mark.benchmark(group="evaluate-str")
+def test_eval_str_DF(benchmark, frame):
+    benchmark(DF["s0"].str.upper().str.startswith("A"), frame)
+
+
+@pytest.mark.benchmark(group="evaluate-str")
+def test_eval_str_lambda(benchmark, frame):
+    benchmark(lambda df: df["s0"].str.upper().str.startswith("A"), frame)
+
+
+@pytest.mark.benchmark(group="evaluate-assign")
+def test_assign_DF(benchmark, frame):
+    benchmark(frame.assign, x=DF["f0"] * DF["i0"], y=DF["s0"].str.len())
+
+
+@pytest.mark.benchmark(group="evaluate-assign")
+def test_assign_lambda(benchmark, frame):
+    benchmark(frame.assign, x=lambda df: df["f0"] * df["i0"], y=lambda df: df["s0"].str.len())
+
+
+@pytest.mark.benchmark(group="evaluate-series")
+def test_eval_S(benchmark, frame):
+    benchmark(S.abs().clip(upper=1), frame["f0"])
+
+
+@pytest.mark.benchmark(group="evaluate-series")
+def test_eval_S_lambda(benchmark, frame):
+    benchmark(lambda s: s.abs().clip(upper=1), frame["f0"])
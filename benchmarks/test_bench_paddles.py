@@ -0,0 +1,58 @@
+"""Helpers from ``pandas_paddles.paddles`` and ``pandas_paddles.pipe``."""
+import io
+
+import pytest
+
+from pandas_paddles import DF, S, paddles, report
+
+from conftest import make_frame
+
+N_PREDICATES = [2, 10, 100]
+
+
+@pytest.mark.benchmark(group="combine")
+@pytest.mark.parametrize("n", N_PREDICATES)
+def test_combine_construct(benchmark, n):
+    predicates = [DF[f"f{i % 4}"] > i / n for i in range(n)]
+    benchmark(paddles.combine, predicates)
+
+
+@pytest.mark.benchmark(group="combine")
+@pytest.mark.parametrize("n", N_PREDICATES)
+def test_combine_evaluate(benchmark, frame, n):
+    expr = paddles.combine([DF[f"f{i % 4}"] > -3 + i / n for i in range(n)])
+    benchmark(expr, frame)
+
+
+@pytest.mark.benchmark(group="build_filter")
+@pytest.mark.parametrize("n", N_PREDICATES)
+def test_build_filter(benchmark, n):
+    df = make_frame(10_000, n_cols=n)
+    predicates = {f"i{i}": i for i in range(n)}
+    benchmark(lambda: df.loc[paddles.build_filter(predicates, op="|")])
+
+
+@pytest.mark.benchmark(group="str_join")
+def test_str_join(benchmark, frame):
+    benchmark(paddles.str_join("-", "s0", "s1", "s2"), frame)
+
+
+@pytest.mark.benchmark(group="groupby-agg")
+def test_groupby_agg_S(benchmark, frame):
+    benchmark(lambda: frame.groupby("c0", observed=True)["f0"].agg([S.abs().mean(), S.max() - S.min()]))
+
+
+@pytest.mark.benchmark(group="groupby-agg")
+def test_groupby_agg_lambda(benchmark, frame):
+    benchmark(lambda: frame.groupby("c0", observed=True)["f0"].agg([lambda s: s.abs().mean(), lambda s: s.max() - s.min()]))
+
+
+@pytest.mark.benchmark(group="report")
+def test_report(benchmark, frame):
+    benchmark(frame.pipe, report, print_func=lambda *args, **kwargs: None)
+
+
+@pytest.mark.benchmark(group="report")
+def test_report_print(benchmark, frame):
+    out = io.StringIO()
+    benchmark(frame.pipe, report, file=out)
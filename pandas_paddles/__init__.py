@@ -23,6 +23,12 @@ operations much more concisely. See `Comparison`_ below.
   selection`_)
 * :func:`~pandas_paddles.pipe.report` can be used to inspect the dataframe in a chain
   of operations.
+* :func:`~pandas_paddles.pipe.stage` measures time and memory between the
+  stages of a chain of operations.
+* :func:`~pandas_paddles.profiling.profile` times every step of a ``DF``- or
+  ``S``-expression.
+* :mod:`~pandas_paddles.hooks` registers process-wide hooks around all
+  evaluations, e.g. to export metrics or traces.
 * :mod:`~pandas_paddles.paddles` contains useful helper functions, e.g.
   :func:`~pandas_paddles.paddles.str_join` to join multiple columns into a
   string.
@@ -149,7 +155,7 @@ documentation. (:class:`~pandas_paddles.axis.SelectionComposerBase` for
 index-wise selection.)
 
 .. note::
-    Except for `C.dtype`, the examples below work in a similar manner when
+    Except for `C.dtype` and `C.where`, the examples below work in a similar manner when
     selecting by index by replacing ``C`` with ``I``, e.g.::
 
         df.loc[I["a", "b"] | ...]
@@ -193,6 +199,18 @@ Select by multiple dtypes::
     #    x     y   u
     # 0  1  3.14  42
 
+Select by column content (the ``S``-expression is evaluated for all
+columns at once, e.g. ``df.isna().mean()``)::
+
+    from pandas_paddles import S
+    df = pd.DataFrame({"x": [1, None, None], "y": 1, "z": ["a", "b", "c"]})
+    df.loc[:, C.where(S.isna().mean() > 0.5) | C.where(S.nunique() > 1)]
+    # Out:
+    #      x  z
+    # 0  1.0  a
+    # 1  NaN  b
+    # 2  NaN  c
+
 Select by multi-index level::
 
     midf = pd.DataFrame.from_records(
@@ -259,16 +277,22 @@ Author: Eike von Seggern <eike@vonseggern.space>
 __version__ = "1.6.0-dev"
 __all__ = ["C", "DF", "I", "S", "report", "paddles"]
 
+import importlib
 
 from .axis import ColumnSelectionComposer, IndexSelectionComposer
 from .pipe import report
 from . import paddles
-try:
-    from .dask import DF, S
-except ImportError as e:
-    print("Using pandas-only...", e)
-    from .pandas import DF, S
+# Dask support is loaded when the first dask data frame is evaluated (see
+# PandasDataframeContext._evaluate()) or on access of
+# ``pandas_paddles.dask``.
+from .pandas import DF, S
 
 
 C = ColumnSelectionComposer()
 I = IndexSelectionComposer()
+
+
+def __getattr__(name: str):
+    if name == "dask":
+        return importlib.import_module(".dask", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,266 @@
+"""Inspect ``DF``- and ``S``-expressions.
+
+This is used to find parts of expressions that can be evaluated
+independently of the rest of the data frame, e.g. row-wise expressions that
+can be evaluated per partition.
+"""
+from typing import Any, Callable, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .closures import AttributeClosure, ClosureBase, ItemClosure, MethodClosure, ShortCircuitClosure, StrJoinClosure
+from .contexts import ClosureFactoryBase
+from . import operator_helpers
+from .util import is_dask_collection
+
+
+_row_wise_operators = frozenset(
+    [f"__{op}__" for op in operator_helpers.unary_ops if op != "not"]
+    + [f"__{op}__" for op in operator_helpers.binary_ops if op != "divmod"]
+    + [f"__r{op}__" for op in operator_helpers.binary_ops if op != "divmod"]
+    + [f"__{op}__" for op in operator_helpers.binary_ops_non_reversable if op != "contains"]
+)
+_row_wise_methods = frozenset(operator_helpers.row_wise_methods) | _row_wise_operators
+_aggregate_methods = frozenset(operator_helpers.aggregate_methods)
+# Closures that start an expression with the values of their arguments
+_combining_closures = (ShortCircuitClosure, StrJoinClosure)
+
+
+def _is_column_access(closure: ClosureBase) -> bool:
+    """Check if ``closure`` selects a single column from a data frame."""
+    if isinstance(closure, ItemClosure):
+        return isinstance(closure.name, Hashable) and not isinstance(closure.name, slice)
+    if isinstance(closure, AttributeClosure):
+        return not hasattr(pd.DataFrame, closure.name)
+    return False
+
+
+def _is_row_wise_start(closure: ClosureBase) -> bool:
+    """Check if an expression starting with ``closure`` can be row-wise."""
+    if isinstance(closure, _combining_closures):
+        return all(
+            _is_row_wise_arg(a, closure._factory_cls)
+            for a in list(closure.args) + list(closure.kwargs.values())
+        )
+    return _is_column_access(closure)
+
+
+def is_same_context(arg: Any, expr: ClosureFactoryBase) -> bool:
+    """Check if ``arg`` is an expression for the same context as ``expr``,
+    e.g. both are ``DF``-expressions for pandas or dask data frames."""
+    return isinstance(arg, ClosureFactoryBase) and arg.wrapped_s == expr.wrapped_s
+
+
+def _is_literal_arg(arg: Any) -> bool:
+    """Check if ``arg`` can be passed unchanged to a row-wise method."""
+    if isinstance(arg, (pd.Series, pd.DataFrame, pd.Index, np.ndarray, ClosureFactoryBase)):
+        return False
+    return not is_dask_collection(arg)
+
+
+def _is_row_wise_arg(arg: Any, factory_cls: type) -> bool:
+    if isinstance(arg, factory_cls):
+        return is_row_wise(arg) or is_aggregate(arg)
+    return _is_literal_arg(arg)
+
+
+def _expands(closure: MethodClosure) -> bool:
+    """Check if an accessor method call returns a frame, e.g.
+    ``.str.split(expand=True)``."""
+    default, position = operator_helpers.expanding_accessor_methods[closure.name]
+    if "expand" in closure.kwargs:
+        return bool(closure.kwargs["expand"])
+    if position is not None and len(closure.args) > position:
+        return bool(closure.args[position])
+    return default
+
+
+def _is_category_dtype(dtype: Any) -> bool:
+    """Check if ``astype(dtype)`` infers categories from all rows."""
+    if isinstance(dtype, str):
+        return dtype == "category"
+    return isinstance(dtype, pd.CategoricalDtype) and dtype.categories is None
+
+
+def _is_row_wise_call(closure: MethodClosure, accessor: Optional[str]) -> bool:
+    """Check if the method of ``closure`` (called on ``accessor``) works
+    row-wise with its arguments."""
+    args = list(closure.args) + list(closure.kwargs.values())
+    if accessor is not None:
+        if closure.name not in operator_helpers.row_wise_accessor_members[accessor]:
+            return False
+        if accessor == "str":
+            return closure.name not in operator_helpers.expanding_accessor_methods or not _expands(closure)
+        # E.g. ``.dt.tz_localize(tz, ambiguous="infer")`` depends on the order
+        return not any(isinstance(a, str) and a == "infer" for a in args)
+    if closure.name not in _row_wise_methods:
+        return False
+    if closure.name == "fillna":
+        return "method" not in closure.kwargs and "limit" not in closure.kwargs
+    if closure.name == "astype":
+        dtype = closure.args[0] if closure.args else closure.kwargs.get("dtype")
+        return not _is_category_dtype(dtype)
+    return True
+
+
+def _is_row_wise_closure(closure: ClosureBase, previous: ClosureBase) -> bool:
+    accessor = (
+        previous.name
+        if isinstance(previous, AttributeClosure) and previous.name in operator_helpers.row_wise_accessors
+        else None
+    )
+    if isinstance(closure, AttributeClosure):
+        if accessor is not None:
+            return closure.name in operator_helpers.row_wise_accessor_members[accessor]
+        return closure.name in operator_helpers.row_wise_accessors
+    if isinstance(closure, ItemClosure):
+        # E.g. DF["x"].str[0]
+        return accessor == "str"
+    if isinstance(closure, MethodClosure):
+        if not _is_row_wise_call(closure, accessor):
+            return False
+        return all(
+            _is_row_wise_arg(a, closure._factory_cls)
+            for a in list(closure.args) + list(closure.kwargs.values())
+        )
+    return False
+
+
+def row_wise_prefix(expr: ClosureFactoryBase) -> int:
+    """Get the number of leading closures of ``expr`` that work row-wise.
+
+    A row-wise expression selects a single column (or combines row-wise
+    expressions with a
+    :class:`~pandas_paddles.closures.ShortCircuitClosure` or
+    :class:`~pandas_paddles.closures.StrJoinClosure`) and only applies
+    operations where the result for each row depends on the same row, e.g.
+    ``DF["x"].str.lower() == "a"``. Arguments to these operations can be
+    literal values, row-wise expressions, or aggregates (see
+    :func:`is_aggregate`).
+
+    Parameters
+    ----------
+    expr
+        The ``DF``-expression.
+
+    Returns
+    -------
+    int
+        The number of leading closures. ``0`` if the expression does not
+        start with a column selection.
+    """
+    closures = expr._closures
+    if not closures or not _is_row_wise_start(closures[0]):
+        return 0
+    n = 1
+    for previous, closure in zip(closures, closures[1:]):
+        if not _is_row_wise_closure(closure, previous):
+            break
+        n += 1
+
+    # Don't stop at an accessor, e.g. the ``.str`` of ``DF["x"].str.cat()``
+    while (
+        n > 1
+        and isinstance(closures[n - 1], AttributeClosure)
+        and closures[n - 1].name in operator_helpers.row_wise_accessors
+    ):
+        n -= 1
+    return n
+
+
+def is_row_wise(expr: ClosureFactoryBase) -> bool:
+    """Check if all of ``expr`` works row-wise (see :func:`row_wise_prefix`)."""
+    return bool(expr._closures) and row_wise_prefix(expr) == len(expr._closures)
+
+
+def is_aggregate(expr: ClosureFactoryBase) -> bool:
+    """Check if ``expr`` aggregates a row-wise expression to a scalar, e.g.
+    ``DF["x"].mean()``."""
+    closures = expr._closures
+    if len(closures) < 2:
+        return False
+    last = closures[-1]
+    if not isinstance(last, MethodClosure) or last.name not in _aggregate_methods:
+        return False
+    if not all(
+        _is_literal_arg(a) and not isinstance(a, (list, tuple))
+        for a in list(last.args) + list(last.kwargs.values())
+    ):
+        return False
+    return row_wise_prefix(expr) == len(closures) - 1
+
+
+def expr_key(value: Any) -> Hashable:
+    """Get key to compare or look up (nested) expressions and closures.
+
+    The key is only hashable if all literal arguments are hashable.
+    """
+    if isinstance(value, ClosureFactoryBase):
+        return (type(value).__name__, expr_key(value._closures))
+    if isinstance(value, ClosureBase):
+        return (type(value).__name__, expr_key(value._cmp_values()))
+    if isinstance(value, tuple):
+        return tuple(expr_key(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, expr_key(v)) for k, v in value.items())
+    return value
+
+
+def map_args(
+    expr: ClosureFactoryBase,
+    fn: Callable[[Any], Any],
+) -> ClosureFactoryBase:
+    """Rebuild ``expr`` with ``fn`` applied to all method arguments.
+
+    Expression arguments that ``fn`` returns unchanged are processed
+    recursively.
+    """
+    def map_arg(arg):
+        new = fn(arg)
+        if new is arg and isinstance(arg, ClosureFactoryBase):
+            return map_args(arg, fn)
+        return new
+
+    closures = []
+    for cl in expr._closures:
+        if isinstance(cl, MethodClosure) and (cl.args or cl.kwargs):
+            cl = cl._with_args(
+                [map_arg(a) for a in cl.args],
+                {k: map_arg(a) for k, a in cl.kwargs.items()},
+            )
+        closures.append(cl)
+    return type(expr)(closures)
+
+
+def referenced_columns(expr: ClosureFactoryBase) -> Optional[List[Hashable]]:
+    """Get the columns used by a (nested) ``DF``-expression.
+
+    Returns
+    -------
+    list or None
+        The column names in order of appearance or ``None`` if the used
+        columns cannot be determined, e.g. for ``DF.sum()``.
+    """
+    columns: List[Hashable] = []
+    complete = True
+
+    def collect(arg):
+        nonlocal complete
+        if is_same_context(arg, expr):
+            if arg._closures and _is_column_access(arg._closures[0]):
+                name = arg._closures[0].name
+                if name not in columns:
+                    columns.append(name)
+            elif arg._closures and isinstance(arg._closures[0], _combining_closures):
+                # The combined expressions are visited as arguments
+                pass
+            else:
+                complete = False
+        return arg
+
+    collect(expr)
+    map_args(expr, collect)
+    if not complete:
+        return None
+    return columns
@@ -1,7 +1,9 @@
 """Select axis labels (columns or index) of a data frame."""
 import operator
-from typing import Any, Callable, Optional, Sequence
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
 import typing
+import warnings
+import weakref
 try:
     from typing import Literal
 except ImportError:
@@ -10,6 +12,11 @@ except ImportError:
 import numpy as np
 import pandas as pd
 
+from .analysis import expr_key
+from .contexts import ClosureFactoryBase
+from . import hooks
+from .util import frame_state, is_dask_collection, is_same_state
+
 Indices = "Indices"
 AnyDataframe = "AnyDataframe"
 if typing.TYPE_CHECKING:
@@ -110,6 +117,13 @@ class BaseOp:
     def _pprint(self, axis: Literal["columns", "index"]) -> str:
         return f"{axis}{self}"
 
+    def _dask_indexer(self, df: AnyDataframe) -> Any:
+        """Translate the operator to an index for dask's ``.loc[]``."""
+        raise ValueError(
+            f"Cannot select rows of dask data frames with {self._pprint('I')}:"
+            " Only labels, slices, '...', and unions of labels are supported."
+        )
+
 
 class LabelSelectionOp(BaseOp):
     """Explicitely select labels."""
@@ -157,6 +171,23 @@ class LabelSelectionOp(BaseOp):
 
         return Selection(indices)
 
+    def _dask_indexer(self, df):
+        if self.level is not None:
+            return super()._dask_indexer(df)
+        if isinstance(self.labels, slice):
+            return slice(self.labels.start, self.labels.stop)
+
+        labels = list(self.labels)
+        if df.known_divisions:
+            # Labels outside of all partitions cannot be selected
+            first, last = df.divisions[0], df.divisions[-1]
+            try:
+                labels = [lbl for lbl in labels if first <= lbl <= last]
+            except TypeError:
+                # Not comparable with the index, let dask handle them
+                pass
+        return labels
+
     def __str__(self):
         if isinstance(self.labels, slice):
             fmt = lambda o, default: repr(o) if o is not None else default
@@ -213,6 +244,9 @@ class EllipsisOp(BaseOp):
         labels = getattr(df, axis)
         return Selection(mask=np.ones(len(labels), dtype=bool))
 
+    def _dask_indexer(self, df):
+        return slice(None)
+
     def __str__(self):
         return '...'
 
@@ -248,6 +282,14 @@ class BinaryOp(BaseOp):
 
         return self.op(sel_left, sel_right)
 
+    def _dask_indexer(self, df):
+        if self.op is operator.or_:
+            left = self.left._dask_indexer(df)
+            right = self.right._dask_indexer(df)
+            if isinstance(left, list) and isinstance(right, list):
+                return union_indices(left, right)
+        return super()._dask_indexer(df)
+
 
 class UnaryOp(BaseOp):
     """Apply unary operator on selection operator.
@@ -282,10 +324,18 @@ class UnaryOp(BaseOp):
 
 
 class DtypesOp(BaseOp):
-    """Select columns by dtype."""
-    def __init__(self, dtypes: Sequence, sample_size:int=10):
+    """Select columns by dtype.
+
+    For dask data frames, the dtypes are taken from the meta data, i.e. no
+    tasks are scheduled. ``object``-typed columns cannot be tested for
+    ``str`` or ``bytes`` values this way and match both, unless
+    ``sample_dask_head`` is set: Then the head of the first partition is
+    tested.
+    """
+    def __init__(self, dtypes: Sequence, sample_size:int=10, sample_dask_head:bool=False):
         self.dtypes = dtypes
         self.sample_size = sample_size
+        self.sample_dask_head = sample_dask_head
 
     def __str__(self):
         dtypes = [
@@ -301,22 +351,184 @@ class DtypesOp(BaseOp):
     def __call__(self, axis, df):
         if axis != "columns":
             raise ValueError("Selection by dtype is only supported for column selection.")
-        labels = getattr(df, axis)
-        mask = np.zeros(len(labels), dtype=bool)
+        if is_dask_collection(df):
+            dtypes = df._meta.dtypes
+        else:
+            dtypes = df.dtypes
+
+        is_object = (dtypes == object).values
+        sample = None
+        mask = np.zeros(len(dtypes), dtype=bool)
         for dtype in self.dtypes:
             for typ in (str, bytes):
                 if dtype in (typ, typ.__name__):
-                    mask |= (df.sample(min(len(df), self.sample_size))
-                            .applymap(lambda i: isinstance(i, typ))
-                            .agg("all")
-                            .values
-                           )
+                    if typ is str:
+                        mask |= np.array([
+                            dt != object and pd.api.types.is_string_dtype(dt)
+                            for dt in dtypes
+                        ], dtype=bool)
+                    if is_object.any():
+                        if sample is None:
+                            sample = self._sample_object_columns(df, is_object)
+                        if len(sample) == 0:
+                            # Nothing to test, e.g. the meta data of a dask
+                            # data frame: match any object column
+                            mask |= is_object
+                        else:
+                            mask[is_object] |= (sample
+                                                .applymap(lambda i: isinstance(i, typ))
+                                                .agg("all")
+                                                .values
+                                               )
                     break
             else:
-                mask |= (df.dtypes == dtype).values
+                mask |= (dtypes == dtype).values
 
         return Selection(mask=mask)
 
+    def _sample_object_columns(self, df, is_object):
+        columns = np.nonzero(is_object)[0]
+        if not is_dask_collection(df):
+            if self.sample_dask_head and len(df) == 0:
+                warnings.warn(
+                    "Cannot test object columns of an empty data frame. Note that "
+                    "ddf.loc[] only passes the (empty) meta data of dask data frames "
+                    "to selections. Use ddf[selection(ddf)] to sample the head.",
+                    UserWarning,
+                    stacklevel=2,
+                )
+            return df.iloc[:, columns].sample(min(len(df), self.sample_size))
+        if self.sample_dask_head:
+            # Only the first partition is computed, so we might get less
+            # than sample_size rows.
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)
+                return df.iloc[:, columns].head(self.sample_size, npartitions=1)
+        return df._meta.iloc[:, columns]
+
+
+class ColumnStatsCache:
+    """Cache per-column statistics computed for data frames.
+
+    Statistics are stored per data frame (referenced weakly, i.e. entries
+    are dropped together with the data frame) and keyed by the expression
+    that computed them.
+
+    The statistics of a data frame are dropped when its columns, index, or
+    column arrays are replaced, e.g. by ``df["z"] = ...``.
+
+    .. note::
+        Modifications of values in place (e.g. ``df.loc[0, "x"] = 1``) are
+        not detected. Call :meth:`invalidate` after changing the values of
+        a data frame in place.
+    """
+    def __init__(self):
+        self._stats: Dict[int, Tuple[Tuple[Any, ...], Dict[Hashable, pd.Series]]] = {}
+
+    def get(self, df: AnyDataframe) -> Dict[Hashable, pd.Series]:
+        """Get the (mutable) mapping of cached statistics for ``df``."""
+        key = id(df)
+        state = frame_state(df)
+        entry = self._stats.get(key)
+        if entry is not None:
+            if is_same_state(entry[0], state):
+                return entry[1]
+            # Modified: Start over, the finalizer is still registered
+            stats: Dict[Hashable, pd.Series] = {}
+            self._stats[key] = (state, stats)
+            return stats
+
+        stats = {}
+        try:
+            weakref.finalize(df, self._stats.pop, key, None)
+        except TypeError:
+            # Not weak-referencable: Don't keep the statistics around.
+            return stats
+        self._stats[key] = (state, stats)
+        return stats
+
+    def invalidate(self, df: AnyDataframe):
+        """Drop the cached statistics of ``df``."""
+        entry = self._stats.get(id(df))
+        if entry is not None:
+            entry[1].clear()
+
+    def clear(self):
+        """Drop all cached statistics."""
+        self._stats.clear()
+
+
+column_stats_cache = ColumnStatsCache()
+
+
+def _is_column_statistic(obj: Any, df: AnyDataframe) -> bool:
+    return isinstance(obj, pd.Series) and obj.index is df.columns
+
+
+def evaluate_column_stats(expr: ClosureFactoryBase, df: AnyDataframe) -> Any:
+    """Evaluate a ``S``-expression on the whole data frame.
+
+    ``S`` stands for each column of ``df``, e.g. ``S.isna().mean()`` is
+    evaluated as ``df.isna().mean()``, i.e. in one vectorized pass over the
+    data frame.
+
+    Intermediate results that hold one value per column (i.e. series with
+    index ``df.columns``) are cached in :data:`column_stats_cache` and
+    reused by other expressions with the same prefix, e.g.
+    ``S.isna().mean() > 0.5`` and ``S.isna().mean() < 0.1`` compute
+    ``df.isna().mean()`` only once.
+    """
+    closures = expr._closures
+    try:
+        keys = [expr_key(closures[:n]) for n in range(len(closures) + 1)]
+        for k in keys:
+            hash(k)
+    except TypeError:
+        # Unhashable arguments: Evaluate without cache
+        return expr._evaluate(df)
+
+    stats = column_stats_cache.get(df)
+    start = 0
+    obj = df
+    for n in range(len(closures), 0, -1):
+        if keys[n] in stats:
+            start = n
+            obj = stats[keys[n]]
+            break
+
+    for n in range(start, len(closures)):
+        obj = closures[n](obj, df)
+        if _is_column_statistic(obj, df):
+            stats[keys[n + 1]] = obj
+    return obj
+
+
+class WhereOp(BaseOp):
+    """Select columns by a predicate on per-column statistics."""
+    def __init__(self, predicate: Callable[[AnyDataframe], Any]):
+        self.predicate = predicate
+
+    def __str__(self):
+        return f".where({getattr(self.predicate, '__name__', self.predicate)})"
+
+    def __call__(self, axis, df: AnyDataframe) -> Selection:
+        if axis != "columns":
+            raise ValueError("Selection by column statistics is only supported for column selection.")
+        if isinstance(self.predicate, ClosureFactoryBase):
+            mask = evaluate_column_stats(self.predicate, df)
+        else:
+            mask = self.predicate(df)
+
+        labels = getattr(df, axis)
+        if isinstance(mask, pd.Series):
+            if not mask.index.equals(labels):
+                raise ValueError("Column statistics predicate must return one value per column.")
+            mask = mask.values
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(labels),):
+            raise ValueError("Column statistics predicate must return one value per column.")
+        return Selection(mask=mask)
+
 
 # Objects to create, compose, and evaluate column selection operators
 class OpComposerBase:
@@ -395,6 +607,15 @@ class OpComposerBase:
 
     def __call__(self, df: AnyDataframe) -> pd.Index:
         """Evaluate the wrapped operations."""
+        if hooks._registry:
+            return hooks.evaluate_with_hooks(self.axis[0].upper(), self, df, self._evaluate)
+        return self._evaluate(df)
+
+    def _evaluate(self, df: AnyDataframe) -> pd.Index:
+        if self.axis == "index" and is_dask_collection(df):
+            # Let dask map the labels to partitions with the divisions
+            # instead of loading the index.
+            return self.op._dask_indexer(df)
         selection = self.op(self.axis, df)
         return selection.apply(self.axis, df)
 
@@ -444,15 +665,16 @@ class LeveledComposer:
 
 class DtypeComposer:
     """Compose callable to select columns by dtype."""
-    def __init__(self, axis, sample_size=10):
+    def __init__(self, axis, sample_size=10, sample_dask_head=False):
         self.axis = axis
         self.sample_size = sample_size
+        self.sample_dask_head = sample_dask_head
 
     def __eq__(self, dtype):
-        return OpComposerBase(self.axis, DtypesOp((dtype,), self.sample_size))
+        return OpComposerBase(self.axis, DtypesOp((dtype,), self.sample_size, self.sample_dask_head))
 
     def isin(self, dtypes):
-        return OpComposerBase(self.axis, DtypesOp(dtypes, self.sample_size))
+        return OpComposerBase(self.axis, DtypesOp(dtypes, self.sample_size, self.sample_dask_head))
 
 
 class SelectionComposerBase(LabelComposer):
@@ -509,6 +731,12 @@ class IndexSelectionComposer(SelectionComposerBase):
     This can also be applied to composed selections::
 
         ~(I.levels[0]["b"] | I.levels[1]["X", "Y"])
+
+    For dask data frames, labels (``I["x", "z"]``), slices
+    (``I["B":"E"]``), ``...``, and unions of labels are passed on to dask's
+    ``.loc[]``. With known divisions, only the partitions holding the
+    selected labels are read. Note that dask raises a ``KeyError`` for
+    labels missing in these partitions.
     """
     def __init__(self, op=None):
         super().__init__("index", op)
@@ -543,6 +771,22 @@ class ColumnSelectionComposer(SelectionComposerBase):
       is tested explicitely. The sample-size can be set with
       :attr:`~SelectionComposer.sample_size`.
 
+      For dask data frames, only the meta data is used and nothing is
+      computed. ``object``-typed columns are tested on the head of the
+      first partition only if :attr:`sample_dask_head` is set. Because
+      ``ddf.loc[]`` only passes the meta data to the selection, call the
+      selection with the dask data frame for this::
+
+          C_head = ColumnSelectionComposer(sample_dask_head=True)
+          ddf[(C_head.dtype == str)(ddf)]
+
+    - Select by column content with :meth:`where`::
+
+        # Columns with more than half of the values missing
+        df.loc[:, C.where(S.isna().mean() > 0.5)]
+        # Drop constant columns
+        df.loc[:, ~C.where(S.nunique() <= 1)]
+
     - Select all columns starting with ``"PRE"``::
 
         df.loc[:, C.startswith("PRE")]
@@ -572,11 +816,13 @@ class ColumnSelectionComposer(SelectionComposerBase):
 
         ~(C.levels[0]["b"] | C.levels[1]["X", "Y"])
     """
-    def __init__(self, op=None, sample_size=None):
+    def __init__(self, op=None, sample_size=None, sample_dask_head=None):
         super().__init__("columns", op=op)
         self.dtype = DtypeComposer(self.axis)
         if sample_size is not None:
             self.sample_size = sample_size
+        if sample_dask_head is not None:
+            self.sample_dask_head = sample_dask_head
 
     @property
     def sample_size(self):
@@ -586,3 +832,39 @@ class ColumnSelectionComposer(SelectionComposerBase):
     @sample_size.setter
     def sample_size(self, val):
         self.dtype.sample_size = val
+
+    @property
+    def sample_dask_head(self):
+        """Test ``object``-typed columns of dask data frames on the head of
+        the first partition."""
+        return self.dtype.sample_dask_head
+
+    @sample_dask_head.setter
+    def sample_dask_head(self, val):
+        self.dtype.sample_dask_head = val
+
+    def where(self, predicate: Callable[[AnyDataframe], Any]) -> OpComposerBase:
+        """Select columns by a predicate on per-column statistics.
+
+        The predicate is evaluated on the whole data frame at once: ``S``
+        stands for each column, e.g. ``S.isna().mean()`` is computed as
+        ``df.isna().mean()``. Statistics computed by ``S``-expressions are
+        cached per data frame (see :func:`evaluate_column_stats`).
+
+        Parameters
+        ----------
+        predicate
+            ``S``-expression or callable taking the data frame and
+            returning a boolean value for each column.
+
+        Examples
+        --------
+        Select sparse columns::
+
+            df.loc[:, C.where(S.isna().mean() > 0.5)]
+
+        Select low-cardinality columns::
+
+            df.loc[:, C.where(S.nunique() < 20)]
+        """
+        return OpComposerBase(self.axis, WhereOp(predicate))
@@ -1,9 +1,15 @@
 """Closures for item, attribute, and method access."""
 
-from typing import Any, Callable, ClassVar, Dict, Iterable, Optional, Union, Tuple, Type
+import threading
+import time
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, Optional, Sequence, Union, Tuple, Type
 
+import numpy as np
 import pandas as pd
 
+from .keysets import ValueSet
+from .util import is_dask_collection, is_dask_dataframe
+
 # The context in which the wrappers might be used
 PandasContext = Union[pd.DataFrame, pd.Series]
 
@@ -135,6 +141,9 @@ class MethodClosure(ClosureBase):
         DF["x"].clip(upper=DF["y"].min())
     """
     _cmp_keys = ("name", "args", "kwargs")
+    # Arguments are evaluated by the closure itself, only when needed
+    _lazy_args: ClassVar[bool] = False
+
     def __init__(self, name: str, factory_cls: type, *args: Any, **kwargs: Any):
         """
         Parameters
@@ -158,6 +167,10 @@ class MethodClosure(ClosureBase):
 
         return f"<{type(self).__name__}: {self.name}({', '.join(arg_reprs)})>"
 
+    def _with_args(self, args: Sequence[Any], kwargs: Dict[str, Any]) -> "MethodClosure":
+        """Create the same closure with other arguments."""
+        return type(self)(self.name, self._factory_cls, *args, **kwargs)
+
     def __str__(self) -> str:
         # Use shorter `str` representation for accessors and `repr` for the
         # rest
@@ -194,7 +207,7 @@ class MethodClosure(ClosureBase):
             based, else just ``arg``.
         """
         if isinstance(arg, self._factory_cls):
-            return arg(root_obj)
+            return arg._evaluate(root_obj)
         return arg
 
     def __call__(self, obj: Any, root_obj: PandasContext) -> Any:
@@ -213,8 +226,321 @@ class MethodClosure(ClosureBase):
         result
             The result of the method or operator call.
         """
-        op_meth = getattr(obj, self.name)
-        return op_meth(
-            *[self._evaluate_method_arg(arg, root_obj) for arg in self.args],
-            **{k: self._evaluate_method_arg(arg, root_obj) for k, arg in self.kwargs.items()}
+        return self._apply(
+            obj,
+            [self._evaluate_method_arg(arg, root_obj) for arg in self.args],
+            {k: self._evaluate_method_arg(arg, root_obj) for k, arg in self.kwargs.items()},
         )
+
+    def _apply(self, obj: Any, args: Iterable[Any], kwargs: Dict[str, Any]) -> Any:
+        """Call method ``self.name`` on ``obj`` with evaluated arguments."""
+        if self.name == "isin" and not kwargs:
+            args = list(args)
+            if len(args) == 1 and isinstance(args[0], ValueSet) and (
+                isinstance(obj, pd.Series) or (is_dask_collection(obj) and not is_dask_dataframe(obj))
+            ):
+                # Reuse the hash table
+                return args[0].isin(obj)
+        return getattr(obj, self.name)(*args, **kwargs)
+
+
+def _is_aligned_mask(value: Any, ref: pd.Series) -> bool:
+    return (
+        isinstance(value, pd.Series)
+        and value.dtype == bool
+        and (value.index is ref.index or value.index.equals(ref.index))
+    )
+
+
+class BooleanReduceClosure(MethodClosure):
+    """Combine a boolean mask with several others by ``&`` or ``|`` in one
+    step.
+
+    ``DF["a"] & DF["b"] & DF["c"]`` creates one closure per operator and a
+    new series for each of them. This closure is named ``__and__`` (or
+    ``__or__``) like the operator, but takes all other operands as
+    arguments. They are evaluated one after another and combined in-place
+    into a single numpy buffer, e.g. by
+    :func:`~pandas_paddles.paddles.combine`.
+
+    Operands that are not boolean series with the same index are combined
+    with the operator instead, e.g. for nullable booleans or dask series.
+    """
+    _ufuncs: ClassVar[Dict[str, Any]] = {
+        "__and__": np.logical_and,
+        "__or__": np.logical_or,
+    }
+
+    def __init__(self, name: str, factory_cls: type, *args: Any, **kwargs: Any):
+        if name not in self._ufuncs:
+            raise ValueError(f"Unsupported operator {name!r}, use one of {', '.join(self._ufuncs)}")
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} does not take keyword arguments")
+        super().__init__(name, factory_cls, *args)
+
+    def __call__(self, obj: Any, root_obj: PandasContext) -> Any:
+        """Combine ``obj`` with all operands.
+
+        The operands are evaluated (with ``root_obj``) only when needed, so
+        that at most one of them is kept in memory.
+        """
+        return self._apply(obj, (self._evaluate_method_arg(a, root_obj) for a in self.args), {})
+
+    def _apply(self, obj: Any, args: Iterable[Any], kwargs: Dict[str, Any]) -> Any:
+        ufunc = self._ufuncs[self.name]
+        buffer = None
+        name = None
+        for value in args:
+            if buffer is not None and not _is_aligned_mask(value, obj):
+                obj = pd.Series(buffer, index=obj.index, name=name)
+                buffer = None
+            if buffer is None:
+                if not (isinstance(obj, pd.Series) and obj.dtype == bool and _is_aligned_mask(value, obj)):
+                    obj = getattr(obj, self.name)(value)
+                    continue
+                # Copy, the series could be a column of the data frame
+                buffer = obj.to_numpy(copy=True)
+                name = obj.name
+            ufunc(buffer, value.to_numpy(), out=buffer)
+            # Same as the name of the result of the operator
+            if value.name != name:
+                name = None
+        if buffer is not None:
+            obj = pd.Series(buffer, index=obj.index, name=name)
+        return obj
+
+
+class PredicateStats:
+    """Cost and selectivity of the predicates of a
+    :class:`ShortCircuitClosure`, gathered across evaluations.
+
+    Attributes
+    ----------
+    rows
+        Number of rows each predicate was evaluated for.
+    selected
+        Number of rows each predicate was true for.
+    seconds
+        Time spent evaluating each predicate.
+    """
+    def __init__(self, n: int):
+        self.rows = [0] * n
+        self.selected = [0] * n
+        self.seconds = [0.0] * n
+        self._lock = threading.Lock()
+
+    def record(self, i: int, rows: int, selected: int, seconds: float):
+        with self._lock:
+            self.rows[i] += rows
+            self.selected[i] += selected
+            self.seconds[i] += seconds
+
+    def order(self, op: str) -> List[int]:
+        """Get the predicate indices sorted by the expected time to decide
+        a row.
+
+        That is the time per row divided by the fraction of rows decided by
+        the predicate (false rows for ``&``, true rows for ``|``).
+        Predicates without records keep their position after the others.
+        """
+        def rank(i):
+            if not self.rows[i]:
+                return float("inf")
+            decided = self.selected[i] / self.rows[i]
+            if op == "__and__":
+                decided = 1 - decided
+            return self.seconds[i] / self.rows[i] / max(decided, 1e-9)
+
+        with self._lock:
+            return sorted(range(len(self.rows)), key=rank)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the statistics as data frame with one row per predicate."""
+        with self._lock:
+            return pd.DataFrame({"rows": self.rows, "selected": self.selected, "seconds": self.seconds})
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def _take_rows(root_obj: pd.DataFrame, positions: np.ndarray, columns: Optional[List[Any]]) -> Optional[pd.DataFrame]:
+    """Get the rows at ``positions`` of the ``columns`` (``None`` if the
+    columns cannot be selected one by one)."""
+    if columns is None or not root_obj.columns.is_unique:
+        return None
+    if (root_obj.columns.get_indexer(columns) < 0).any():
+        return None
+    return pd.DataFrame({c: root_obj[c].take(positions) for c in columns}, columns=columns)
+
+
+class ShortCircuitClosure(BooleanReduceClosure):
+    """Combine boolean masks by ``&`` or ``|`` and only evaluate each mask
+    for the rows that are not decided yet.
+
+    For ``&``, the second expression is only evaluated for rows where the
+    first one is true, the third for rows where both are true, and so on.
+    Evaluation stops when no rows are left. Only row-wise expressions (see
+    :func:`~pandas_paddles.analysis.is_row_wise`) are evaluated for a
+    subset of the rows, aggregates in them with all rows. Others are
+    evaluated with the complete data frame.
+
+    With ``stats``, the time and selectivity of each expression are
+    recorded and used to evaluate cheap and selective expressions first.
+
+    This closure must be the only closure of an expression, e.g. created by
+    :func:`~pandas_paddles.paddles.combine` with ``short_circuit=True``.
+    The object it is applied to is ignored.
+    """
+    _lazy_args = True
+
+    # Only take rows if less than this fraction of rows is undecided
+    subset_fraction: ClassVar[float] = 0.5
+
+    def __init__(self, name: str, factory_cls: type, *args: Any, stats: Optional[PredicateStats]=None):
+        if not args:
+            raise TypeError(f"{type(self).__name__} needs at least one argument")
+        super().__init__(name, factory_cls, *args)
+        if stats is not None and len(stats.rows) != len(args):
+            raise ValueError(f"stats are for {len(stats.rows)} expressions, got {len(args)}")
+        self.stats = stats
+        self._subset_columns: Optional[List[Optional[List[Any]]]] = None
+
+    def _with_args(self, args: Sequence[Any], kwargs: Dict[str, Any]) -> "ShortCircuitClosure":
+        return type(self)(self.name, self._factory_cls, *args, stats=self.stats, **kwargs)
+
+    def _apply(self, obj: Any, args: Iterable[Any], kwargs: Dict[str, Any]) -> Any:
+        """Combine the evaluated arguments (``obj`` is ignored)."""
+        args = iter(args)
+        return super()._apply(next(args), args, {})
+
+    def _get_subset_columns(self) -> List[Optional[List[Any]]]:
+        """Get the columns needed to evaluate each argument for a subset of
+        rows, ``None`` if it needs all rows."""
+        if self._subset_columns is None:
+            from .analysis import is_row_wise, referenced_columns
+            self._subset_columns = [
+                referenced_columns(a) if isinstance(a, self._factory_cls) and is_row_wise(a) else None
+                for a in self.args
+            ]
+        return self._subset_columns
+
+    def _evaluate_subset(self, arg: Any, root_obj: pd.DataFrame, subset: pd.DataFrame) -> Any:
+        from .analysis import is_aggregate, is_same_context, map_args
+
+        def substitute(a):
+            if is_same_context(a, arg) and is_aggregate(a):
+                return a._evaluate(root_obj)
+            return a
+        return map_args(arg, substitute)._evaluate(subset)
+
+    def __call__(self, obj: Any, root_obj: PandasContext) -> Any:
+        """Combine all arguments evaluated with ``root_obj``."""
+        if not isinstance(root_obj, pd.DataFrame):
+            return self._apply(None, (self._evaluate_method_arg(a, root_obj) for a in self.args), {})
+
+        ufunc = self._ufuncs[self.name]
+        is_and = self.name == "__and__"
+        order = self.stats.order(self.name) if self.stats is not None else range(len(self.args))
+        subset_columns = self._get_subset_columns()
+        n_rows = len(root_obj)
+        mask: Optional[np.ndarray] = None
+        # Same as the name of the result of the operators
+        names: List[Any] = []
+        # Arguments evaluated with all rows, reused if the operators are needed
+        full_values: Dict[int, Any] = {}
+        # Only recorded if the evaluation is not started over with the operators
+        records: List[Tuple[int, int, int, float]] = []
+
+        def fallback():
+            return self._apply(None, (
+                full_values[i] if i in full_values else self._evaluate_method_arg(a, root_obj)
+                for i, a in enumerate(self.args)
+            ), {})
+
+        remaining: Sequence[int] = ()
+        for k, i in enumerate(order):
+            arg = self.args[i]
+            start = time.perf_counter()
+            if mask is None:
+                positions = None
+                value = self._evaluate_method_arg(arg, root_obj)
+            else:
+                positions = np.flatnonzero(mask if is_and else ~mask)
+                if len(positions) == 0:
+                    remaining = order[k:]
+                    break
+                subset = None
+                if len(positions) < n_rows * self.subset_fraction:
+                    subset = _take_rows(root_obj, positions, subset_columns[i])
+                if subset is None:
+                    positions = None
+                    value = self._evaluate_method_arg(arg, root_obj)
+                else:
+                    value = self._evaluate_subset(arg, root_obj, subset)
+
+            if positions is None:
+                full_values[i] = value
+                if not _is_aligned_mask(value, root_obj):
+                    # E.g. nullable booleans: Use the operators
+                    return fallback()
+                values = value.to_numpy()
+                if mask is None:
+                    mask = values.copy()
+                else:
+                    ufunc(mask, values, out=mask)
+                evaluated = n_rows
+            else:
+                if not (isinstance(value, pd.Series) and value.dtype == bool and len(value) == len(positions)):
+                    return fallback()
+                values = value.to_numpy()
+                mask[positions] = values
+                evaluated = len(positions)
+            names.append(value.name)
+            records.append((i, evaluated, int(np.count_nonzero(values)), time.perf_counter() - start))
+
+        # Arguments not evaluated: Only their names are needed
+        empty = np.array([], dtype=np.intp)
+        for i in remaining:
+            subset = _take_rows(root_obj, empty, subset_columns[i])
+            if subset is None:
+                names.append(None)
+                break
+            names.append(getattr(self._evaluate_subset(self.args[i], root_obj, subset), "name", None))
+
+        if self.stats is not None:
+            for record in records:
+                self.stats.record(*record)
+        name = names[0] if all(n == names[0] for n in names) else None
+        return pd.Series(mask, index=root_obj.index, name=name)
+
+
+class StrJoinClosure(MethodClosure):
+    """Join the string representations of several expressions element-wise.
+
+    The arguments are the separator and the expressions to join, e.g.
+    created by :func:`~pandas_paddles.paddles.str_join`. The expressions
+    are converted to strings once and joined in a single pass (see
+    :func:`pandas_paddles.strings.join`) instead of creating intermediate
+    series for every ``+``.
+
+    This closure must be the only closure of an expression. The object it
+    is applied to is ignored.
+    """
+    def __init__(self, name: str, factory_cls: type, sep: str, *args: Any, dtype: Any=None):
+        if not args:
+            raise TypeError(f"{type(self).__name__} needs at least one expression to join")
+        kwargs = {} if dtype is None else {"dtype": dtype}
+        super().__init__(name, factory_cls, sep, *args, **kwargs)
+
+    def _apply(self, obj: Any, args: Iterable[Any], kwargs: Dict[str, Any]) -> Any:
+        """Join the evaluated arguments (``obj`` is ignored)."""
+        # Avoid circular import
+        from . import strings
+        sep, *values = args
+        return strings.join(sep, values, **kwargs)
@@ -6,9 +6,9 @@ from warnings import warn
 
 import pandas as pd
 
-from .closures import ClosureBase, AttributeClosure, ItemClosure, MethodClosure
+from .closures import ClosureBase, AttributeClosure, BooleanReduceClosure, ItemClosure, MethodClosure, ShortCircuitClosure
 from .util import AstNode
-from . import operator_helpers
+from . import hooks, operator_helpers, strings, threads, uniques
 
 
 def add_dunder_operators(cls):
@@ -70,6 +70,22 @@ def get_obj_attr_doc(obj_or_class: Any, attr: str):
     return None
 
 
+class _InstanceDoc:
+    """Resolve the doc-string of closure factories only when accessed.
+
+    Accessed on the class, this gives the class doc-string. Accessed on an
+    instance, it calls ``_get_doc()``, e.g. to give the doc-string of the
+    wrapped method for ``help(DF.sum)``.
+    """
+    def __init__(self, class_doc: Optional[str]):
+        self.class_doc = class_doc
+
+    def __get__(self, obj: Any, cls: type) -> Optional[str]:
+        if obj is None:
+            return self.class_doc
+        return obj._get_doc()
+
+
 def _get_closure_cmp_keys(closures: Iterable[ClosureBase]) -> Tuple:
     return tuple(cl._cmp_values() for cl in closures)
 
@@ -90,8 +106,11 @@ class ClosureFactoryBase:
         if closures is not None:
             self._closures = tuple(closures)
 
-        # Update the doc-string if possible
-        self.__doc__ = self._get_doc()
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Looking up the doc-string of the wrapped attribute is expensive
+        # compared to creating the expression, so only do it on demand.
+        cls.__doc__ = _InstanceDoc(cls.__dict__.get("__doc__"))
 
     def __getstate__(self) -> Dict[str, Any]:
         return self.__dict__.copy()
@@ -99,9 +118,23 @@ class ClosureFactoryBase:
     def __setstate__(self, state: Dict[str, Any]):
         self.__dict__.update(state)
 
+    def __reduce__(self):
+        # Pickle the compact encoding instead of all closure objects (see
+        # pandas_paddles.serialize)
+        from .serialize import from_tree, to_tree
+        try:
+            return from_tree, (to_tree(self, strict=False),)
+        except TypeError:
+            # E.g. sub-classes not known to the serialization
+            return super().__reduce__()
+
     def _get_doc(self) -> Optional[str]:
         return type(self).__doc__
 
+    def _accepts(self, obj: Any) -> bool:
+        """Check if the expression can be evaluated with ``obj``."""
+        return isinstance(obj, self.wrapped_cls)
+
     def __repr__(self) -> str:
         return f"<{type(self).__name__} {'.'.join(repr(l) for l in self._closures)}>"
 
@@ -116,6 +149,10 @@ class ClosureFactoryBase:
         return ' '.join(l.strip() for l in lines)
 
     def __getattr__(self, name: str) -> "ClosureFactoryBase":
+        # Don't wrap special attributes: Other libraries (e.g. dask) probe
+        # objects for them and would mistake expressions for something else.
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
         return type(self)(self._closures + (AttributeClosure(name),))
 
     def __getitem__(self, key: str) -> "ClosureFactoryBase":
@@ -133,42 +170,98 @@ class ClosureFactoryBase:
     def __call__(self, *args: Any, **kwargs: Any) -> Union[pd.DataFrame, pd.Series, "ClosureFactoryBase"]:
         # Heuristic: Assume the selector is applied if exactly one DataFrame
         # or Series argument is passed.
-        if len(args) == 1 and isinstance(args[0], self.wrapped_cls):
-            obj = root_df = args[0]
-            for lvl in self._closures:
-                obj = lvl(obj, root_df)
-            return obj
+        if len(args) == 1 and self._accepts(args[0]):
+            if hooks._registry:
+                return hooks.evaluate_with_hooks(self.wrapped_s, self, args[0], self._evaluate)
+            return self._evaluate(args[0])
 
         # Create a new accessor with the last level called as a method.
         return type(self)(self._closures[:-1] + (MethodClosure(self._closures[-1].name, type(self), *args, **kwargs),))
 
-    def as_tree(self):
+    def _evaluate(self, root_obj: Any) -> Any:
+        """Apply all closures to ``root_obj`` without checking its type.
+
+        Parameters
+        ----------
+        root_obj
+            The data frame or series from the context.
+
+        Returns
+        -------
+        result
+            The result of the expression.
+        """
+        executor = threads._executor.get()
+        if executor is not None:
+            return threads.evaluate_threaded(self, root_obj, executor)
+        obj = root_obj
+        closures = self._closures
+        i = 0
+        if isinstance(root_obj, pd.DataFrame):
+            # Evaluate operations on the distinct values of low-cardinality
+            # columns
+            obj, i = uniques.evaluate_on_uniques(self, root_obj)
+        while i < len(closures):
+            lvl = closures[i]
+            if isinstance(lvl, AttributeClosure) and lvl.name == "str":
+                # Evaluate chains of string methods in Arrow buffers
+                obj, n = strings.apply_arrow_chain(obj, closures[i:])
+                if n:
+                    i += n
+                    continue
+            obj = lvl(obj, root_obj)
+            i += 1
+        return obj
+
+    def as_tree(self, annotate: Optional[Callable[[ClosureBase], Optional[str]]]=None) -> AstNode:
+        """Get the expression as tree of ``AstNode`` objects.
+
+        Parameters
+        ----------
+        annotate
+            Optional function to get a note for each closure, e.g. its
+            evaluation time. The note is printed as comment after the
+            closure. Return ``None`` for no note.
+        """
         def to_node(x):
             if hasattr(x, "as_tree"):
-                return x.as_tree()
+                return x.as_tree(annotate)
             return AstNode(repr(x))
 
+        def note(c):
+            return annotate(c) if annotate is not None else None
+
         cur = AstNode((self.wrapped_s,))
         for c in self._closures:
             if isinstance(c, (AttributeClosure, ItemClosure)):
-                new = AstNode(str(c), parent=cur)
+                new = AstNode(str(c), parent=cur, note=note(c))
                 cur.right = new
                 cur = new
+            elif isinstance(c, BooleanReduceClosure):
+                _, op = operator_helpers.get_op_syntax(c.name)
+                operands = [to_node(a) for a in c.args]
+                if not isinstance(c, ShortCircuitClosure):
+                    # Otherwise, the object is ignored
+                    operands.insert(0, cur.root)
+                new = AstNode((op, operands), note=note(c))
+                for operand in operands:
+                    operand.parent = new
+                cur = new
             elif isinstance(c, MethodClosure):
                 op_type, op = operator_helpers.get_op_syntax(c.name)
                 if op_type == "binary" and len(c.args) == 1 and not c.kwargs:
-                    new = AstNode(op, left=cur.root, right=to_node(c.args[0]))
+                    new = AstNode(op, left=cur.root, right=to_node(c.args[0]), note=note(c))
                     new.left.parent = new
                     new.right.parent = new
                     cur = new
                 elif op_type == "reverse-binary" and len(c.args) == 1 and not c.kwargs:
-                    new = AstNode(op, left=to_node(c.args[0]), right=cur.root)
+                    new = AstNode(op, left=to_node(c.args[0]), right=cur.root, note=note(c))
                     new.left.parent = new
                     new.right.parent = new
                     cur = new
                 elif op_type == "unary" and not c.args and not c.kwargs:
                     right = cur.root
-                    new = AstNode((op,), right=right)
+                    new = AstNode((op,), right=right, note=note(c))
                     right.parent = new
                     cur = new
                 else:
@@ -178,7 +271,7 @@ class ClosureFactoryBase:
                         [to_node(a) for a in c.args],
                         [(k, to_node(a)) for k, a in c.kwargs.items()]
                     )
-                    new = AstNode(payload, parent=cur)
+                    new = AstNode(payload, parent=cur, note=note(c))
                     cur.right = new
                     cur = new
 
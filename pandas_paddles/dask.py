@@ -1,18 +1,193 @@
 """Pandas and dask contexts"""
 
+from typing import Any, ClassVar, Dict, Hashable, List
+
+import dask
 from dask.dataframe import DataFrame
 import pandas as pd
 
 from .pandas import PandasDataframeContext, S
 
 
+from .analysis import expr_key, is_aggregate, is_same_context, map_args, referenced_columns, row_wise_prefix
 from .contexts import (
     add_dunder_operators,
     get_obj_attr_doc,
 )
 
+
+class _AggregateRef:
+    """Placeholder for an aggregate in a row-wise expression evaluated per
+    partition."""
+    def __init__(self, index: int):
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.index}>"
+
+
+def _evaluate_partition(part: pd.DataFrame, template: PandasDataframeContext, *aggregates: Any) -> Any:
+    """Evaluate row-wise expression on a single partition."""
+    expr = map_args(
+        template,
+        lambda a: aggregates[a.index] if isinstance(a, _AggregateRef) else a,
+    )
+    return expr._evaluate(part)
+
+
+def _fuse_row_wise(expr: PandasDataframeContext, ddf: DataFrame) -> Any:
+    """Evaluate row-wise expression with a single ``map_partitions`` call.
+
+    Aggregates used in ``expr`` (e.g. ``DF["x"].mean()``) are evaluated
+    separately and passed to all partitions.
+    """
+    found = []
+    def collect(arg):
+        if is_same_context(arg, expr) and is_aggregate(arg):
+            found.append(arg)
+            return _AggregateRef(len(found) - 1)
+        return arg
+    template = map_args(expr, collect)
+    aggregates = [DaskDataframeContext(agg._closures)._evaluate_lazy(ddf) for agg in found]
+
+    # Allow dask to read only the needed columns
+    ddf = ddf[referenced_columns(expr)]
+    meta = expr._evaluate(ddf._meta_nonempty).iloc[:0]
+    return ddf.map_partitions(_evaluate_partition, template, *aggregates, meta=meta)
+
+
+def _aggregate_key(expr: PandasDataframeContext) -> Hashable:
+    key = expr_key(expr)
+    try:
+        hash(key)
+    except TypeError:
+        return id(expr)
+    return key
+
+
+def compute_aggregates(ddf: DataFrame, *exprs: PandasDataframeContext) -> List[Any]:
+    """Compute all aggregates in ``exprs`` with a single ``dask.compute``
+    call.
+
+    Aggregates are expressions like ``DF["x"].mean()`` (see
+    :func:`~pandas_paddles.analysis.is_aggregate`). Each distinct aggregate
+    is computed only once, even if used in several expressions.
+
+    Parameters
+    ----------
+    ddf
+        The dask data frame the expressions will be evaluated with.
+    exprs
+        The ``DF``-expressions.
+
+    Returns
+    -------
+    list
+        The expressions with all aggregates replaced by their (scalar)
+        values. Expressions that are aggregates themselves are replaced by
+        their value.
+
+    Examples
+    --------
+    Compute the quantile and the mean of ``x`` in one pass over the data::
+
+        clipped, above_mean = compute_aggregates(
+            ddf,
+            DF["x"].clip(upper=DF["x"].quantile(0.99)),
+            DF["x"] > DF["x"].mean(),
+        )
+        ddf.assign(clipped=clipped, above_mean=above_mean)
+    """
+    found: Dict[Hashable, PandasDataframeContext] = {}
+    def collect(arg):
+        if isinstance(arg, PandasDataframeContext) and is_aggregate(arg):
+            found.setdefault(_aggregate_key(arg), arg)
+        return arg
+
+    for expr in exprs:
+        if collect(expr) is expr:
+            map_args(expr, collect)
+    if not found:
+        return list(exprs)
+
+    # Evaluate with a plain context to keep the aggregates lazy until
+    # computing them together.
+    values = dask.compute(*[
+        DaskDataframeContext(agg._closures)._evaluate_lazy(ddf)
+        for agg in found.values()
+    ])
+    lookup = dict(zip(found, values))
+
+    def substitute(arg):
+        if isinstance(arg, PandasDataframeContext) and is_aggregate(arg):
+            return lookup[_aggregate_key(arg)]
+        return arg
+
+    result = []
+    for expr in exprs:
+        new = substitute(expr)
+        if new is expr:
+            new = map_args(expr, substitute)
+        result.append(new)
+    return result
+
+
 @add_dunder_operators
 class DaskDataframeContext(PandasDataframeContext):
+    """``DF`` with optimized evaluation for dask data frames.
+
+    ``DF`` from :mod:`pandas_paddles` switches to this class when evaluated
+    with a dask data frame, so this only needs to be used directly to
+    access the dask-specific settings.
+    """
+    # Evaluated here, no need to switch classes
+    _dispatch_dask = False
+
+    eager_aggregates: ClassVar[bool] = False
+    """Compute all aggregates in an expression with one ``dask.compute``
+    call before evaluating it with a dask data frame (see
+    :func:`compute_aggregates`). Set on the class, i.e.
+    ``DaskDataframeContext.eager_aggregates = True``."""
+
     wrapped_cls = (pd.DataFrame, DataFrame)
 
+    def _evaluate(self, root_obj: Any) -> Any:
+        """Apply all closures to ``root_obj``.
+
+        For dask data frames, the leading row-wise part of the expression
+        (see :func:`~pandas_paddles.analysis.row_wise_prefix`) is evaluated
+        in a single ``map_partitions`` call instead of adding one layer to
+        the task graph for each operation, e.g.::
+
+            (DF["a"] * 2 + DF["b"]).clip(0) > DF["c"]
+
+        If :attr:`eager_aggregates` is set, embedded aggregates are
+        computed first and replaced by their values.
+        """
+        if not isinstance(root_obj, DataFrame):
+            return super()._evaluate(root_obj)
+
+        if self.eager_aggregates:
+            expr, = compute_aggregates(root_obj, self)
+            if not isinstance(expr, DaskDataframeContext):
+                # The expression itself is an aggregate
+                return expr
+            return expr._evaluate_lazy(root_obj)
+        return self._evaluate_lazy(root_obj)
+
+    def _evaluate_lazy(self, root_obj: DataFrame) -> Any:
+        """Apply all closures to the dask data frame without computing
+        anything."""
+        n = row_wise_prefix(self)
+        if n < 2:
+            return super()._evaluate(root_obj)
+        prefix = type(self)(self._closures[:n])
+        if not set(referenced_columns(prefix)).issubset(root_obj.columns):
+            return super()._evaluate(root_obj)
+
+        obj = _fuse_row_wise(prefix, root_obj)
+        for lvl in self._closures[n:]:
+            obj = lvl(obj, root_obj)
+        return obj
+
 DF = DaskDataframeContext()
@@ -0,0 +1,283 @@
+"""Process-wide hooks around the evaluation of expressions and selections.
+
+Hooks are called before and after every top-level evaluation of a ``DF``- or
+``S``-expression (e.g. in ``df.assign(y=DF["x"] * 2)``) and of a ``C``- or
+``I``-selection (e.g. in ``df.loc[:, C.dtype == int]``). Nested expressions
+in method arguments are part of the outer evaluation.
+
+Use as::
+
+    from pandas_paddles import hooks
+
+    metrics = hooks.OpenMetricsHook()
+    hooks.register_hook(metrics)
+    # Trace only 1% of the evaluations
+    trace = hooks.ChromeTraceHook()
+    hooks.register_hook(trace, sample_rate=0.01)
+
+    ...
+
+    metrics.write("paddles.prom")
+    trace.write("paddles-trace.json")  # Open with https://ui.perfetto.dev
+
+Without registered hooks, the evaluation only checks an empty tuple.
+"""
+from collections import defaultdict
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationEvent:
+    """A single evaluation passed to the hooks.
+
+    Attributes
+    ----------
+    kind
+        ``"DF"``, ``"S"``, ``"C"``, or ``"I"``.
+    expr
+        The evaluated expression or selection.
+    obj
+        The data frame or series the expression is evaluated with.
+    start, end
+        :func:`time.perf_counter` before and after the evaluation. ``end`` is
+        ``None`` in :meth:`EvaluationHook.before`.
+    result
+        The result of the evaluation (only set in
+        :meth:`EvaluationHook.after`).
+    error
+        The exception raised by the evaluation or ``None``.
+    """
+    def __init__(self, kind: str, expr: Any, obj: Any):
+        self.kind = kind
+        self.expr = expr
+        self.obj = obj
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._name: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Evaluation time in seconds."""
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    @property
+    def name(self) -> str:
+        """The expression as a single line, e.g. ``DF.x * 2``."""
+        if self._name is None:
+            self._name = " ".join(l.strip() for l in str(self.expr).splitlines())
+        return self._name
+
+
+class EvaluationHook:
+    """Base class for evaluation hooks.
+
+    Sub-classes override :meth:`before` and/or :meth:`after`. Hooks may be
+    called from several threads at once.
+    """
+    def before(self, event: EvaluationEvent):
+        """Called before the evaluation."""
+
+    def after(self, event: EvaluationEvent):
+        """Called after the evaluation, also if it failed."""
+
+
+# (hook, sample rate) pairs. Replaced, never mutated, so that evaluating
+# threads can iterate it without locking.
+_registry: Tuple[Tuple[EvaluationHook, float], ...] = ()
+_registry_lock = threading.Lock()
+
+
+def register_hook(hook: EvaluationHook, sample_rate: float=1.0):
+    """Register ``hook`` for all evaluations in this process.
+
+    Parameters
+    ----------
+    hook
+        The hook.
+    sample_rate
+        Fraction of evaluations to call the hook for, e.g. ``0.01`` to only
+        instrument 1% of the evaluations. Both :meth:`~EvaluationHook.before`
+        and :meth:`~EvaluationHook.after` are called for sampled evaluations.
+    """
+    global _registry
+    if not 0 < sample_rate <= 1:
+        raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+    with _registry_lock:
+        _registry = tuple((h, r) for h, r in _registry if h is not hook) + ((hook, sample_rate),)
+
+
+def unregister_hook(hook: EvaluationHook):
+    """Remove ``hook`` from the registered hooks."""
+    global _registry
+    with _registry_lock:
+        _registry = tuple((h, r) for h, r in _registry if h is not hook)
+
+
+def registered_hooks() -> List[EvaluationHook]:
+    """Get the registered hooks."""
+    return [h for h, _ in _registry]
+
+
+def _call_hook(method: Callable[[EvaluationEvent], Any], event: EvaluationEvent):
+    # Never break the evaluation because of a faulty hook
+    try:
+        method(event)
+    except Exception:
+        logger.exception("Evaluation hook %r failed", method)
+
+
+def evaluate_with_hooks(kind: str, expr: Any, obj: Any, evaluate: Callable[[Any], Any]) -> Any:
+    """Call ``evaluate(obj)`` surrounded by the registered hooks.
+
+    Only call this if any hooks are registered, i.e. if ``_registry`` is not
+    empty.
+    """
+    active = [h for h, rate in _registry if rate >= 1 or random.random() < rate]
+    if not active:
+        return evaluate(obj)
+
+    event = EvaluationEvent(kind, expr, obj)
+    for hook in active:
+        _call_hook(hook.before, event)
+    event.start = time.perf_counter()
+    try:
+        event.result = evaluate(obj)
+        return event.result
+    except BaseException as e:
+        event.error = e
+        raise
+    finally:
+        event.end = time.perf_counter()
+        for hook in active:
+            _call_hook(hook.after, event)
+
+
+class OpenMetricsHook(EvaluationHook):
+    """Count evaluations, errors, and evaluation time in OpenMetrics text
+    format.
+
+    Metrics are labeled by ``kind`` and optionally by expression.
+    """
+    def __init__(self, by_expression: bool=False, prefix: str="pandas_paddles"):
+        """
+        Parameters
+        ----------
+        by_expression
+            Add the expression as ``expr`` label. Only use this for a bounded
+            number of expressions.
+        prefix
+            Prefix for the metric names.
+        """
+        self.by_expression = by_expression
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._count: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self._errors: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self._seconds: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def after(self, event: EvaluationEvent):
+        key: Tuple[str, ...] = (event.kind,)
+        if self.by_expression:
+            key = (event.kind, event.name)
+        with self._lock:
+            self._count[key] += 1
+            self._seconds[key] += event.duration
+            if event.error is not None:
+                self._errors[key] += 1
+
+    def _labels(self, key: Tuple[str, ...]) -> str:
+        names = ("kind", "expr")
+        values = (
+            v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            for v in key
+        )
+        return ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+
+    def render(self) -> str:
+        """Get the metrics in OpenMetrics text format."""
+        seconds = f"{self.prefix}_evaluation_seconds"
+        errors = f"{self.prefix}_evaluation_errors"
+        with self._lock:
+            keys = sorted(self._count)
+            lines = [
+                f"# TYPE {seconds} summary",
+                f"# UNIT {seconds} seconds",
+                f"# HELP {seconds} Time spent evaluating expressions and selections.",
+            ]
+            for key in keys:
+                lines.append(f"{seconds}_count{{{self._labels(key)}}} {self._count[key]}")
+                lines.append(f"{seconds}_sum{{{self._labels(key)}}} {self._seconds[key]!r}")
+            lines += [
+                f"# TYPE {errors} counter",
+                f"# HELP {errors} Failed evaluations of expressions and selections.",
+            ]
+            for key in keys:
+                lines.append(f"{errors}_total{{{self._labels(key)}}} {self._errors[key]}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Union[str, os.PathLike]):
+        """Write the metrics to ``path``, e.g. for the textfile collector of
+        the Prometheus node exporter."""
+        # Replace atomically so that scrapers never see a partial file
+        tmp_path = f"{os.fspath(path)}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+class ChromeTraceHook(EvaluationHook):
+    """Record evaluations as Chrome trace events.
+
+    The written JSON file can be opened with Perfetto
+    (https://ui.perfetto.dev) or ``chrome://tracing``.
+    """
+    def __init__(self, max_events: Optional[int]=100_000):
+        """
+        Parameters
+        ----------
+        max_events
+            Stop recording after this many events (``None`` for no limit).
+        """
+        self.max_events = max_events
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def after(self, event: EvaluationEvent):
+        if self.max_events is not None and len(self.events) >= self.max_events:
+            return
+        trace_event = {
+            "name": event.name,
+            "cat": event.kind,
+            "ph": "X",
+            "ts": event.start * 1e6,
+            "dur": event.duration * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if event.error is not None:
+            trace_event["args"] = {"error": repr(event.error)}
+        with self._lock:
+            self.events.append(trace_event)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Get the trace in Chrome trace-event format."""
+        with self._lock:
+            events = list(self.events)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Union[str, os.PathLike]):
+        """Write the trace to ``path``."""
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f)
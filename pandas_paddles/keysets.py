@@ -0,0 +1,289 @@
+"""Filter rows by sets of (composite) keys or values and look up values
+by keys.
+
+Use via :func:`pandas_paddles.paddles.isin_rows`,
+:class:`pandas_paddles.paddles.ValueSet`, and
+:func:`pandas_paddles.paddles.lookup`.
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+import weakref
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+from .util import frame_state, is_same_state
+
+
+class RowKeys:
+    """Set of key tuples to test the rows of data frames against.
+
+    The keys are stored in a unique :class:`pandas.Index` (a
+    :class:`pandas.MultiIndex` for more than one column). Its hash table is
+    built on the first lookup and reused for every data frame the keys are
+    tested with afterwards.
+
+    Calling an instance with a data frame returns a boolean series that is
+    true for the rows whose values in :attr:`columns` are one of the keys.
+    Missing values match missing values in the keys, like
+    :meth:`pandas.Series.isin`.
+
+    Parameters
+    ----------
+    keys
+        The keys: A data frame with (at least) ``columns``, a
+        :class:`pandas.MultiIndex`, or an iterable of tuples. For a single
+        column, also an iterable of values.
+    columns
+        The columns to match, in the order of the values in the key tuples.
+        Defaults to the columns of ``keys`` (or the names of the levels of
+        a ``MultiIndex``).
+    """
+    def __init__(self, keys: Any, columns: Optional[Sequence[Hashable]]=None):
+        if columns is None:
+            if isinstance(keys, pd.DataFrame):
+                columns = list(keys.columns)
+            elif isinstance(keys, pd.MultiIndex) and None not in keys.names:
+                columns = list(keys.names)
+            else:
+                raise ValueError("columns is required unless keys is a data frame or named MultiIndex")
+        self.columns: List[Hashable] = list(columns)
+        if not self.columns:
+            raise ValueError("No columns to match")
+        self.index = self._as_index(keys).unique()
+
+    def _as_index(self, keys: Any) -> pd.Index:
+        if isinstance(keys, pd.DataFrame):
+            keys = keys[self.columns]
+            if len(self.columns) == 1:
+                return pd.Index(keys.iloc[:, 0])
+            return pd.MultiIndex.from_frame(keys)
+
+        if isinstance(keys, pd.MultiIndex):
+            index = keys
+        elif len(self.columns) == 1:
+            values = list(keys) if not isinstance(keys, (pd.Index, pd.Series, np.ndarray)) else keys
+            if len(values) and all(isinstance(v, tuple) and len(v) == 1 for v in values):
+                values = [v[0] for v in values]
+            return pd.Index(values)
+        else:
+            tuples = list(keys)
+            if not tuples:
+                index = pd.MultiIndex.from_arrays([[] for _ in self.columns])
+            else:
+                index = pd.MultiIndex.from_tuples(tuples)
+
+        if index.nlevels != len(self.columns):
+            raise ValueError(f"Keys have {index.nlevels} values, expected {len(self.columns)} for {self.columns!r}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __call__(self, df: Any) -> Any:
+        if not isinstance(df, pd.DataFrame) and hasattr(df, "map_partitions"):
+            # dask: test each partition with the same keys
+            return df.map_partitions(self, meta=(None, bool))
+
+        if len(self.columns) == 1:
+            target: pd.Index = pd.Index(df[self.columns[0]])
+        else:
+            target = pd.MultiIndex.from_arrays([df[c] for c in self.columns])
+        mask = self.index.get_indexer_for(target) != -1
+        return pd.Series(mask, index=df.index)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.columns!r}: {len(self)} keys>"
+
+
+class ValueSet:
+    """Set of values to test series against, e.g. a block list reused for
+    every batch of a stream.
+
+    ``Series.isin()`` builds a hash table of the values on every call. A
+    ``ValueSet`` stores the values in a unique :class:`pandas.Index` whose
+    hash table is built on the first lookup and reused afterwards.
+
+    Pass it to ``isin`` in ``DF``- or ``S``-expressions::
+
+        blocklist = ValueSet(blocked_user_ids)
+        df.loc[~DF["user_id"].isin(blocklist)]
+
+    or use :meth:`contains` and :meth:`excludes` for the same expressions.
+    Outside of expressions, use :meth:`isin`.
+
+    Series with the (numpy) dtype of the values are looked up in the hash
+    table. Others (e.g. categorical, nullable, or other numpy dtypes) are
+    passed on to ``Series.isin()``, which casts them and handles their
+    missing values differently.
+
+    Parameters
+    ----------
+    values
+        The values, e.g. a list, array, series, or set.
+    """
+    def __init__(self, values: Iterable[Any]):
+        if not isinstance(values, (pd.Index, pd.Series, np.ndarray, pd.api.extensions.ExtensionArray)):
+            values = list(values)
+        self.index = pd.Index(values).unique()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self.index
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.index)
+
+    def isin(self, values: Any) -> Any:
+        """Get the same as ``values.isin(self)`` for a series, reusing the
+        hash table of the values."""
+        if not isinstance(values, pd.Series) and hasattr(values, "map_partitions"):
+            # dask: test each partition with the same values
+            return values.map_partitions(self.isin, meta=(values.name, bool))
+        if values.dtype != self.index.dtype:
+            # E.g. datetimes and strings, or booleans and integers: Let
+            # pandas cast the values like ``isin`` does
+            return values.isin(self.index)
+        mask = self.index.get_indexer_for(values) != -1
+        return pd.Series(mask, index=values.index, name=values.name)
+
+    def contains(self, expr: Any) -> Any:
+        """Create expression ``expr.isin(self)``, i.e. ``expr in self``."""
+        return expr.isin(self)
+
+    def excludes(self, expr: Any) -> Any:
+        """Create expression ``~expr.isin(self)``, i.e. ``expr not in self``."""
+        return ~expr.isin(self)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {len(self)} values>"
+
+
+class TableIndexCache:
+    """Cache the key indexes of lookup tables.
+
+    Indexes are stored per table (referenced weakly, i.e. entries are
+    dropped together with the table) and keyed by the key columns and a
+    version. The indexes of a table are dropped when its index or column
+    arrays are replaced, e.g. by ``sort_values(..., inplace=True)`` or
+    ``df["key"] = ...``.
+
+    .. note::
+        Modifications of values in place (e.g. ``df.loc[0, "key"] = 1``)
+        are not detected. Pass a new ``version`` (see
+        :func:`~pandas_paddles.paddles.lookup`) or call :meth:`clear` after
+        changing the keys of a table in place.
+    """
+    def __init__(self):
+        self._indexes: Dict[int, Tuple[Tuple[Any, ...], Dict[Hashable, pd.Index]]] = {}
+
+    def get(self, table: pd.DataFrame, key: Hashable, build: Callable[[], pd.Index]) -> pd.Index:
+        """Get the index of ``table`` for ``key`` or build and cache it."""
+        table_id = id(table)
+        state = frame_state(table)
+        entry = self._indexes.get(table_id)
+        if entry is None:
+            try:
+                weakref.finalize(table, self._indexes.pop, table_id, None)
+            except TypeError:
+                # Not weak-referencable: Don't keep the index around.
+                return build()
+        if entry is None or not is_same_state(entry[0], state):
+            # New or modified: the finalizer is registered
+            entry = self._indexes[table_id] = (state, {})
+        indexes = entry[1]
+        index = indexes.get(key)
+        if index is None:
+            index = indexes[key] = build()
+        return index
+
+    def clear(self):
+        """Drop all cached indexes."""
+        self._indexes.clear()
+
+
+table_index_cache = TableIndexCache()
+
+
+def _keys_index(keys: Sequence[Any]) -> pd.Index:
+    if len(keys) == 1:
+        return pd.Index(keys[0])
+    return pd.MultiIndex.from_arrays(keys)
+
+
+class LookupTable:
+    """Values of a table column by (composite) keys.
+
+    Calling an instance with the key series (one per key column) returns
+    the values for the keys, like ``keys.map(table.set_index(on)[value_col])``
+    for a single key. Keys not in the table get ``default`` (missing values
+    by default).
+
+    The keys of the table are stored in a :class:`pandas.Index` (a
+    :class:`pandas.MultiIndex` for more than one key column) whose hash
+    table is built on the first lookup and reused. Indexes built from
+    columns are cached per table and ``version`` in
+    :data:`table_index_cache`, so other ``LookupTable`` instances for the
+    same table and key columns share them.
+
+    Parameters
+    ----------
+    table
+        The lookup table.
+    value_col
+        The column of ``table`` with the values.
+    on
+        The key columns of ``table``. Defaults to the index of ``table``.
+    default
+        The value for keys not in the table.
+    version
+        Part of the cache key, change it after modifying ``table`` in place.
+
+    Raises
+    ------
+    ValueError
+        If the keys of the table are not unique.
+    """
+    def __init__(
+        self,
+        table: pd.DataFrame,
+        value_col: Hashable,
+        on: Optional[Sequence[Hashable]]=None,
+        default: Any=None,
+        version: Hashable=None,
+    ):
+        if on is None:
+            self.index = table.index
+        else:
+            on = list(on)
+            self.index = table_index_cache.get(
+                table,
+                (tuple(on), version),
+                lambda: _keys_index([table[c] for c in on]),
+            )
+        if not self.index.is_unique:
+            raise ValueError("The keys of the lookup table are not unique")
+        self.n_keys = self.index.nlevels
+        column = table[value_col]
+        self.values = column.array if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) else column.to_numpy()
+        self.name = value_col
+        self.default = default
+
+    def __call__(self, *keys: Any) -> Any:
+        if len(keys) != self.n_keys:
+            raise ValueError(f"Expected {self.n_keys} key series, got {len(keys)}")
+        first = keys[0]
+        if not isinstance(first, pd.Series) and hasattr(first, "map_partitions"):
+            # dask: look up each partition
+            import dask.dataframe as dd
+            meta = self(*[k._meta for k in keys])
+            return dd.map_partitions(self, *keys, meta=meta)
+
+        positions = self.index.get_indexer_for(_keys_index(keys))
+        values = take(self.values, positions, allow_fill=True, fill_value=self.default)
+        return pd.Series(values, index=first.index, name=self.name)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}: {len(self.index)} keys>"
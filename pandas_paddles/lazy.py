@@ -0,0 +1,362 @@
+"""Record filters, assigns, and column selections and materialize them once.
+
+Use via :func:`pandas_paddles.paddles.lazy`::
+
+    result = (
+        paddles.lazy(df)
+        .loc[DF["a"] > 0]
+        .loc[DF["b"].notna()]
+        .assign(c=DF["a"] * 2)
+        .loc[:, C["a", "c"]]
+        .collect()
+    )
+
+gives the same as the eager chain but copies the data only once.
+"""
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .analysis import is_aggregate, is_row_wise, is_same_context, map_args, referenced_columns
+from .axis import BinaryOp, EllipsisOp, LabelPredicateOp, LabelSelectionOp, OpComposerBase, UnaryOp
+from .pandas import PandasDataframeContext
+
+# Plan steps: (kind, payload) with kind
+# - "filter": list of row predicates (callables)
+# - "rows": any other ``.loc[]`` row key
+# - "assign": list of (name, value) pairs
+# - "select": column key
+Step = Tuple[str, Any]
+
+_LABEL_OPS = (LabelSelectionOp, LabelPredicateOp, EllipsisOp)
+
+
+def _is_label_only(op: Any) -> bool:
+    """Check if a ``C``-operation only looks at the column labels."""
+    if isinstance(op, BinaryOp):
+        return _is_label_only(op.left) and _is_label_only(op.right)
+    if isinstance(op, UnaryOp):
+        return _is_label_only(op.wrapped)
+    return isinstance(op, _LABEL_OPS)
+
+
+def _is_label_key(key: Any) -> bool:
+    """Check if column key can be resolved from the labels alone."""
+    if isinstance(key, OpComposerBase):
+        return key.axis == "columns" and _is_label_only(key.op)
+    return isinstance(key, (list, slice))
+
+
+def _is_row_local(expr: PandasDataframeContext) -> bool:
+    """Check if the result for each row only depends on the same row.
+
+    Unlike :func:`~pandas_paddles.analysis.is_row_wise`, this excludes
+    aggregates like in ``DF["x"] - DF["x"].mean()``, which change when rows
+    are removed.
+    """
+    if not is_row_wise(expr):
+        return False
+    found = False
+    def check(arg):
+        nonlocal found
+        if is_same_context(arg, expr) and is_aggregate(arg):
+            found = True
+        return arg
+    map_args(expr, check)
+    return not found
+
+
+def _filter_columns(step: Step) -> Optional[Set[Hashable]]:
+    kind, payload = step
+    if kind != "filter" or not isinstance(payload[0], PandasDataframeContext):
+        return None
+    columns = referenced_columns(payload[0])
+    return None if columns is None else set(columns)
+
+
+def _is_row_wise_value(value: Any) -> bool:
+    """Check if an assigned value does not depend on the other rows."""
+    if isinstance(value, PandasDataframeContext):
+        return _is_row_local(value)
+    # Series are aligned by the index
+    return isinstance(value, pd.Series) or (not callable(value) and pd.api.types.is_scalar(value))
+
+
+def _selected_labels(df: pd.DataFrame, steps: Sequence[Step]) -> Dict[int, Set[Hashable]]:
+    """Resolve label-only column selections with the labels alone.
+
+    Returns the selected labels by position of the ``select`` step, for the
+    steps up to the first selection that cannot be resolved.
+    """
+    labels: Optional[List[Hashable]] = list(df.columns) if df.columns.is_unique else None
+    selected: Dict[int, Set[Hashable]] = {}
+    for i, (kind, payload) in enumerate(steps):
+        if labels is None:
+            break
+        if kind == "assign":
+            labels += [name for name, _ in payload if name not in labels]
+        elif kind == "select":
+            if _is_label_key(payload):
+                labels = list(pd.DataFrame(columns=labels).loc[:, payload].columns)
+                selected[i] = set(labels)
+            else:
+                labels = None
+    return selected
+
+
+def _can_swap(filter_columns: Optional[Set[Hashable]], step: Step, selected: Optional[Set[Hashable]]) -> bool:
+    """Check if a filter can be moved before ``step``.
+
+    ``selected`` are the labels selected by a ``select`` step, if known.
+    """
+    kind, payload = step
+    if filter_columns is None:
+        return False
+    if kind == "select":
+        # Only removes columns, unless the selection depends on the contents
+        # of the columns (e.g. ``C.where(...)``) or the filter uses removed
+        # columns (and fails in the original order)
+        return selected is not None and filter_columns <= selected
+    if kind == "assign":
+        return (
+            filter_columns.isdisjoint(name for name, _ in payload)
+            and all(_is_row_wise_value(v) for _, v in payload)
+        )
+    return False
+
+
+def _optimize(df: pd.DataFrame, steps: Sequence[Step]) -> List[Step]:
+    """Push filters forward and merge consecutive filters and assigns."""
+    selected = _selected_labels(df, steps)
+    plan: List[Step] = []
+    # Selected labels of the steps in ``plan``
+    plan_selected: List[Optional[Set[Hashable]]] = []
+    for n, step in enumerate(steps):
+        if step[0] == "filter":
+            columns = _filter_columns(step)
+            i = len(plan)
+            while i > 0 and _can_swap(columns, plan[i - 1], plan_selected[i - 1]):
+                i -= 1
+            plan.insert(i, step)
+            plan_selected.insert(i, None)
+        else:
+            plan.append(step)
+            plan_selected.append(selected.get(n))
+
+    merged: List[Step] = []
+    for kind, payload in plan:
+        if merged and kind == merged[-1][0] and kind in ("filter", "assign"):
+            merged[-1] = (kind, merged[-1][1] + payload)
+        else:
+            merged.append((kind, payload))
+    return merged
+
+
+def _needed_columns(df: pd.DataFrame, plan: Sequence[Step]) -> List[Optional[Set[Hashable]]]:
+    """Get the columns needed after each step (``None`` for all)."""
+    selected = _selected_labels(df, plan)
+
+    needed: Optional[Set[Hashable]] = None
+    result: List[Optional[Set[Hashable]]] = [None] * len(plan)
+    for i in range(len(plan) - 1, -1, -1):
+        result[i] = None if needed is None else set(needed)
+        kind, payload = plan[i]
+        if kind == "select":
+            resolved = selected.get(i)
+            if resolved is None:
+                needed = None
+            elif needed is None:
+                needed = set(resolved)
+            else:
+                needed &= resolved
+        elif needed is not None and kind == "assign":
+            for name, value in reversed(payload):
+                needed.discard(name)
+                if isinstance(value, PandasDataframeContext):
+                    columns = referenced_columns(value)
+                elif callable(value):
+                    columns = None
+                else:
+                    columns = []
+                if columns is None:
+                    needed = None
+                    break
+                needed.update(columns)
+        elif needed is not None and kind == "filter":
+            for predicate in payload:
+                columns = referenced_columns(predicate) if isinstance(predicate, PandasDataframeContext) else None
+                if columns is None:
+                    needed = None
+                    break
+                needed.update(columns)
+    return result
+
+
+def _as_mask(result: Any, frame: pd.DataFrame) -> Optional[np.ndarray]:
+    """Get a boolean numpy mask aligned with ``frame`` or ``None``."""
+    if (
+        isinstance(result, pd.Series)
+        and result.dtype == bool
+        and result.index is frame.index
+    ):
+        return result.to_numpy()
+    return None
+
+
+def _apply_filters(
+    frame: pd.DataFrame,
+    predicates: List[Any],
+    columns: Optional[List[Hashable]],
+) -> Tuple[pd.DataFrame, bool]:
+    """Apply consecutive row filters with a single copy of the data.
+
+    Row-wise ``DF``-expressions after the first are evaluated with the same
+    frame and combined into one mask. Everything else is applied one after
+    another.
+
+    Returns the filtered frame and whether it is a copy.
+    """
+    mask: Optional[np.ndarray] = None
+    rest = list(predicates)
+    while rest:
+        predicate = rest[0]
+        fusable = mask is None or (isinstance(predicate, PandasDataframeContext) and _is_row_local(predicate))
+        result = predicate(frame) if fusable else None
+        current = _as_mask(result, frame) if fusable else None
+        if current is None:
+            if mask is not None:
+                # Not fusable: materialize and start over
+                frame = frame.take(np.flatnonzero(mask))
+                mask = None
+                continue
+            frame = frame.loc[result]
+        elif mask is None:
+            mask = current.copy()
+        else:
+            np.logical_and(mask, current, out=mask)
+        rest.pop(0)
+
+    if mask is None:
+        # E.g. a label selection, might be a view
+        return (frame if columns is None else frame.loc[:, columns]), False
+    if columns is None:
+        # Unlike .loc[], not marked as copy of a slice
+        return frame.take(np.flatnonzero(mask)), True
+    return frame.loc[mask, columns], True
+
+
+class _LazyLocIndexer:
+    def __init__(self, lazy_frame: "LazyFrame"):
+        self._lazy_frame = lazy_frame
+
+    def __getitem__(self, key: Any) -> "LazyFrame":
+        if isinstance(key, tuple) and len(key) == 2:
+            rows, columns = key
+        else:
+            rows, columns = key, slice(None)
+
+        steps: List[Step] = []
+        if not (isinstance(rows, slice) and rows == slice(None)):
+            steps.append(("filter", [rows]) if callable(rows) else ("rows", rows))
+        if not (isinstance(columns, slice) and columns == slice(None)):
+            steps.append(("select", columns))
+        return self._lazy_frame._append(*steps)
+
+
+class LazyFrame:
+    """Recorded filters, assigns, and column selections of a data frame.
+
+    Create with :func:`pandas_paddles.paddles.lazy`. Each method returns a
+    new ``LazyFrame`` with the step appended, nothing is evaluated before
+    :meth:`collect`.
+
+    Rows are selected with ``.loc[rows]``, columns with ``.loc[:, columns]``
+    or ``[columns]``. Row predicates must evaluate to boolean series (e.g.
+    ``DF["x"] > 0``) to be fused; other row keys are applied as they are.
+    Column keys must select a list of columns (e.g. ``C.dtype == float`` or
+    ``["a", "b"]``).
+    """
+    def __init__(self, df: pd.DataFrame, steps: Tuple[Step, ...]=()):
+        self._df = df
+        self._steps = tuple(steps)
+
+    def _append(self, *steps: Step) -> "LazyFrame":
+        return type(self)(self._df, self._steps + steps)
+
+    @property
+    def loc(self) -> _LazyLocIndexer:
+        """Record a row and/or column selection like ``DataFrame.loc[]``."""
+        return _LazyLocIndexer(self)
+
+    def __getitem__(self, columns: Any) -> "LazyFrame":
+        """Record a column selection, i.e. ``df[columns]``."""
+        if callable(columns) and not isinstance(columns, OpComposerBase):
+            raise TypeError("Use .loc[] to filter rows")
+        return self._append(("select", columns))
+
+    def assign(self, **kwargs: Any) -> "LazyFrame":
+        """Record adding columns like :meth:`pandas.DataFrame.assign`."""
+        return self._append(("assign", list(kwargs.items())))
+
+    def plan(self) -> List[Step]:
+        """Get the optimized steps as ``(kind, payload)`` pairs.
+
+        Kinds are ``"filter"`` (list of fused predicates), ``"rows"``,
+        ``"assign"`` (list of name-value pairs), and ``"select"``.
+        """
+        return _optimize(self._df, self._steps)
+
+    def collect(self) -> pd.DataFrame:
+        """Evaluate the recorded steps.
+
+        Before evaluation, the steps are optimized:
+
+        - Filters are moved before assigns of columns they do not use (if
+          the assigned values do not depend on other rows, e.g.
+          ``DF["x"] - DF["x"].mean()``) and before column selections.
+        - Consecutive row-wise filters are combined into one boolean mask
+          that is applied once.
+        - Columns that are never used or selected are not copied. This
+          needs the used columns of all expressions (see
+          :func:`~pandas_paddles.analysis.referenced_columns`) and column
+          selections that only use labels, e.g. ``C["a", "b"]`` or
+          ``C.startswith("x_")``, but not ``C.dtype == int``.
+
+        Assigns are applied in-place on the copy made by the filters.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The same as applying the steps to the data frame one by one.
+        """
+        plan = _optimize(self._df, self._steps)
+        needed = _needed_columns(self._df, plan)
+
+        frame = self._df
+        # Whether ``frame`` can be modified in-place
+        owned = False
+        for (kind, payload), columns_needed in zip(plan, needed):
+            if kind == "filter":
+                columns = None
+                if columns_needed is not None and frame.columns.is_unique:
+                    columns = [c for c in frame.columns if c in columns_needed]
+                    if len(columns) == len(frame.columns):
+                        columns = None
+                frame, owned = _apply_filters(frame, payload, columns)
+            elif kind == "rows":
+                frame = frame.loc[payload]
+                owned = False
+            elif kind == "assign":
+                if not owned:
+                    frame = frame.copy(deep=False)
+                    owned = True
+                for name, value in payload:
+                    frame[name] = value(frame) if callable(value) else value
+            else:
+                frame = frame.loc[:, payload]
+                owned = False
+        return frame
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._df.shape} {len(self._steps)} steps>"
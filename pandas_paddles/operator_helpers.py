@@ -39,6 +39,175 @@ binary_ops_non_reversable = (
 )
 
 
+# Series methods where the result for each row only depends on the same row.
+row_wise_methods = (
+    "abs",
+    "astype",
+    "between",
+    "clip",
+    "eq",
+    "fillna",
+    "ge",
+    "gt",
+    "isin",
+    "isna",
+    "isnull",
+    "le",
+    "lt",
+    "map",
+    "mask",
+    "ne",
+    "notna",
+    "notnull",
+    "replace",
+    "round",
+    "where",
+)
+
+# Series methods reducing all rows to a scalar.
+aggregate_methods = (
+    "all",
+    "any",
+    "count",
+    "max",
+    "mean",
+    "median",
+    "min",
+    "nunique",
+    "prod",
+    "quantile",
+    "sem",
+    "std",
+    "sum",
+    "var",
+)
+
+# Typed accessors with row-wise methods and attributes.
+row_wise_accessors = (
+    "dt",
+    "str",
+)
+
+# Methods and attributes of the typed accessors where the result for each
+# row only depends on the same row. Members that combine rows (e.g.
+# ``.str.cat()``), return frames with columns depending on all rows (e.g.
+# ``.str.get_dummies()``), or scalars (e.g. ``.dt.tz``) are missing.
+row_wise_accessor_members = {
+    "dt": (
+        "as_unit",
+        "ceil",
+        "date",
+        "day",
+        "day_name",
+        "day_of_week",
+        "day_of_year",
+        "dayofweek",
+        "dayofyear",
+        "days",
+        "days_in_month",
+        "daysinmonth",
+        "end_time",
+        "floor",
+        "hour",
+        "is_leap_year",
+        "is_month_end",
+        "is_month_start",
+        "is_quarter_end",
+        "is_quarter_start",
+        "is_year_end",
+        "is_year_start",
+        "microsecond",
+        "microseconds",
+        "minute",
+        "month",
+        "month_name",
+        "nanosecond",
+        "nanoseconds",
+        "normalize",
+        "quarter",
+        "qyear",
+        "round",
+        "second",
+        "seconds",
+        "start_time",
+        "strftime",
+        "time",
+        "timetz",
+        "to_period",
+        "to_timestamp",
+        "total_seconds",
+        "tz_convert",
+        "tz_localize",
+        "weekday",
+        "year",
+    ),
+    "str": (
+        "capitalize",
+        "casefold",
+        "center",
+        "contains",
+        "count",
+        "decode",
+        "encode",
+        "endswith",
+        "extract",
+        "find",
+        "findall",
+        "fullmatch",
+        "get",
+        "index",
+        "isalnum",
+        "isalpha",
+        "isdecimal",
+        "isdigit",
+        "islower",
+        "isnumeric",
+        "isspace",
+        "istitle",
+        "isupper",
+        "join",
+        "len",
+        "ljust",
+        "lower",
+        "lstrip",
+        "match",
+        "normalize",
+        "pad",
+        "partition",
+        "removeprefix",
+        "removesuffix",
+        "replace",
+        "rfind",
+        "rindex",
+        "rjust",
+        "rpartition",
+        "rsplit",
+        "rstrip",
+        "slice",
+        "slice_replace",
+        "split",
+        "startswith",
+        "strip",
+        "swapcase",
+        "title",
+        "translate",
+        "upper",
+        "wrap",
+        "zfill",
+    ),
+}
+
+# Accessor methods that are only row-wise without ``expand=True``: The
+# columns of the expanded frame depend on all rows. Maps the method to the
+# default of ``expand`` and its position (``None`` if keyword-only).
+expanding_accessor_methods = {
+    "extract": (True, 2),
+    "partition": (True, 1),
+    "rpartition": (True, 1),
+    "rsplit": (False, None),
+    "split": (False, None),
+}
+
 
 _binary_syntax = {
     "add": "+",
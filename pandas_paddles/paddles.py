@@ -6,20 +6,36 @@ Use as::
 """
 from functools import reduce
 import operator
-from typing import Any, Callable, Dict, Iterable, Literal, Union
+from typing import Any, Callable, Dict, Hashable, Iterable, Literal, Optional, Sequence, Union
 
-from .pandas import PandasDataframeContext
-try:
-    from .dask import DF
-except ImportError:
-    from .pandas import DF
+import pandas as pd
+
+from .closures import BooleanReduceClosure, PredicateStats, ShortCircuitClosure, StrJoinClosure
+from .contexts import ClosureFactoryBase
+from .keysets import LookupTable, RowKeys, ValueSet
+from .lazy import LazyFrame
+from .pandas import DF, PandasDataframeContext
+from .parallel import parallel_assign, parallel_eval
+from .pipe import StageTracker, stage
+from .strings import match_any_pattern
 
 __all__ = [
     "build_filter",
     "combine",
+    "isin_rows",
+    "lazy",
+    "lookup",
+    "parallel_assign",
+    "parallel_eval",
+    "stage",
+    "StageTracker",
     "str_join",
+    "str_match_any",
+    "ValueSet",
 ]
 
+_reduce_op_names = {operator.and_: "__and__", operator.or_: "__or__"}
+
 # Some typing hints
 ColSpec = Union[str, PandasDataframeContext]
 BinaryOp = Union[
@@ -63,7 +79,7 @@ def ensure_DF_expr(col: ColSpec) -> PandasDataframeContext:
     return col
 
 
-def str_join(sep: str, col1: ColSpec, *cols: ColSpec) -> PandasDataframeContext:
+def str_join(sep: str, col1: ColSpec, *cols: ColSpec, dtype: Any = None) -> PandasDataframeContext:
     """Create expression to join multiple columns in a string.
 
     This is similar to ``str.join``
@@ -79,6 +95,10 @@ def str_join(sep: str, col1: ColSpec, *cols: ColSpec) -> PandasDataframeContext:
 
         In both cases the expression is first casted to ``str`` using
         :func:`pandas.Series.astype()`.
+    dtype
+        The dtype of the result. Defaults to ``object``. Use
+        ``"string[pyarrow]"`` to keep the result in Arrow buffers, which
+        needs much less memory for many rows.
 
     Returns
     -------
@@ -113,16 +133,85 @@ def str_join(sep: str, col1: ColSpec, *cols: ColSpec) -> PandasDataframeContext:
         0  a  X  0      a+0
         1  b  Y  1      b+1
         2  c  Z  2      c+2
+
+    Notes
+    -----
+    Each column is converted once and all columns are joined in a single
+    pass (with :mod:`pyarrow` if available, see
+    :func:`pandas_paddles.strings.join`) instead of creating an
+    intermediate series for every separator and column.
     """
-    expr = ensure_DF_expr(col1).astype(str)
-    for col in cols:
-        expr = expr + sep + ensure_DF_expr(col).astype(str)
-    return expr
+    exprs = [ensure_DF_expr(col) for col in (col1,) + cols]
+    return PandasDataframeContext((StrJoinClosure("str_join", PandasDataframeContext, sep, *exprs, dtype=dtype),))
+
+
+def str_match_any(
+    col: ColSpec,
+    patterns: Iterable[str],
+    kind: Literal["prefix", "suffix", "substring", "regex"] = "substring",
+    case: bool = True,
+    na: Any = False,
+) -> PandasDataframeContext:
+    """Create expression to check if strings match any of many patterns.
+
+    ::
+
+        df.loc[str_match_any("url", ["/api/", "/static/"])]
+
+    gives the same as::
+
+        df.loc[DF["url"].str.contains("/api/", regex=False) | DF["url"].str.contains("/static/", regex=False)]
+
+    but all patterns are combined into one regular expression that is
+    evaluated in a single pass over the column. Literal patterns are
+    combined in a prefix tree, so that not every pattern is tried at every
+    position. The regular expression is built once per pattern set (see
+    :func:`pandas_paddles.strings.match_any_pattern`).
+
+    Like other ``.str`` methods, the expression is evaluated with
+    :mod:`pyarrow` for Arrow-backed strings and, if enabled, on the distinct
+    values of low-cardinality columns (see :mod:`pandas_paddles.uniques`).
+
+    Parameters
+    ----------
+    col
+        The column name (``str``) or a ``DF``-expression.
+    patterns
+        The patterns.
+    kind
+        How to match the patterns:
+
+        - ``"prefix"``: The strings start with a pattern, like
+          ``str.startswith``.
+        - ``"suffix"``: The strings end with a pattern, like
+          ``str.endswith``.
+        - ``"substring"``: The strings contain a pattern.
+        - ``"regex"``: The patterns are regular expressions and
+          :func:`re.search` finds one of them.
+    case
+        Match case-sensitive.
+    na
+        The result for missing values.
+
+    Returns
+    -------
+    PandasDataframeContext
+        The ``DF``-expression evaluating to a boolean series.
+    """
+    pattern = match_any_pattern(kind, tuple(sorted(set(patterns))))
+    expr = ensure_DF_expr(col)
+    if kind == "prefix":
+        return expr.str.match(pattern, case=case, na=na)
+    if kind == "suffix":
+        return expr.str.fullmatch(pattern, case=case, na=na)
+    return expr.str.contains(pattern, case=case, na=na, regex=True)
 
 
 def combine(
     bool_expressions: Iterable[PandasDataframeContext],
     op: Callable[[Any, Any], Any] = operator.and_,
+    short_circuit: bool = False,
+    adaptive: bool = False,
 ) -> PandasDataframeContext:
     """Combine multiple DF-expressions to use in df.loc[].
 
@@ -141,10 +230,31 @@ def combine(
         :func:`operator.or_` will be most useful. ``"and"``, ``"&"`` and
         ``"or"``, ``"|"`` are also accepted and the respective operator is
         used.
+    short_circuit
+        Evaluate each expression only for the rows not decided by the
+        expressions before, e.g. for ``&`` only for rows where all previous
+        expressions are true. This pays off for expensive expressions, e.g.
+        ``DF["s"].str.contains(...)``, after selective ones. Only supported
+        for :func:`operator.and_` and :func:`operator.or_`. See
+        :class:`~pandas_paddles.closures.ShortCircuitClosure`.
+    adaptive
+        Implies ``short_circuit``. Record the time and selectivity of each
+        expression and reorder them in later evaluations so that cheap
+        and selective expressions are evaluated first. The statistics are
+        kept with the returned expression (see
+        ``expr._closures[0].stats``).
 
     Returns
     -------
     The combined expression.
+
+    Notes
+    -----
+    More than two expressions are combined by :func:`operator.and_` and
+    :func:`operator.or_` in a single step: The expressions are evaluated one
+    after another into one boolean buffer (see
+    :class:`~pandas_paddles.closures.BooleanReduceClosure`), instead of
+    creating a temporary mask for each operator.
     """
     if isinstance(op, str):
         if op == "and" or op == "&":
@@ -153,6 +263,24 @@ def combine(
             op = operator.or_
         else:
             raise ValueError(f"Unsupported operator name: {op!r}")
+
+    bool_expressions = list(bool_expressions)
+    op_name = _reduce_op_names.get(op)
+    if short_circuit or adaptive:
+        if op_name is None:
+            raise ValueError("Short-circuit evaluation is only supported for 'and' and 'or'")
+        if not bool_expressions:
+            raise ValueError("No expressions to combine")
+        factory_cls = type(bool_expressions[0])
+        stats = PredicateStats(len(bool_expressions)) if adaptive else None
+        return factory_cls((ShortCircuitClosure(op_name, factory_cls, *bool_expressions, stats=stats),))
+    if (
+        op_name is not None
+        and len(bool_expressions) > 2
+        and isinstance(bool_expressions[0], ClosureFactoryBase)
+    ):
+        first, *rest = bool_expressions
+        return type(first)(first._closures + (BooleanReduceClosure(op_name, type(first), *rest),))
     return reduce(op, bool_expressions)
 
 
@@ -192,3 +320,153 @@ def build_filter(
     """
     expressions = (ensure_DF_expr(col) == val for col, val in predicates.items())
     return combine(expressions, op=op)
+
+
+def isin_rows(keys: Any, columns: Optional[Sequence[Hashable]] = None) -> PandasDataframeContext:
+    """Build a filter expression selecting rows by composite keys.
+
+    ::
+
+        df.loc[isin_rows([("c1", "p1"), ("c2", "p7")], columns=["customer", "product"])]
+
+    is equivalent to::
+
+        df.loc[build_filter({"customer": "c1", "product": "p1"}) | build_filter({"customer": "c2", "product": "p7"})]
+
+    but the keys are put in a hash table once (see
+    :class:`~pandas_paddles.keysets.RowKeys`) and each row is looked up in
+    it, i.e. the time grows with the number of rows and not with the number
+    of keys.
+
+    Parameters
+    ----------
+    keys
+        The allowed keys: A data frame with (at least) ``columns``, a
+        :class:`pandas.MultiIndex`, or an iterable of tuples. For a single
+        column, also an iterable of values.
+    columns
+        The columns to match, in the order of the values in the key tuples.
+        Defaults to the columns of ``keys`` if it is a data frame.
+
+    Returns
+    -------
+    PandasDataframeContext
+        The ``DF``-expression evaluating to a boolean series.
+
+    Examples
+    --------
+    Keep the rows of a fact table matching an allow-list::
+
+        allowed = pd.DataFrame({"customer": [...], "product": [...]})
+        df.loc[isin_rows(allowed)]
+    """
+    return DF.pipe(RowKeys(keys, columns))
+
+
+def lookup(
+    keys: Union[ColSpec, Sequence[ColSpec]],
+    table: pd.DataFrame,
+    value_col: Hashable,
+    on: Optional[Sequence[Hashable]] = None,
+    default: Any = None,
+    version: Hashable = None,
+) -> PandasDataframeContext:
+    """Build an expression looking up the values of ``value_col`` in
+    ``table`` for the keys in ``keys``.
+
+    ::
+
+        df.assign(price=lookup("product", prices, "price"))
+
+    is equivalent to::
+
+        df.assign(price=DF["product"].map(prices["price"]))
+
+    but the hash table of the keys of ``table`` is built once and reused
+    for every evaluation (see :class:`~pandas_paddles.keysets.LookupTable`),
+    e.g. for each batch of a stream. Composite keys are supported, unlike
+    with ``map``.
+
+    Parameters
+    ----------
+    keys
+        The key column (name or ``DF``-expression) or a list of them, one
+        per key column of ``table``.
+    table
+        The lookup table with unique keys.
+    value_col
+        The column of ``table`` with the values.
+    on
+        The key columns of ``table``. Defaults to the index of ``table``
+        (all levels of a ``MultiIndex``).
+    default
+        The value for keys not in ``table``. Defaults to a missing value.
+    version
+        Hashable identifying the state of ``table``: The key index built
+        from ``on`` is cached per table and ``version``. Pass a new value
+        after modifying the key columns of ``table`` in place.
+
+    Returns
+    -------
+    PandasDataframeContext
+        The ``DF``-expression evaluating to a series named ``value_col``.
+
+    Raises
+    ------
+    ValueError
+        If the keys of ``table`` are not unique or the number of ``keys``
+        does not match the key columns of ``table``.
+
+    Examples
+    --------
+    Look up prices by composite key::
+
+        prices = pd.DataFrame({"product": [...], "region": [...], "price": [...]})
+        df.assign(price=lookup(["product", "region"], prices, "price", on=["product", "region"], default=0.0))
+    """
+    if isinstance(keys, (str, PandasDataframeContext)):
+        keys = [keys]
+    exprs = [ensure_DF_expr(k) for k in keys]
+    if not exprs:
+        raise ValueError("No key columns to look up")
+    table_lookup = LookupTable(table, value_col, on=on, default=default, version=version)
+    if len(exprs) != table_lookup.n_keys:
+        raise ValueError(f"Got {len(exprs)} key columns, the table has {table_lookup.n_keys}")
+    return exprs[0].pipe(table_lookup, *exprs[1:])
+
+
+def lazy(df: pd.DataFrame) -> LazyFrame:
+    """Record filters, assigns, and column selections to evaluate them at
+    once.
+
+    Chains of ``.loc[]`` and ``.assign()`` copy the data frame at every
+    step. The returned :class:`~pandas_paddles.lazy.LazyFrame` only records
+    the steps. :meth:`~pandas_paddles.lazy.LazyFrame.collect` combines
+    consecutive filters into one mask, moves filters before independent
+    assigns, skips unused columns, and copies the data only once.
+
+    Parameters
+    ----------
+    df
+        The data frame.
+
+    Returns
+    -------
+    LazyFrame
+        Record steps with ``.loc[]``, ``[]``, and ``.assign()`` and
+        evaluate them with ``.collect()``.
+
+    Examples
+    --------
+    ::
+
+        result = (
+            lazy(df)
+            .loc[DF["a"] > 0]
+            .loc[DF["b"].notna()]
+            .assign(c=DF["a"] * 2)
+            .loc[:, C["a", "c"]]
+            .collect()
+        )
+    """
+    return LazyFrame(df)
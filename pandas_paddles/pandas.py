@@ -1,6 +1,6 @@
 """Pandas-only contexts"""
 
-from typing import Optional
+from typing import Any, ClassVar, Optional
 
 import pandas as pd
 
@@ -9,6 +9,7 @@ from .contexts import (
     get_obj_attr_doc,
     ClosureFactoryBase,
 )
+from .util import is_dask_dataframe
 
 
 @add_dunder_operators # This is necessary to overload all dunder operators.
@@ -49,9 +50,24 @@ class PandasDataframeContext(ClosureFactoryBase):
         # 1  2  4
         # 2  3  6
         # 3  4  8
+
+    Dask data frames are evaluated with
+    :class:`~pandas_paddles.dask.DaskDataframeContext`. The dask integration
+    is only imported when the first dask data frame is passed.
     """
     wrapped_cls = (pd.DataFrame,)
     wrapped_s = "DF"
+    _dispatch_dask: ClassVar[bool] = True
+
+    def _accepts(self, obj: Any) -> bool:
+        return isinstance(obj, pd.DataFrame) or is_dask_dataframe(obj)
+
+    def _evaluate(self, root_obj: Any) -> Any:
+        if self._dispatch_dask and is_dask_dataframe(root_obj):
+            from .dask import DaskDataframeContext
+            return DaskDataframeContext(self._closures)._evaluate(root_obj)
+        return super()._evaluate(root_obj)
+
     def _get_doc(self) -> Optional[str]:
         doc = super()._get_doc()
         # Assume DataFrame-level function for 1-level accessor
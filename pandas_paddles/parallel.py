@@ -0,0 +1,300 @@
+"""Evaluate row-wise ``DF``-expressions with multiple processes.
+
+The data frame is split into row ranges that are evaluated in worker
+processes. Numeric columns are passed to the workers through
+:mod:`multiprocessing.shared_memory` without copying them per worker. Other
+columns (e.g. ``object`` columns with strings) are pickled per row range.
+
+Use via :func:`pandas_paddles.paddles.parallel_eval` and
+:func:`pandas_paddles.paddles.parallel_assign`.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import pickle
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .analysis import is_aggregate, is_row_wise, map_args, referenced_columns
+from .pandas import PandasDataframeContext
+
+# Column name, shared memory block name, numpy dtype string
+_SharedColumn = Tuple[Hashable, str, str]
+
+
+def _substitute_aggregates(expr: PandasDataframeContext, df: pd.DataFrame) -> Any:
+    """Evaluate all aggregates in ``expr`` with the full ``df``.
+
+    Returns the value if ``expr`` itself is an aggregate.
+    """
+    def substitute(arg):
+        if isinstance(arg, PandasDataframeContext) and is_aggregate(arg):
+            return arg._evaluate(df)
+        return arg
+
+    new = substitute(expr)
+    if new is expr:
+        new = map_args(expr, substitute)
+    return new
+
+
+def _can_share(column: pd.Series) -> bool:
+    """Check if ``column`` is a plain numpy array of fixed-size values."""
+    return isinstance(column.dtype, np.dtype) and column.dtype.kind in "biufcmM" and len(column) > 0
+
+
+def _evaluate_frame(
+    exprs: List[PandasDataframeContext],
+    columns: List[Hashable],
+    shared: Dict[Hashable, Tuple[shared_memory.SharedMemory, str]],
+    local: Dict[Hashable, Any],
+    start: int,
+    stop: int,
+) -> bytes:
+    data = dict(local)
+    for name, (shm, dtype) in shared.items():
+        data[name] = np.ndarray((stop,), dtype=dtype, buffer=shm.buf)[start:stop]
+    df = pd.DataFrame(data, columns=columns, index=pd.RangeIndex(start, stop), copy=False)
+    results = [expr._evaluate(df) for expr in exprs]
+    # Serialize before the shared memory is closed: The results can be
+    # views of the shared columns.
+    return pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _evaluate_rows(
+    exprs: List[PandasDataframeContext],
+    columns: List[Hashable],
+    shared: List[_SharedColumn],
+    local: Dict[Hashable, Any],
+    start: int,
+    stop: int,
+) -> bytes:
+    """Evaluate ``exprs`` for the rows ``start:stop`` (in a worker process)."""
+    # Worker processes share the resource tracker of the parent, which
+    # unlinks the shared memory.
+    blocks = {name: (shared_memory.SharedMemory(name=shm_name), dtype) for name, shm_name, dtype in shared}
+    try:
+        return _evaluate_frame(exprs, columns, blocks, local, start, stop)
+    finally:
+        for shm, _ in blocks.values():
+            try:
+                shm.close()
+            except BufferError:
+                # Still referenced by the traceback of an error. The memory
+                # is released when the worker exits.
+                pass
+
+
+def _row_ranges(n_rows: int, n_chunks: int) -> List[Tuple[int, int]]:
+    bounds = np.linspace(0, n_rows, n_chunks + 1).astype(int)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _same_dtype(left: Any, right: Any) -> bool:
+    if isinstance(left, pd.CategoricalDtype) and isinstance(right, pd.CategoricalDtype):
+        # ``pd.concat`` only keeps categoricals with identical categories
+        return left.ordered == right.ordered and left.categories.equals(right.categories)
+    return left == right
+
+
+def _concat_chunks(parts: List[Any], index: pd.Index) -> Optional[Any]:
+    """Concatenate the results for the row ranges.
+
+    Returns ``None`` if the results differ in type, dtype, or columns,
+    e.g. categoricals with the categories of each row range, because the
+    concatenation would differ from the result for all rows.
+    """
+    first = parts[0]
+    if not isinstance(first, (pd.Series, pd.DataFrame)):
+        return None
+    for part in parts[1:]:
+        if type(part) is not type(first):
+            return None
+        if isinstance(first, pd.DataFrame):
+            if not part.columns.equals(first.columns) or not all(
+                _same_dtype(a, b) for a, b in zip(part.dtypes, first.dtypes)
+            ):
+                return None
+        elif part.name != first.name or not _same_dtype(part.dtype, first.dtype):
+            return None
+    result = pd.concat(parts)
+    if len(result) != len(index):
+        return None
+    result.index = index
+    return result
+
+
+def _evaluate_parallel(
+    df: pd.DataFrame,
+    exprs: List[PandasDataframeContext],
+    workers: Optional[int],
+    executor: Optional[Executor],
+) -> List[Any]:
+    """Evaluate row-wise ``exprs`` (without aggregates) in parallel."""
+    columns: List[Hashable] = []
+    for expr in exprs:
+        columns.extend(c for c in referenced_columns(expr) if c not in columns)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    ranges = _row_ranges(len(df), workers)
+    if len(ranges) < 2:
+        return [expr._evaluate(df) for expr in exprs]
+
+    blocks = []
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(workers)
+    try:
+        shared: List[_SharedColumn] = []
+        local: Dict[Hashable, Any] = {}
+        for name in columns:
+            column = df[name]
+            if _can_share(column):
+                values = column.to_numpy()
+                shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+                blocks.append(shm)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+                shared.append((name, shm.name, values.dtype.str))
+            else:
+                local[name] = column.array
+
+        futures = [
+            executor.submit(
+                _evaluate_rows,
+                exprs,
+                columns,
+                shared,
+                {name: values[start:stop] for name, values in local.items()},
+                start,
+                stop,
+            )
+            for start, stop in ranges
+        ]
+        chunks = [pickle.loads(f.result()) for f in futures]
+    finally:
+        if own_executor:
+            executor.shutdown()
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    results = []
+    for i, expr in enumerate(exprs):
+        result = _concat_chunks([chunk[i] for chunk in chunks], df.index)
+        if result is None:
+            result = expr._evaluate(df)
+        results.append(result)
+    return results
+
+
+def _prepare(expr: Any, df: pd.DataFrame, available: Iterable[Hashable]) -> Tuple[Any, bool]:
+    """Substitute aggregates and check if ``expr`` can be evaluated in
+    parallel."""
+    if not isinstance(expr, PandasDataframeContext) or not df.columns.is_unique:
+        return expr, False
+    columns = referenced_columns(expr)
+    if columns is None or not set(columns).issubset(available):
+        return expr, False
+    expr = _substitute_aggregates(expr, df)
+    return expr, isinstance(expr, PandasDataframeContext) and is_row_wise(expr)
+
+
+def parallel_eval(
+    df: pd.DataFrame,
+    expr: PandasDataframeContext,
+    workers: Optional[int]=None,
+    executor: Optional[Executor]=None,
+) -> Any:
+    """Evaluate a row-wise ``DF``-expression with multiple processes.
+
+    ``df`` is split into ``workers`` row ranges that are evaluated in
+    parallel. Aggregates in the expression (e.g. ``DF["x"].mean()``) are
+    evaluated once with the full data frame before.
+
+    Expressions that are not row-wise (see
+    :func:`~pandas_paddles.analysis.is_row_wise`) are evaluated in the
+    current process. So are expressions whose results for the row ranges
+    cannot be concatenated to the result for all rows, e.g. because they
+    differ in dtype.
+
+    Parameters
+    ----------
+    df
+        The data frame.
+    expr
+        The ``DF``-expression.
+    workers
+        Number of row ranges and worker processes. Defaults to the number
+        of CPUs, also with ``executor``.
+    executor
+        Process pool to use. If not given, a pool is started (and shut down)
+        for this call.
+
+    Returns
+    -------
+    result
+        The same as ``expr(df)``.
+
+    Examples
+    --------
+    ::
+
+        normalized_names = parallel_eval(
+            df,
+            DF["name"].str.normalize("NFKC").str.casefold().str.strip(),
+            workers=16,
+        )
+    """
+    prepared, parallel = _prepare(expr, df, df.columns)
+    if not parallel:
+        if isinstance(prepared, PandasDataframeContext):
+            return prepared._evaluate(df)
+        return prepared
+    result, = _evaluate_parallel(df, [prepared], workers, executor)
+    return result
+
+
+def parallel_assign(
+    df: pd.DataFrame,
+    workers: Optional[int]=None,
+    executor: Optional[Executor]=None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """Like :meth:`pandas.DataFrame.assign` but evaluate row-wise
+    ``DF``-expressions with multiple processes.
+
+    All row-wise expressions are evaluated in one pass over the row ranges
+    (see :func:`parallel_eval`). Other values and expressions are passed on
+    to :meth:`~pandas.DataFrame.assign`, e.g. expressions using columns that
+    are assigned in the same call.
+
+    Parameters
+    ----------
+    df
+        The data frame.
+    workers, executor
+        See :func:`parallel_eval`.
+    kwargs
+        The new columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same as ``df.assign(**kwargs)``.
+    """
+    available = set(df.columns)
+    parallel: Dict[str, PandasDataframeContext] = {}
+    for name, value in kwargs.items():
+        prepared, is_parallel = _prepare(value, df, available)
+        if is_parallel:
+            parallel[name] = prepared
+        # Later expressions must see the new column
+        available.discard(name)
+
+    if parallel:
+        results = _evaluate_parallel(df, list(parallel.values()), workers, executor)
+        kwargs = {**kwargs, **dict(zip(parallel, results))}
+    return df.assign(**kwargs)
@@ -1,26 +1,38 @@
 """Helpers for working with :meth:`pandas.DataFrame.pipe()`."""
+from contextvars import ContextVar
+import json
+import logging
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Union
+
 import pandas as pd
 
-try:
-    from .dask import DF
-except ImportError:
-    from .pandas import DF
+from .pandas import DF
+from .util import is_dask_collection
 
-def _generate_report(args, print_func, print_kwargs):
+def _generate_report(args, print_func, print_kwargs, persist_dask=False):
     def inner_report(df):
+        if persist_dask and is_dask_collection(df):
+            df = df.persist()
         to_print = []
         for a in args:
             if callable(a):
                 to_print.append(a(df))
             else:
                 to_print.append(a)
+        if is_dask_collection(df):
+            import dask
+            # Compute all (lazy) values in one pass
+            to_print = dask.compute(*to_print)
         print_func(*to_print, **print_kwargs)
         return df
     return inner_report
 
 
 
-def report(*args, print_func=print, **print_kwargs):
+def report(*args, print_func=print, persist_dask=False, **print_kwargs):
     r"""Print summary report for a data frame.
 
     This function is intended to be used in ``DataFrame.pipe()``. It can be
@@ -65,6 +77,15 @@ def report(*args, print_func=print, **print_kwargs):
         # Output:
         # The shape: (3, 2) and unique y-values: 2
 
+    With dask data frames, all arguments are computed together in one
+    ``dask.compute`` call. Use ``persist_dask=True`` to keep the data frame in
+    memory for the following operations (the persisted data frame is
+    returned)::
+
+        ddf.pipe(report("Label", DF["y"].nunique(), persist_dask=True))
+        # Output:
+        # Label 2
+
     Pass arguments to ``print()``::
 
         df.pipe(report("Label", sep="\n"))
@@ -80,11 +101,15 @@ def report(*args, print_func=print, **print_kwargs):
         Things to be printed. Can be either ``str`` or callables taking a
         data frame as single argument, e.g. created with ``DF``.
 
-        The first argument can be a ``~pandas.DataFrame``.
+        The first argument can be a ``~pandas.DataFrame`` or a dask data
+        frame.
     print_func : callable
         The function used to print the "report". Defaults to :func:`print`.
+    persist_dask : bool
+        Persist dask data frames before computing the report. Ignored for
+        pandas data frames.
     print_kwargs
-        All keyword arguments are passed through to ``print_func``.
+        All other keyword arguments are passed through to ``print_func``.
 
     Returns
     -------
@@ -100,7 +125,7 @@ def report(*args, print_func=print, **print_kwargs):
     """
     df = None
     args = list(args)
-    if args and isinstance(args[0], pd.DataFrame):
+    if args and (isinstance(args[0], pd.DataFrame) or is_dask_collection(args[0])):
         df = args.pop(0)
 
     if len(args) == 0:
@@ -108,7 +133,224 @@ def report(*args, print_func=print, **print_kwargs):
     elif len(args) == 1 and isinstance(args[0], str):
         args.append(DF.shape)
 
-    inner_report = _generate_report(args, print_func, print_kwargs)
+    inner_report = _generate_report(args, print_func, print_kwargs, persist_dask)
     if df is None:
         return inner_report
     return inner_report(df)
+
+
+# Stage instrumentation
+StageRecord = Dict[str, Any]
+
+logger = logging.getLogger(__name__)
+
+
+class LoggingSink:
+    """Log stage records with :mod:`logging`."""
+    def __init__(self, logger: logging.Logger=logger, level: int=logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, record: StageRecord):
+        self.logger.log(
+            self.level,
+            "stage %s: %s",
+            record["stage"],
+            ", ".join(f"{k}={v}" for k, v in record.items() if k != "stage"),
+        )
+
+
+class JsonLinesSink:
+    """Append stage records as JSON lines to a file."""
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = path
+
+    def __call__(self, record: StageRecord):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, default=str))
+            f.write("\n")
+
+
+class CollectorSink:
+    """Collect stage records in memory (see :attr:`records`)."""
+    def __init__(self):
+        self.records: List[StageRecord] = []
+
+    def __call__(self, record: StageRecord):
+        self.records.append(record)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the collected records as data frame."""
+        return pd.DataFrame.from_records(self.records)
+
+
+class StageTracker:
+    """Measure resources between stages of a chain of operations.
+
+    Use as context manager around a chain and mark stages with
+    :func:`stage`. Each stage reports the metrics since the previous stage
+    (or since entering the context):
+
+    - ``wall_time``, ``cpu_time``: Elapsed wall-clock and CPU time in
+      seconds.
+    - ``rows``, ``columns``: The shape of the data frame (``rows`` is
+      ``None`` for dask data frames).
+    - ``memory``, ``memory_delta``: Memory usage of the data frame in bytes
+      and the difference to the previous stage (pandas only).
+    - ``tracemalloc_peak``: Peak of memory allocated by Python since the
+      previous stage in bytes (only if ``trace_malloc=True``).
+
+    Examples
+    --------
+    ::
+
+        from pandas_paddles.pipe import CollectorSink, StageTracker, stage
+
+        collector = CollectorSink()
+        with StageTracker(collector, deep=True):
+            df_out = (df
+                      .pipe(stage("load"))
+                      .drop_duplicates()
+                      .pipe(stage("dedupe"))
+                     )
+        collector.to_frame()
+    """
+    def __init__(
+        self,
+        sink: Optional[Callable[[StageRecord], Any]]=None,
+        *,
+        deep: bool=False,
+        trace_malloc: bool=False,
+    ):
+        """
+        Parameters
+        ----------
+        sink
+            Callable that receives the record (a ``dict``) of each stage,
+            e.g. :class:`LoggingSink` (default), :class:`JsonLinesSink`, or
+            :class:`CollectorSink`.
+        deep
+            Passed to :meth:`pandas.DataFrame.memory_usage()`.
+        trace_malloc
+            Trace the peak memory allocation with :mod:`tracemalloc`.
+        """
+        self.sink = sink if sink is not None else LoggingSink()
+        self.deep = deep
+        self.trace_malloc = trace_malloc
+        self._started_tracemalloc = False
+        self._token = None
+        self._reset()
+
+    def _reset(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._memory: Optional[int] = None
+        # tracemalloc.reset_peak() is only available for Python >= 3.9
+        if self.trace_malloc and tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def __enter__(self) -> "StageTracker":
+        if self.trace_malloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._reset()
+        self._token = _current_tracker.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current_tracker.reset(self._token)
+        self._token = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def record(self, name: str, df: Any) -> StageRecord:
+        """Measure the metrics of stage ``name`` and pass them to the sink."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        record: StageRecord = {
+            "stage": name,
+            "wall_time": wall - self._wall,
+            "cpu_time": cpu - self._cpu,
+        }
+
+        record["columns"] = len(df.columns) if df.ndim == 2 else None
+        if is_dask_collection(df):
+            record["rows"] = None
+            memory = None
+        else:
+            record["rows"] = len(df.index)
+            memory = df.memory_usage(deep=self.deep)
+            memory = int(memory.sum()) if df.ndim == 2 else int(memory)
+        record["memory"] = memory
+        if memory is None or self._memory is None:
+            record["memory_delta"] = None
+        else:
+            record["memory_delta"] = memory - self._memory
+
+        if self.trace_malloc and tracemalloc.is_tracing():
+            record["tracemalloc_peak"] = tracemalloc.get_traced_memory()[1]
+        self.sink(record)
+
+        # Don't account the time for measuring and reporting to the next
+        # stage
+        self._reset()
+        self._memory = memory
+        return record
+
+
+_default_tracker = StageTracker()
+_current_tracker: ContextVar[StageTracker] = ContextVar("stage_tracker", default=_default_tracker)
+
+
+def stage(*args: Any) -> Any:
+    """Mark a stage in a chain of operations to measure its resources.
+
+    Like :func:`report`, this can be used with "call" semantics
+    (``df.pipe(stage("dedupe"))``) or "no-call" semantics
+    (``df.pipe(stage, "dedupe")``).
+
+    The metrics are measured by the :class:`StageTracker` of the enclosing
+    ``with`` block. Without it, the stages are logged with
+    :class:`LoggingSink` (measured since the previous stage anywhere).
+
+    Examples
+    --------
+    ::
+
+        with StageTracker(JsonLinesSink("stages.jsonl"), trace_malloc=True):
+            df_out = (df
+                      .pipe(stage("load"))
+                      .drop_duplicates()
+                      .pipe(stage("dedupe"))
+                      .assign(y=DF["x"] * 2)
+                      .pipe(stage("assign"))
+                     )
+
+    Parameters
+    ----------
+    args
+        The stage name, optionally preceded by the data frame.
+
+    Returns
+    -------
+    callable, pandas.DataFrame
+        If the first argument is a data frame, the stage is recorded and
+        the data frame is returned. Otherwise, a function is returned that
+        records the stage for the passed data frame and returns it.
+    """
+    args_list = list(args)
+    df = None
+    if args_list and (isinstance(args_list[0], (pd.DataFrame, pd.Series)) or is_dask_collection(args_list[0])):
+        df = args_list.pop(0)
+    if len(args_list) != 1:
+        raise TypeError("stage() takes the stage name as only argument")
+    name, = args_list
+
+    def inner_stage(df):
+        _current_tracker.get().record(name, df)
+        return df
+
+    if df is None:
+        return inner_stage
+    return inner_stage(df)
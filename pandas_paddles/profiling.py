@@ -0,0 +1,209 @@
+"""Profile the evaluation of ``DF``- and ``S``-expressions step by step.
+
+Use as::
+
+    from pandas_paddles.profiling import profile
+
+    prof = profile(DF["s"].str.extract(r"(\\d+)", expand=False).astype(float) > 3, df)
+    print(prof)
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .closures import ClosureBase, MethodClosure
+from .contexts import ClosureFactoryBase
+from . import operator_helpers
+from .util import is_dask_collection
+
+# A single evaluation step (see ``ExpressionProfile.records``)
+ProfileRecord = Dict[str, Any]
+
+
+def _step_name(closure: ClosureBase) -> str:
+    if isinstance(closure, MethodClosure):
+        op_type, op = operator_helpers.get_op_syntax(closure.name)
+        if op_type is not None:
+            return op
+        return f".{closure.name}()"
+    return str(closure)
+
+
+def _describe(obj: Any) -> Tuple[str, Optional[int], Optional[int]]:
+    """Get type name, length, and size in bytes of a step result.
+
+    Length and size are ``None`` if they are not available or would require
+    computing a lazy (dask) object.
+    """
+    type_name = type(obj).__name__
+    if is_dask_collection(obj):
+        return type_name, None, None
+
+    try:
+        length = len(obj)
+    except TypeError:
+        length = None
+
+    if isinstance(obj, pd.DataFrame):
+        nbytes = int(obj.memory_usage(index=False).sum())
+    else:
+        nbytes = getattr(obj, "nbytes", None)
+        if not isinstance(nbytes, int):
+            nbytes = None
+    return type_name, length, nbytes
+
+
+def _format_note(records: List[ProfileRecord]) -> str:
+    total = sum(r["time"] for r in records)
+    last = records[-1]
+    parts = [f"{total * 1000:.3f} ms", last["type"]]
+    if len(records) > 1:
+        parts[0] = f"{parts[0]} ({len(records)} calls)"
+    if last["length"] is not None:
+        parts.append(f"len={last['length']}")
+    if last["nbytes"] is not None:
+        parts.append(f"nbytes={last['nbytes']}")
+    return ", ".join(parts)
+
+
+class ExpressionProfile:
+    """Timings and results of all steps of an expression evaluation.
+
+    Printing the profile shows the expression tree with the time, result
+    type, length, and size of each step as comments.
+
+    Attributes
+    ----------
+    expr
+        The profiled expression.
+    result
+        The result of the expression.
+    records
+        One record per step in evaluation order. Method arguments are
+        evaluated (and recorded) before the method call. Records contain
+
+        - ``step``: the attribute, item, method, or operator.
+        - ``depth``: nesting level, i.e. ``1`` for an argument of the
+          expression, ``2`` for an argument of an argument, etc.
+        - ``time``: wall time in seconds. The time of a method call does not
+          include the time to evaluate its arguments.
+        - ``type``: type name of the result.
+        - ``length``: ``len()`` of the result or ``None``.
+        - ``nbytes``: size of the result in bytes (without index and not
+          following Python objects) or ``None``.
+    """
+    def __init__(self, expr: ClosureFactoryBase, result: Any, records: List[ProfileRecord], closures: Dict[int, List[ProfileRecord]]):
+        self.expr = expr
+        self.result = result
+        self.records = records
+        self._by_closure = closures
+
+    @property
+    def total_time(self) -> float:
+        """Sum of all step times in seconds."""
+        return sum(r["time"] for r in self.records)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the step records as data frame."""
+        return pd.DataFrame.from_records(self.records, columns=["step", "depth", "time", "type", "length", "nbytes"])
+
+    def _annotate(self, closure: ClosureBase) -> Optional[str]:
+        records = self._by_closure.get(id(closure))
+        if not records:
+            return None
+        return _format_note(records)
+
+    def __str__(self) -> str:
+        return str(self.expr.as_tree(self._annotate).pprint())
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {len(self.records)} steps, {self.total_time * 1000:.3f} ms>"
+
+
+class _Profiler:
+    def __init__(self):
+        self.records: List[ProfileRecord] = []
+        self.by_closure: Dict[int, List[ProfileRecord]] = {}
+
+    def evaluate(self, expr: ClosureFactoryBase, root_obj: Any, depth: int) -> Any:
+        obj = root_obj
+        for cl in expr._closures:
+            if isinstance(cl, MethodClosure):
+                args = [self.evaluate_arg(cl, a, root_obj, depth) for a in cl.args]
+                kwargs = {k: self.evaluate_arg(cl, a, root_obj, depth) for k, a in cl.kwargs.items()}
+                start = time.perf_counter()
+                obj = cl._apply(obj, args, kwargs)
+            else:
+                start = time.perf_counter()
+                obj = cl(obj, root_obj)
+            elapsed = time.perf_counter() - start
+            self.record(cl, depth, elapsed, obj)
+        return obj
+
+    def evaluate_arg(self, closure: MethodClosure, arg: Any, root_obj: Any, depth: int) -> Any:
+        # Same as MethodClosure._evaluate_method_arg()
+        if isinstance(arg, closure._factory_cls):
+            return self.evaluate(arg, root_obj, depth + 1)
+        return arg
+
+    def record(self, closure: ClosureBase, depth: int, elapsed: float, obj: Any):
+        type_name, length, nbytes = _describe(obj)
+        record: ProfileRecord = {
+            "step": _step_name(closure),
+            "depth": depth,
+            "time": elapsed,
+            "type": type_name,
+            "length": length,
+            "nbytes": nbytes,
+        }
+        self.records.append(record)
+        self.by_closure.setdefault(id(closure), []).append(record)
+
+
+def profile(expr: ClosureFactoryBase, obj: Any) -> ExpressionProfile:
+    """Evaluate ``expr`` with ``obj`` and time every step.
+
+    Every attribute access, item access, and method or operator call is
+    timed separately, including the steps of nested expressions in method
+    arguments, e.g. the ``DF["x"].mean()`` in
+    ``DF["x"].clip(upper=DF["x"].mean())``.
+
+    Steps are evaluated one by one. For dask data frames, only building the
+    task graph is timed and row-wise parts are not fused (see
+    :class:`~pandas_paddles.dask.DaskDataframeContext`).
+
+    Parameters
+    ----------
+    expr
+        The ``DF``- or ``S``-expression.
+    obj
+        The data frame or series to evaluate ``expr`` with.
+
+    Returns
+    -------
+    ExpressionProfile
+        The result and timings. Print it to see the annotated expression
+        tree.
+
+    Examples
+    --------
+    Find the expensive part of an expression::
+
+        >>> prof = profile(DF["s"].str.len().astype(float) > DF.x, df)
+        >>> print(prof)
+              DF['s']           # 4.227 ms, Series, len=1000, nbytes=8000
+                .str            # 0.078 ms, StringMethods
+                .len()          # 0.769 ms, Series, len=1000, nbytes=8000
+                .astype(        # 0.097 ms, Series, len=1000, nbytes=8000
+                  <class 'float'>,
+                )
+            >                   # 0.131 ms, Series, len=1000, nbytes=1000
+              DF.x              # 0.058 ms, Series, len=1000, nbytes=8000
+        >>> prof.result  # The evaluated expression
+    """
+    if not expr._accepts(obj):
+        raise TypeError(f"Cannot evaluate {type(expr).__name__} expression with {type(obj).__name__}")
+    profiler = _Profiler()
+    result = profiler.evaluate(expr, obj, 0)
+    return ExpressionProfile(expr, result, profiler.records, profiler.by_closure)
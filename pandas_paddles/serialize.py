@@ -0,0 +1,311 @@
+"""Compact, versioned serialization of ``DF``- and ``S``-expressions.
+
+Expressions are encoded as a tree of lists with one entry per closure:
+
+- ``["a", name]``: attribute access, e.g. ``DF.x``
+- ``["i", key]``: item access, e.g. ``DF["x"]``
+- ``["m", name, args, kwargs]``: method or operator call, e.g.
+  ``DF["x"].clip(upper=1)``
+
+Added in version 2:
+
+- ``["r", name, args]``: ``&`` or ``|`` of many operands (see
+  :class:`~pandas_paddles.closures.BooleanReduceClosure`)
+- ``["s", name, args, adaptive]``: ``&`` or ``|`` with short-circuit
+  evaluation (see :class:`~pandas_paddles.closures.ShortCircuitClosure`).
+  Gathered statistics are not stored.
+- ``["j", args, kwargs]``: joined strings of expressions (see
+  :class:`~pandas_paddles.closures.StrJoinClosure`)
+
+Use as::
+
+    from pandas_paddles import serialize
+
+    payload = serialize.to_json(DF["x"].clip(upper=DF["y"].max()) > 0)
+    expr = serialize.from_json(payload)
+
+The binary form (:func:`to_bytes`) also supports arguments that are not
+representable in JSON, e.g. arrays or compiled regular expressions. Like
+:mod:`pickle`, it must only be loaded from trusted sources.
+
+Pickling an expression uses the same encoding (see
+``ClosureFactoryBase.__reduce__()``).
+"""
+import builtins
+import importlib
+import json
+import pickle
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .closures import (
+    AttributeClosure,
+    BooleanReduceClosure,
+    ClosureBase,
+    ItemClosure,
+    MethodClosure,
+    PredicateStats,
+    ShortCircuitClosure,
+    StrJoinClosure,
+)
+from .contexts import ClosureFactoryBase
+
+FORMAT_VERSION = 2
+"""Version of the encoding. Increased for changes that older versions
+cannot decode, e.g. new closure kinds. Payloads of older versions can be
+decoded."""
+
+_MAGIC = b"PPX"
+
+# Context classes by key. Classes are imported when decoding, so that e.g.
+# dask is only imported for dask expressions.
+_CONTEXTS: Dict[str, Tuple[str, str]] = {
+    "DF": ("pandas_paddles.pandas", "PandasDataframeContext"),
+    "S": ("pandas_paddles.pandas", "PandasSeriesContext"),
+    "DF.dask": ("pandas_paddles.dask", "DaskDataframeContext"),
+}
+_CONTEXT_KEYS = {v: k for k, v in _CONTEXTS.items()}
+
+_BUILTIN_TYPES = frozenset(["bool", "bytes", "complex", "float", "int", "object", "str"])
+
+
+def _context_key(cls: type) -> str:
+    try:
+        return _CONTEXT_KEYS[cls.__module__, cls.__qualname__]
+    except KeyError:
+        raise TypeError(f"Cannot serialize expressions of type {cls.__name__}") from None
+
+
+def _context_cls(key: str) -> type:
+    try:
+        module, name = _CONTEXTS[key]
+    except KeyError:
+        raise ValueError(f"Unknown expression context {key!r}") from None
+    return getattr(importlib.import_module(module), name)
+
+
+def _dtype_roundtrips(dtype: Any) -> bool:
+    # E.g. not for categorical dtypes with categories
+    try:
+        return pd.api.types.pandas_dtype(str(dtype)) == dtype
+    except TypeError:
+        return False
+
+
+def _encode_value(value: Any, strict: bool) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, ClosureFactoryBase):
+        return {"$expr": _encode_expr(value, strict)}
+    if isinstance(value, list):
+        return [_encode_value(v, strict) for v in value]
+    if isinstance(value, tuple):
+        return {"$tuple": [_encode_value(v, strict) for v in value]}
+    if isinstance(value, dict):
+        return {"$dict": [[_encode_value(k, strict), _encode_value(v, strict)] for k, v in value.items()]}
+    if isinstance(value, slice):
+        return {"$slice": [_encode_value(v, strict) for v in (value.start, value.stop, value.step)]}
+    if value is Ellipsis:
+        return {"$ellipsis": None}
+    if isinstance(value, type) and value.__module__ == "builtins" and value.__name__ in _BUILTIN_TYPES:
+        return {"$type": value.__name__}
+    if isinstance(value, (np.dtype, pd.api.extensions.ExtensionDtype)) and _dtype_roundtrips(value):
+        return {"$dtype": str(value)}
+    if isinstance(value, np.generic):
+        return _encode_value(value.item(), strict)
+    if strict:
+        raise TypeError(
+            f"Cannot encode argument of type {type(value).__name__} as JSON. Use to_bytes() instead."
+        )
+    # Left for pickle
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+
+    (tag, content), = value.items()
+    if tag == "$expr":
+        return _decode_expr(content)
+    if tag == "$tuple":
+        return tuple(_decode_value(v) for v in content)
+    if tag == "$dict":
+        return {_decode_value(k): _decode_value(v) for k, v in content}
+    if tag == "$slice":
+        return slice(*(_decode_value(v) for v in content))
+    if tag == "$ellipsis":
+        return Ellipsis
+    if tag == "$type":
+        if content not in _BUILTIN_TYPES:
+            raise ValueError(f"Unsupported type {content!r}")
+        return getattr(builtins, content)
+    if tag == "$dtype":
+        return pd.api.types.pandas_dtype(content)
+    raise ValueError(f"Unknown tag {tag!r}")
+
+
+def _encode_closure(closure: ClosureBase, context: type, strict: bool) -> List[Any]:
+    if isinstance(closure, AttributeClosure):
+        return ["a", closure.name]
+    if isinstance(closure, ItemClosure):
+        return ["i", _encode_value(closure.name, strict)]
+    if isinstance(closure, ShortCircuitClosure):
+        encoded = [
+            "s",
+            closure.name,
+            [_encode_value(a, strict) for a in closure.args],
+            closure.stats is not None,
+        ]
+        if closure._factory_cls is not context:
+            encoded.append(_context_key(closure._factory_cls))
+        return encoded
+    if isinstance(closure, BooleanReduceClosure):
+        encoded = ["r", closure.name, [_encode_value(a, strict) for a in closure.args]]
+        if closure._factory_cls is not context:
+            encoded.append(_context_key(closure._factory_cls))
+        return encoded
+    if isinstance(closure, StrJoinClosure):
+        encoded = [
+            "j",
+            [_encode_value(a, strict) for a in closure.args],
+            {k: _encode_value(a, strict) for k, a in closure.kwargs.items()},
+        ]
+        if closure._factory_cls is not context:
+            encoded.append(_context_key(closure._factory_cls))
+        return encoded
+    if isinstance(closure, MethodClosure):
+        encoded = [
+            "m",
+            closure.name,
+            [_encode_value(a, strict) for a in closure.args],
+            {k: _encode_value(a, strict) for k, a in closure.kwargs.items()},
+        ]
+        # Only store the context of method arguments if it differs from the
+        # expression, e.g. in nested expressions of a dask evaluation.
+        if closure._factory_cls is not context:
+            encoded.append(_context_key(closure._factory_cls))
+        return encoded
+    raise TypeError(f"Cannot serialize closure of type {type(closure).__name__}")
+
+
+def _encode_expr(expr: ClosureFactoryBase, strict: bool) -> List[Any]:
+    context = type(expr)
+    return [
+        _context_key(context),
+        [_encode_closure(cl, context, strict) for cl in expr._closures],
+    ]
+
+
+def _decode_closure(encoded: List[Any], context: type) -> ClosureBase:
+    kind = encoded[0]
+    if kind == "a":
+        return AttributeClosure(encoded[1])
+    if kind == "i":
+        return ItemClosure(_decode_value(encoded[1]))
+    if kind == "m":
+        _, name, args, kwargs, *factory = encoded
+        factory_cls = _context_cls(factory[0]) if factory else context
+        return MethodClosure(
+            name,
+            factory_cls,
+            *[_decode_value(a) for a in args],
+            **{k: _decode_value(a) for k, a in kwargs.items()},
+        )
+    if kind == "r":
+        _, name, args, *factory = encoded
+        factory_cls = _context_cls(factory[0]) if factory else context
+        return BooleanReduceClosure(name, factory_cls, *[_decode_value(a) for a in args])
+    if kind == "s":
+        _, name, args, adaptive, *factory = encoded
+        factory_cls = _context_cls(factory[0]) if factory else context
+        return ShortCircuitClosure(
+            name,
+            factory_cls,
+            *[_decode_value(a) for a in args],
+            stats=PredicateStats(len(args)) if adaptive else None,
+        )
+    if kind == "j":
+        _, args, kwargs, *factory = encoded
+        factory_cls = _context_cls(factory[0]) if factory else context
+        return StrJoinClosure(
+            "str_join",
+            factory_cls,
+            *[_decode_value(a) for a in args],
+            **{k: _decode_value(a) for k, a in kwargs.items()},
+        )
+    raise ValueError(f"Unknown closure kind {kind!r}")
+
+
+def _decode_expr(encoded: List[Any]) -> ClosureFactoryBase:
+    key, closures = encoded
+    context = _context_cls(key)
+    return context([_decode_closure(cl, context) for cl in closures])
+
+
+def to_tree(expr: ClosureFactoryBase, strict: bool=True) -> List[Any]:
+    """Encode ``expr`` as tree of lists, dicts, and literal values.
+
+    Parameters
+    ----------
+    expr
+        The ``DF``- or ``S``-expression.
+    strict
+        Raise ``TypeError`` for method arguments that cannot be represented
+        in JSON. Otherwise they are kept as they are.
+
+    Returns
+    -------
+    list
+        ``[FORMAT_VERSION, context, closures]``
+    """
+    return [FORMAT_VERSION, *_encode_expr(expr, strict)]
+
+
+def from_tree(tree: List[Any]) -> ClosureFactoryBase:
+    """Decode an expression encoded with :func:`to_tree`."""
+    version, *encoded = tree
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported expression format version {version!r} (supported: <= {FORMAT_VERSION})"
+        )
+    return _decode_expr(encoded)
+
+
+def to_json(expr: ClosureFactoryBase) -> str:
+    """Encode ``expr`` as JSON string.
+
+    Raises
+    ------
+    TypeError
+        If a method argument cannot be represented in JSON.
+    """
+    return json.dumps(to_tree(expr), separators=(",", ":"))
+
+
+def from_json(payload: str) -> ClosureFactoryBase:
+    """Decode an expression encoded with :func:`to_json`."""
+    return from_tree(json.loads(payload))
+
+
+def to_bytes(expr: ClosureFactoryBase) -> bytes:
+    """Encode ``expr`` in binary form.
+
+    All method arguments that can be pickled are supported.
+    """
+    return _MAGIC + pickle.dumps(to_tree(expr, strict=False), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def from_bytes(payload: bytes) -> ClosureFactoryBase:
+    """Decode an expression encoded with :func:`to_bytes`.
+
+    .. warning::
+        Only load data from trusted sources (see :mod:`pickle`).
+    """
+    if not payload.startswith(_MAGIC):
+        raise ValueError("Not an encoded expression")
+    return from_tree(pickle.loads(payload[len(_MAGIC):]))
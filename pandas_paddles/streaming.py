@@ -0,0 +1,200 @@
+"""Apply ``DF``/``C``-based transformations to streams of data frames in
+``asyncio`` applications.
+
+Declare the transformation once and apply it to each batch of an
+asynchronous iterator, e.g. of batches read from a socket or queue::
+
+    from pandas_paddles import C, DF
+    from pandas_paddles.streaming import Pipeline
+
+    pipeline = (
+        Pipeline()
+        .filter(DF["status"] == "ok")
+        .assign(latency_ms=DF["latency"] * 1000)
+        .select(C["ts", "host", "latency_ms"])
+    )
+
+    async for batch in pipeline.stream(read_batches(), concurrency=4):
+        await publish(batch)
+
+The transformations run in an executor, so the event loop is not blocked.
+"""
+import asyncio
+from collections import deque
+import contextvars
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+import pickle
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+import pandas as pd
+
+# A single step: a function applied to each batch
+Step = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+# Module-level step functions: Pipelines can be pickled, e.g. for process
+# pools, if their arguments can.
+def _filter(predicate: Any, df: pd.DataFrame) -> pd.DataFrame:
+    return df.loc[predicate]
+
+
+def _select(columns: Any, df: pd.DataFrame) -> pd.DataFrame:
+    return df.loc[:, columns]
+
+
+def _assign(kwargs: Dict[str, Any], df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(**kwargs)
+
+
+def _pipe(func: Callable[..., pd.DataFrame], args: Tuple[Any, ...], kwargs: Dict[str, Any], df: pd.DataFrame) -> pd.DataFrame:
+    return df.pipe(func, *args, **kwargs)
+
+
+class Pipeline:
+    """Chain of filters, column selections, and assigns applied to data
+    frames.
+
+    Pipelines are immutable: every method returns a new pipeline with the
+    step appended. Apply a pipeline to a single data frame by calling it
+    (e.g. ``df.pipe(pipeline)``) or to a stream of data frames with
+    :meth:`stream`.
+    """
+    def __init__(self, steps: Tuple[Step, ...]=()):
+        self._steps = tuple(steps)
+
+    def _append(self, step: Step) -> "Pipeline":
+        return type(self)(self._steps + (step,))
+
+    def filter(self, predicate: Any) -> "Pipeline":
+        """Keep rows where ``predicate`` is true, i.e. ``df.loc[predicate]``.
+
+        ``predicate`` is typically a ``DF``-expression, e.g. ``DF["x"] > 0``.
+        """
+        return self._append(partial(_filter, predicate))
+
+    def select(self, columns: Any) -> "Pipeline":
+        """Select columns, i.e. ``df.loc[:, columns]``.
+
+        ``columns`` is typically a ``C``-selection, e.g.
+        ``C.dtype == float``.
+        """
+        return self._append(partial(_select, columns))
+
+    def assign(self, **kwargs: Any) -> "Pipeline":
+        """Add columns, i.e. ``df.assign(**kwargs)``."""
+        return self._append(partial(_assign, kwargs))
+
+    def pipe(self, func: Callable[..., pd.DataFrame], *args: Any, **kwargs: Any) -> "Pipeline":
+        """Apply any function, i.e. ``df.pipe(func, *args, **kwargs)``."""
+        return self._append(partial(_pipe, func, args, kwargs))
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Apply all steps to ``df``."""
+        for step in self._steps:
+            df = step(df)
+        return df
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {len(self)} steps>"
+
+    async def stream(
+        self,
+        batches: AsyncIterable[pd.DataFrame],
+        concurrency: int=1,
+        executor: Optional[Executor]=None,
+        ordered: bool=True,
+    ) -> AsyncIterator[pd.DataFrame]:
+        """Apply the pipeline to each batch of an asynchronous iterator.
+
+        Batches are transformed in ``executor`` without blocking the event
+        loop. At most ``concurrency`` batches are read from ``batches`` and
+        not yet consumed from the returned iterator, so a slow consumer
+        slows down reading (backpressure).
+
+        Context variables (e.g. of
+        :func:`~pandas_paddles.threads.use_threads`) are passed on to thread
+        pools.
+
+        With a :class:`~concurrent.futures.ProcessPoolExecutor`, the
+        pipeline and the batches are pickled. All arguments of the steps
+        must be picklable, e.g. module-level functions instead of lambdas
+        in :meth:`pipe` or :meth:`assign`. Context variables are not passed
+        on.
+
+        Parameters
+        ----------
+        batches
+            The data frames, e.g. an async generator.
+        concurrency
+            Maximal number of batches transformed at the same time.
+        executor
+            The executor to transform batches with. Defaults to the default
+            executor of the event loop (a thread pool).
+        ordered
+            Yield the transformed batches in the order of ``batches``.
+            Otherwise, yield batches as soon as they are transformed.
+
+        Yields
+        ------
+        pandas.DataFrame
+            The transformed batches.
+
+        Raises
+        ------
+        ValueError
+            If ``concurrency`` is less than 1.
+        TypeError
+            If ``executor`` is a process pool and the pipeline cannot be
+            pickled.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        in_process = isinstance(executor, ProcessPoolExecutor)
+        if in_process:
+            try:
+                pickle.dumps(self)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                raise TypeError(
+                    "Pipelines run in a process pool must be picklable: "
+                    f"use module-level functions instead of lambdas or local functions ({e})"
+                ) from e
+        loop = asyncio.get_running_loop()
+        source = batches.__aiter__()
+        pending: Deque["asyncio.Future[pd.DataFrame]"] = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        batch = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    if in_process:
+                        # Context objects cannot be pickled
+                        pending.append(loop.run_in_executor(executor, self, batch))
+                    else:
+                        context = contextvars.copy_context()
+                        pending.append(loop.run_in_executor(executor, context.run, self, batch))
+                if not pending:
+                    return
+
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    future = next(f for f in pending if f in done)
+                    pending.remove(future)
+                yield await future
+        finally:
+            # Batches already being transformed cannot be stopped, but their
+            # results are discarded.
+            for future in pending:
+                future.cancel()
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,379 @@
+"""Vectorized string operations with :mod:`pyarrow`.
+
+``pyarrow`` is optional: Without it (or for data it cannot represent),
+the functions fall back to the equivalent pandas operations.
+
+Chains of ``.str`` methods on Arrow-backed strings (e.g.
+``DF["s"].str.lower().str.strip().str.startswith("x")``) are evaluated
+with :mod:`pyarrow.compute` directly (see :func:`apply_arrow_chain`): the
+intermediate results stay Arrow arrays and only the result of the chain is
+wrapped in a series.
+"""
+from functools import lru_cache
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover
+    pa = None
+    pc = None
+
+from .closures import AttributeClosure, ClosureBase, MethodClosure
+
+# pandas >= 1.5
+_ArrowDtype = getattr(pd, "ArrowDtype", ())
+
+
+def is_arrow_string(dtype: Any) -> bool:
+    """Check if ``dtype`` stores strings in Arrow buffers, i.e.
+    ``string[pyarrow]`` or ``pd.ArrowDtype(pa.string())``."""
+    if pa is None:
+        return False
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage in ("pyarrow", "pyarrow_numpy")
+    if isinstance(dtype, _ArrowDtype):
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
+
+
+def _as_arrow_strings(values: pd.Series) -> Optional[Any]:
+    """Convert ``values`` to an Arrow string array with the same text as
+    ``values.astype(str)`` or ``None`` if not possible cheaply."""
+    dtype = values.dtype
+    if is_arrow_string(dtype):
+        # astype(str) gives "<NA>" for missing values
+        return pc.fill_null(pa.array(values.array).cast(pa.large_string()), str(pd.NA))
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        # Integers are formatted like str(), unlike floats or booleans
+        return pc.cast(pa.array(values.to_numpy()), pa.large_string())
+    try:
+        return pa.array(values.astype(str).to_numpy(), type=pa.large_string())
+    except (pa.ArrowException, TypeError):
+        return None
+
+
+def join(sep: str, values: Sequence[Any], dtype: Any=None) -> Any:
+    """Join the string representations of series element-wise.
+
+    The same as
+    ``values[0].astype(str) + sep + values[1].astype(str) + sep + ...``,
+    but with a single pass over the rows with
+    :func:`pyarrow.compute.binary_join_element_wise` if possible.
+
+    Parameters
+    ----------
+    sep
+        The separator.
+    values
+        The series to join, with the same index.
+    dtype
+        The dtype of the result, e.g. ``"string[pyarrow]"`` to keep the
+        result in Arrow buffers. Defaults to ``object``.
+
+    Returns
+    -------
+    pandas.Series
+        The joined strings.
+    """
+    first = values[0]
+    if (
+        pa is not None
+        and isinstance(first, pd.Series)
+        and all(isinstance(v, pd.Series) and v.index.equals(first.index) for v in values)
+    ):
+        arrays: List[Any] = []
+        for v in values:
+            array = _as_arrow_strings(v)
+            if array is None:
+                break
+            arrays.append(array)
+        else:
+            joined = pc.binary_join_element_wise(*arrays, pa.scalar(sep, pa.large_string()))
+            # Like the name of the result of ``+``
+            name = first.name if all(v.name == first.name for v in values) else None
+            return _from_arrow(joined, dtype, first.index, name)
+
+    result = first.astype(str)
+    for v in values[1:]:
+        result = result + sep + v.astype(str)
+    if dtype is not None:
+        result = result.astype(dtype)
+    return result
+
+
+def _from_arrow(array: Any, dtype: Any, index: pd.Index, name: Any) -> pd.Series:
+    if dtype is not None:
+        dtype = pd.api.types.pandas_dtype(dtype)
+        if hasattr(dtype, "__from_arrow__"):
+            # E.g. pd.ArrowDtype(pa.string())
+            pyarrow_dtype = getattr(dtype, "pyarrow_dtype", None)
+            if pyarrow_dtype is not None:
+                array = array.cast(pyarrow_dtype)
+            return pd.Series(dtype.__from_arrow__(array), index=index, name=name, copy=False)
+    result = pd.Series(array.to_numpy(zero_copy_only=False), index=index, name=name, copy=False)
+    if dtype is not None:
+        result = result.astype(dtype)
+    return result
+
+
+# Matches nothing, in Python and RE2 (used by pyarrow) syntax
+_NO_MATCH = r"[^\s\S]"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regular expression matching any of ``words`` from a prefix
+    tree, e.g. ``(?:ab(?:c|d)|x)`` for ``abc``, ``abd``, and ``x``.
+
+    Unlike a plain alternation, the regular expression engine does not try
+    every word at every position, but follows the common prefixes.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        alternatives = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ""
+        optional = "" in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        return f"(?:{'|'.join(alternatives)})" + ("?" if optional else "")
+
+    if "" in trie:
+        # The empty word matches everything
+        return ""
+    return build(trie)
+
+
+# Leading global inline flags, e.g. ``(?i)``
+_GLOBAL_FLAGS = re.compile(r"\(\?([a-zA-Z]+)\)")
+# Flags that can be scoped in Python and RE2 syntax
+_SCOPED_FLAGS = frozenset("ims")
+
+
+def _scoped(pattern: str) -> str:
+    """Wrap ``pattern`` in a group, turning leading global inline flags
+    into scoped flags, e.g. ``(?i)api`` into ``(?i:api)``."""
+    flags = ""
+    match = _GLOBAL_FLAGS.match(pattern)
+    if match is not None:
+        flags = match.group(1)
+        pattern = pattern[match.end():]
+        if not set(flags) <= _SCOPED_FLAGS:
+            raise ValueError(
+                f"Unsupported inline flags {match.group(0)!r}: only 'i', 'm', and 's' can be combined with other patterns"
+            )
+    if _GLOBAL_FLAGS.search(pattern):
+        raise ValueError(f"Global inline flags must be at the start of the pattern: {pattern!r}")
+    return f"(?{flags}:{pattern})"
+
+
+@lru_cache(maxsize=128)
+def match_any_pattern(kind: str, patterns: Tuple[str, ...]) -> str:
+    """Get one regular expression matching any of ``patterns``.
+
+    The result is cached per pattern set, compiled regular expressions are
+    cached by :mod:`re` (and pandas).
+
+    Parameters
+    ----------
+    kind
+        ``"prefix"``, ``"suffix"``, ``"substring"``, or ``"regex"``. For the
+        first three, ``patterns`` are literal strings combined in a prefix
+        tree.
+    patterns
+        The sorted, unique patterns.
+
+    Returns
+    -------
+    str
+        The regular expression for ``Series.str.match()`` (``"prefix"``),
+        ``Series.str.fullmatch()`` (``"suffix"``), or
+        ``Series.str.contains()``. The syntax works for Python and RE2 (used
+        by :mod:`pyarrow` for Arrow-backed strings).
+
+    Raises
+    ------
+    ValueError
+        If ``kind`` is not supported or a regular expression has global
+        inline flags other than ``i``, ``m``, and ``s`` (which are turned
+        into scoped flags, e.g. ``(?i)api`` into ``(?i:api)``).
+    """
+    if not patterns:
+        return _NO_MATCH
+    if kind == "regex":
+        return "|".join(_scoped(p) for p in patterns)
+    if kind not in ("prefix", "suffix", "substring"):
+        raise ValueError(f"Unsupported kind {kind!r}, use one of 'prefix', 'suffix', 'substring', 'regex'")
+    pattern = _trie_pattern(patterns)
+    if kind == "suffix":
+        # Scoped flag: Any prefix including newlines
+        return f"(?s:.*){pattern}"
+    return pattern
+
+
+# Arrow implementations of ``Series.str`` methods with the same signature.
+# Only methods that pandas itself evaluates with the same compute functions
+# for Arrow-backed strings are included, so the results are identical.
+# Unsupported arguments return ``None``.
+def _strip(kind: str) -> Callable[..., Any]:
+    def strip(array, to_strip=None):
+        if to_strip is None:
+            return getattr(pc, f"utf8_{kind}_whitespace")(array)
+        return getattr(pc, f"utf8_{kind}")(array, characters=to_strip)
+    return strip
+
+
+def _is(kind: str) -> Callable[..., Any]:
+    return lambda array: getattr(pc, f"utf8_is_{kind}")(array)
+
+
+def _starts_or_ends(func_name: str) -> Callable[..., Any]:
+    def starts_or_ends(array, pat, na=None):
+        if not isinstance(pat, str) or na is not None:
+            return None
+        return getattr(pc, func_name)(array, pattern=pat)
+    return starts_or_ends
+
+
+def _contains(array, pat, case=True, flags=0, na=None, regex=True):
+    if not isinstance(pat, str) or flags or na is not None:
+        return None
+    func = pc.match_substring_regex if regex else pc.match_substring
+    return func(array, pat, ignore_case=not case)
+
+
+def _match(array, pat, case=True, flags=0, na=None):
+    if isinstance(pat, str) and not pat.startswith("^"):
+        pat = f"^{pat}"
+    return _contains(array, pat, case, flags, na, regex=True)
+
+
+def _fullmatch(array, pat, case=True, flags=0, na=None):
+    if isinstance(pat, str) and (not pat.endswith("$") or pat.endswith("\\$")):
+        pat = f"{pat}$"
+    return _match(array, pat, case, flags, na)
+
+
+def _replace(array, pat, repl, n=-1, case=None, flags=0, regex=False):
+    if not (isinstance(pat, str) and isinstance(repl, str)) or case is False or flags:
+        return None
+    func = pc.replace_substring_regex if regex else pc.replace_substring
+    return func(array, pattern=pat, replacement=repl, max_replacements=n)
+
+
+def _slice(array, start=None, stop=None, step=None):
+    if stop is None:
+        return None
+    return pc.utf8_slice_codeunits(array, start=start or 0, stop=stop, step=1 if step is None else step)
+
+
+def _count(array, pat, flags=0):
+    if not isinstance(pat, str) or flags:
+        return None
+    return pc.count_substring_regex(array, pat)
+
+
+_ARROW_STR_METHODS: Dict[str, Callable[..., Any]] = {
+    "contains": _contains,
+    "count": _count,
+    "endswith": _starts_or_ends("ends_with"),
+    "fullmatch": _fullmatch,
+    "len": lambda array: pc.utf8_length(array),
+    "lower": lambda array: pc.utf8_lower(array),
+    "lstrip": _strip("ltrim"),
+    "match": _match,
+    "replace": _replace,
+    "rstrip": _strip("rtrim"),
+    "slice": _slice,
+    "startswith": _starts_or_ends("starts_with"),
+    "strip": _strip("trim"),
+    "upper": lambda array: pc.utf8_upper(array),
+    **{f"is{kind}": _is(kind) for kind in (
+        "alnum", "alpha", "decimal", "digit", "lower", "numeric", "space", "title", "upper",
+    )},
+}
+
+
+def _is_string_array(array: Any) -> bool:
+    return pa.types.is_string(array.type) or pa.types.is_large_string(array.type)
+
+
+def _wrap(array: Any, like: pd.Series) -> pd.Series:
+    """Wrap the Arrow result of a chain like pandas wraps the results of
+    ``like.str`` methods."""
+    if isinstance(like.dtype, _ArrowDtype):
+        values = pd.arrays.ArrowExtensionArray(array)
+    elif _is_string_array(array):
+        values = type(like.array)(array)
+    elif pa.types.is_boolean(array.type):
+        values = pd.BooleanDtype().__from_arrow__(array)
+    else:
+        values = pd.Int64Dtype().__from_arrow__(array.cast(pa.int64()))
+    return pd.Series(values, index=like.index, name=like.name, copy=False)
+
+
+def apply_arrow_chain(obj: Any, closures: Sequence[ClosureBase]) -> Tuple[Any, int]:
+    """Apply the leading ``.str`` method calls of ``closures`` to ``obj``
+    with :mod:`pyarrow.compute`.
+
+    Parameters
+    ----------
+    obj
+        The object the closures are applied to.
+    closures
+        The remaining closures of an expression, starting with the
+        ``.str`` accessor.
+
+    Returns
+    -------
+    result
+        The result of the chain or ``obj``.
+    int
+        The number of applied closures. ``0`` if ``obj`` is not a series of
+        Arrow-backed strings or the first method is not supported.
+    """
+    if not (isinstance(obj, pd.Series) and is_arrow_string(obj.dtype)):
+        return obj, 0
+    if getattr(obj.dtype, "storage", None) == "pyarrow_numpy":
+        # Results are numpy arrays with NaN
+        return obj, 0
+
+    array = None
+    n = 0
+    while n + 1 < len(closures):
+        accessor, method = closures[n], closures[n + 1]
+        if not (
+            isinstance(accessor, AttributeClosure)
+            and accessor.name == "str"
+            and isinstance(method, MethodClosure)
+            and method.name in _ARROW_STR_METHODS
+            and not any(isinstance(a, method._factory_cls) for a in method.args + tuple(method.kwargs.values()))
+        ):
+            break
+        if array is None:
+            array = pa.array(obj.array)
+        elif not _is_string_array(array):
+            break
+        try:
+            result = _ARROW_STR_METHODS[method.name](array, *method.args, **method.kwargs)
+        except (TypeError, pa.ArrowException):
+            # Let pandas raise the error
+            result = None
+        if result is None:
+            break
+        array = result
+        n += 2
+
+    if n == 0:
+        return obj, 0
+    return _wrap(array, obj), n
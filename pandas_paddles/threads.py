@@ -0,0 +1,200 @@
+"""Evaluate independent parts of expressions concurrently with threads.
+
+Most numpy and pandas operations release the GIL, so the independent
+branches of an expression can use several cores, e.g. the operands of ``&``
+in a filter built with :func:`~pandas_paddles.paddles.combine`. Evaluation
+with threads is opt-in::
+
+    from pandas_paddles import threads
+
+    with threads.use_threads(max_workers=4):
+        df.loc[(DF.x.abs() > 1) & DF.s.str.contains("a") & DF.t.dt.month.isin([1, 2])]
+        df = threads.assign(df, a=DF.x.rank(), b=DF.y.rolling(5).mean())
+
+The results are the same as without threads.
+"""
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import chain
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from .closures import MethodClosure
+
+# Set while evaluating with threads. ``None`` in the worker threads, so
+# that only the calling thread submits work and a bounded pool cannot
+# deadlock on nested expressions.
+_executor: ContextVar[Optional[Executor]] = ContextVar("pandas_paddles_executor", default=None)
+
+
+@contextmanager
+def use_threads(max_workers: Optional[int]=None, executor: Optional[Executor]=None) -> Iterator[Executor]:
+    """Evaluate independent sub-expressions with a thread pool within the
+    ``with`` block.
+
+    Arguments of method and operator calls that are expressions themselves
+    (e.g. ``DF["y"].clip(0)`` in ``DF["x"] > DF["y"].clip(0)``) are
+    evaluated in the pool while the calling thread evaluates the rest of
+    the expression. Plain column accesses like ``DF["y"]`` are evaluated
+    directly.
+
+    Only applies to the current thread (and ``asyncio`` task).
+
+    Parameters
+    ----------
+    max_workers
+        Size of the thread pool. Defaults to the number of CPUs.
+    executor
+        Use this executor instead of starting a new thread pool. It is not
+        shut down at the end of the block.
+
+    Yields
+    ------
+    concurrent.futures.Executor
+        The used executor.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers or os.cpu_count() or 1, thread_name_prefix="pandas_paddles")
+    token = _executor.set(executor)
+    try:
+        yield executor
+    finally:
+        _executor.reset(token)
+        if own_executor:
+            executor.shutdown()
+
+
+def _evaluate_in_worker(expr: Any, root_obj: Any) -> Any:
+    token = _executor.set(None)
+    try:
+        return expr._evaluate(root_obj)
+    finally:
+        _executor.reset(token)
+
+
+def _worth_submitting(arg: Any, factory_cls: type) -> bool:
+    """Only expressions with method or operator calls are worth the
+    overhead of a thread."""
+    return isinstance(arg, factory_cls) and any(isinstance(cl, MethodClosure) for cl in arg._closures)
+
+
+def evaluate_threaded(expr: Any, root_obj: Any, executor: Executor) -> Any:
+    """Evaluate ``expr`` with ``root_obj`` and the argument sub-trees in
+    ``executor``.
+
+    All argument sub-trees are submitted first. The calling thread then
+    applies the closures in order and waits for the arguments when needed,
+    so errors are raised in the same order as without threads.
+    """
+    futures: Dict[int, Future] = {}
+    if isinstance(root_obj, (pd.DataFrame, pd.Series)):
+        for cl in expr._closures:
+            if not isinstance(cl, MethodClosure) or cl._lazy_args:
+                continue
+            for arg in chain(cl.args, cl.kwargs.values()):
+                if id(arg) not in futures and _worth_submitting(arg, cl._factory_cls):
+                    futures[id(arg)] = executor.submit(_evaluate_in_worker, arg, root_obj)
+
+    def evaluate_arg(cl: MethodClosure, arg: Any) -> Any:
+        future = futures.get(id(arg))
+        if future is not None:
+            return future.result()
+        return cl._evaluate_method_arg(arg, root_obj)
+
+    obj = root_obj
+    try:
+        for cl in expr._closures:
+            if futures and isinstance(cl, MethodClosure) and not cl._lazy_args:
+                obj = cl._apply(
+                    obj,
+                    [evaluate_arg(cl, a) for a in cl.args],
+                    {k: evaluate_arg(cl, a) for k, a in cl.kwargs.items()},
+                )
+            else:
+                obj = cl(obj, root_obj)
+    except BaseException:
+        for future in futures.values():
+            future.cancel()
+        raise
+    return obj
+
+
+def evaluate_all(obj: Any, exprs: Iterable[Any]) -> List[Any]:
+    """Evaluate several independent expressions with ``obj``.
+
+    Within :func:`use_threads`, the expressions are evaluated concurrently.
+    Otherwise, one after another.
+
+    Parameters
+    ----------
+    obj
+        The data frame or series.
+    exprs
+        The ``DF``- or ``S``-expressions.
+
+    Returns
+    -------
+    list
+        The results in the order of ``exprs``.
+    """
+    exprs = list(exprs)
+    executor = _executor.get()
+    if executor is None or len(exprs) < 2:
+        return [expr._evaluate(obj) for expr in exprs]
+
+    futures = [executor.submit(_evaluate_in_worker, expr, obj) for expr in exprs[1:]]
+    try:
+        first = exprs[0]._evaluate(obj)
+        return [first] + [f.result() for f in futures]
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def assign(df: pd.DataFrame, **kwargs: Any) -> pd.DataFrame:
+    """Like :meth:`pandas.DataFrame.assign` but evaluate independent
+    ``DF``-expressions concurrently within :func:`use_threads`.
+
+    ``DF``-expressions that only use columns of ``df`` (and not columns
+    assigned before in the same call) are evaluated with
+    :func:`evaluate_all`. Other values, callables, and expressions are
+    passed on to :meth:`~pandas.DataFrame.assign`.
+
+    Parameters
+    ----------
+    df
+        The data frame.
+    kwargs
+        The new columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same as ``df.assign(**kwargs)``.
+    """
+    # Avoid circular import
+    from .analysis import referenced_columns
+    from .pandas import PandasDataframeContext
+
+    if _executor.get() is None:
+        return df.assign(**kwargs)
+
+    available = set(df.columns) if df.columns.is_unique else set()
+    independent: Dict[str, Any] = {}
+    for name, value in kwargs.items():
+        if isinstance(value, PandasDataframeContext):
+            columns = referenced_columns(value)
+            if columns is not None and set(columns).issubset(available):
+                independent[name] = value
+        # Later expressions must see the new column
+        available.discard(name)
+
+    if len(independent) > 1:
+        results = evaluate_all(df, independent.values())
+        kwargs = {**kwargs, **dict(zip(independent, results))}
+    return df.assign(**kwargs)
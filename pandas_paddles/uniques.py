@@ -0,0 +1,154 @@
+"""Evaluate row-wise operations on the unique values of low-cardinality
+columns.
+
+Columns like country codes or states often have few distinct values in
+many rows. For an expression like
+``DF["country"].str.upper().str.replace("_", "-") == "DE"``, the string
+operations are evaluated once per distinct value of ``country`` and the
+results are gathered for all rows with ``take``.
+
+This is opt-in: Set :data:`min_rows` (e.g. to ``10_000``) to let
+``DF``-expressions do it (see :func:`evaluate_on_uniques`) for object and
+string columns with at least :data:`min_rows` rows if a sample of the
+column has few distinct values::
+
+    from pandas_paddles import uniques
+
+    uniques.min_rows = 10_000
+
+.. note::
+    Callables passed to ``map`` or ``apply`` are then called once per
+    distinct value instead of once per row. Don't enable it for callables
+    with side effects or that depend on the order of the calls.
+"""
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .closures import AttributeClosure, MethodClosure
+from .strings import is_arrow_string
+
+min_rows: Optional[int] = None
+"""Only columns with at least this many rows are considered. ``None``
+(the default) disables the evaluation on the unique values."""
+
+sample_size = 10_000
+"""Number of evenly spaced values sampled to estimate the cardinality."""
+
+max_unique_fraction = 0.2
+"""Maximal fraction of distinct values in the sample (and in the column)."""
+
+# Operations worth evaluating on the unique values: Python-level work per
+# row. Cheap vectorized operations (e.g. ``== "DE"``) are not faster on the
+# unique values than the factorization of the column.
+_EXPENSIVE_METHODS = frozenset(["map", "apply", "astype"])
+
+
+def _is_candidate_dtype(dtype: Any) -> bool:
+    return dtype == object or isinstance(dtype, pd.StringDtype) or is_arrow_string(dtype)
+
+
+def unique_prefix(expr: Any) -> int:
+    """Get the number of leading closures of ``expr`` that can be evaluated
+    on the unique values of a column.
+
+    These select a column and apply row-wise operations (see
+    :func:`~pandas_paddles.analysis.row_wise_prefix`) with literal
+    arguments only. ``0`` if the prefix does not contain an operation worth
+    the factorization, i.e. a ``.str`` method or one of ``map``, ``apply``,
+    or ``astype``.
+    """
+    # Avoid circular import
+    from .analysis import _is_column_access, _is_literal_arg, _is_row_wise_closure
+
+    closures = expr._closures
+    if not closures or not _is_column_access(closures[0]):
+        return 0
+    n = 1
+    expensive = False
+    for previous, closure in zip(closures, closures[1:]):
+        if not _is_row_wise_closure(closure, previous):
+            break
+        if isinstance(closure, MethodClosure):
+            if not all(_is_literal_arg(a) for a in list(closure.args) + list(closure.kwargs.values())):
+                break
+            expensive = expensive or closure.name in _EXPENSIVE_METHODS or (
+                isinstance(previous, AttributeClosure) and previous.name == "str"
+            )
+        n += 1
+    # Don't stop at an accessor
+    while n > 1 and isinstance(closures[n - 1], AttributeClosure) and closures[n - 1].name in ("str", "dt"):
+        n -= 1
+    return n if expensive and n > 1 else 0
+
+
+def _has_low_cardinality(values: Any) -> bool:
+    step = max(len(values) // sample_size, 1)
+    sample = values[::step]
+    return len(pd.unique(sample)) <= max_unique_fraction * len(sample)
+
+
+def factorize(values: Any) -> Optional[Tuple[np.ndarray, Any]]:
+    """Get codes and unique values of ``values`` (including missing
+    values).
+
+    Returns ``None`` if the missing values are not all the same, e.g.
+    ``None`` and ``NaN``, because operations can treat them differently.
+    """
+    codes, uniques = pd.factorize(values)
+    missing = codes == -1
+    if missing.any():
+        missing_values = values[missing]
+        if len(pd.unique(missing_values)) != 1:
+            return None
+        codes[missing] = len(uniques)
+        if isinstance(uniques, np.ndarray):
+            uniques = np.concatenate([uniques, missing_values[:1]])
+        else:
+            uniques = type(uniques)._concat_same_type([uniques, missing_values[:1]])
+    return codes, uniques
+
+
+def evaluate_on_uniques(expr: Any, df: Any) -> Tuple[Any, int]:
+    """Evaluate the leading closures of ``expr`` on the unique values of a
+    low-cardinality column.
+
+    Parameters
+    ----------
+    expr
+        The ``DF``-expression.
+    df
+        The data frame.
+
+    Returns
+    -------
+    result
+        The result of the leading closures for all rows or ``df``.
+    int
+        The number of evaluated closures, ``0`` if the shortcut does not
+        apply.
+    """
+    if min_rows is None or not isinstance(df, pd.DataFrame) or len(df) < min_rows:
+        return df, 0
+    n = unique_prefix(expr)
+    if not n:
+        return df, 0
+    column = expr._closures[0](df, df)
+    if not (isinstance(column, pd.Series) and _is_candidate_dtype(column.dtype)):
+        return df, 0
+    values = column.array if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) else column.to_numpy()
+    if not _has_low_cardinality(values):
+        return df, 0
+    factorized = factorize(values)
+    if factorized is None:
+        return df, 0
+    codes, uniques = factorized
+    if len(uniques) > max_unique_fraction * len(codes):
+        return df, 0
+
+    # The arguments are literals, so the series can be the root object
+    obj = type(expr)(expr._closures[1:n])._evaluate(pd.Series(uniques, name=column.name))
+    if not (isinstance(obj, pd.Series) and len(obj) == len(uniques)):
+        return df, 0
+    return pd.Series(obj.array.take(codes), index=column.index, name=obj.name), n
@@ -1,11 +1,92 @@
 """Helper fucntions."""
 
-from typing import Optional, Union, Tuple
+import sys
+import weakref
+from typing import Any, Optional, Union, Tuple
+
+
+def is_dask_collection(obj: Any) -> bool:
+    """Check if ``obj`` is a dask data frame or series.
+
+    This does not import dask if it's not imported already.
+    """
+    if "dask.dataframe" not in sys.modules:
+        return False
+    import dask.dataframe as dd
+    return isinstance(obj, (dd.DataFrame, dd.Series))
+
+
+def is_dask_dataframe(obj: Any) -> bool:
+    """Check if ``obj`` is a dask data frame.
+
+    This does not import dask if it's not imported already.
+    """
+    if "dask.dataframe" not in sys.modules:
+        return False
+    import dask.dataframe as dd
+    return isinstance(obj, dd.DataFrame)
+
+
+def frame_state(df: Any) -> Tuple[Any, ...]:
+    """Get references to the objects holding the labels and data of
+    ``df``.
+
+    The state changes when columns are added, removed, or replaced (e.g.
+    ``df["x"] = ...``), but not when values are modified in place.
+    """
+    mgr = getattr(df, "_mgr", None)
+    if mgr is None:
+        # dask: Every modification creates a new graph with a new name
+        return (getattr(df, "_name", None),)
+    state = []
+    for obj in (df.columns, df.index, *mgr.arrays):
+        try:
+            state.append(weakref.ref(obj))
+        except TypeError:
+            state.append(obj)
+    return tuple(state)
+
+
+def is_same_state(old: Tuple[Any, ...], new: Tuple[Any, ...]) -> bool:
+    """Check if two results of :func:`frame_state` refer to the same
+    objects."""
+    if len(old) != len(new):
+        return False
+    for a, b in zip(old, new):
+        if isinstance(a, weakref.ref):
+            if not isinstance(b, weakref.ref) or a() is None or a() is not b():
+                return False
+        elif isinstance(a, str) or a is None:
+            if a != b:
+                return False
+        elif a is not b:
+            return False
+    return True
+
 
 class IndentedLines(list):
-    """Container for indented lines."""
+    """Container for indented lines.
+
+    Each line is an ``[indent, text]`` list, optionally followed by a note
+    that is printed as aligned comment after the text.
+    """
     def __str__(self):
-        return "\n".join(f"{indent * ' '}{text}" for indent, text in self)
+        width = max((indent + len(text) for indent, text, *_ in self), default=0)
+        out = []
+        for indent, text, *note in self:
+            line = f"{indent * ' '}{text}"
+            if note:
+                line = f"{line:<{width}}  # {note[0]}"
+            out.append(line)
+        return "\n".join(out)
+
+
+def _add_note(line: list, note: str):
+    """Add ``note`` to an ``IndentedLines`` line."""
+    if len(line) > 2:
+        line[2] = f"{line[2]}; {note}"
+    else:
+        line.append(note)
 
 
 class AstNode:
@@ -15,10 +96,15 @@ class AstNode:
 
     Some payloads are encoded as tuples:
     - 1-tuple: the "root" object
+    - 2-tuple: operator symbol and list of ``AstNode`` operands for an
+      operator applied to many operands, e.g. ``a & b & c``
     - 3-tuple: ordinary (=non-operator) method calls
       1. function name
       2. positional arguments as list of ``AstNode`` objects, e.g. repr of the argumment
       3. keyword arguments as list of keyword-name ``AstNode`` pairs.
+
+    An optional ``note`` is printed as comment after the node, e.g. timings
+    from :func:`~pandas_paddles.profiling.profile`.
     """
     def __init__(
         self,
@@ -26,11 +112,13 @@ class AstNode:
         parent:Optional["AstNode"]=None,
         left:Optional["AstNode"]=None,
         right:Optional["AstNode"]=None,
+        note:Optional[str]=None,
     ):
         self.payload = payload
         self.parent = parent
         self.left = left
         self.right = right
+        self.note = note
 
     @property
     def root(self) -> "AstNode":
@@ -49,6 +137,7 @@ class AstNode:
             lines.extend(self.left.pprint(indent + 2))
             inc_right = 2
 
+        own_line = len(lines)
         if isinstance(self.payload, str):
             lines.append([indent, self.payload])
         elif len(self.payload) == 1:
@@ -56,6 +145,14 @@ class AstNode:
             is_root_object_node = True
             lines.append([indent, root_name])
             inc_right = len(root_name)
+        elif len(self.payload) == 2:
+            op, operands = self.payload
+            for i, operand in enumerate(operands):
+                if i == 1:
+                    own_line = len(lines)
+                if i > 0:
+                    lines.append([indent, op])
+                lines.extend(operand.pprint(indent + 2))
         else:
             fname, args, kwargs = self.payload
             if not args and not kwargs:
@@ -68,7 +165,7 @@ class AstNode:
                 for kw, arg in kwargs:
                     kw_indent = indent + 2 + len(kw) + 1
                     kw_lines = arg.pprint(kw_indent)
-                    kw_lines[0] = [indent + 2, f"{kw}={kw_lines[0][1]}"]
+                    kw_lines[0] = [indent + 2, f"{kw}={kw_lines[0][1]}", *kw_lines[0][2:]]
                     kw_lines[-1][1] = f"{kw_lines[-1][1]},"
                     lines.extend(kw_lines)
                 lines.append([indent, ")"])
@@ -79,8 +176,12 @@ class AstNode:
         # Merge the root and 
         if is_root_object_node and len(lines) > 1:
             lines[0] = [lines[0][0],
-                        lines[0][1] + lines[1][1]
+                        lines[0][1] + lines[1][1],
+                        *lines[1][2:],
                        ]
             del lines[1]
 
+        if self.note is not None:
+            _add_note(lines[own_line], self.note)
+
         return lines
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles.pandas import DF
+
+dask = pytest.importorskip("dask")
+import dask.dataframe
+
+from pandas_paddles import dask as paddles_dask
+from pandas_paddles.dask import DF as DaskDF, DaskDataframeContext, compute_aggregates
+
+
+@pytest.fixture
+def pdf():
+    return pd.DataFrame({
+        "x": np.arange(20.0),
+        "y": np.arange(20) % 7,
+    })
+
+
+@pytest.fixture
+def ddf(pdf):
+    return dask.dataframe.from_pandas(pdf, npartitions=1)
+
+
+@pytest.fixture
+def compute_calls(monkeypatch):
+    calls = []
+    orig_compute = dask.compute
+    def counting_compute(*args, **kwargs):
+        calls.append(len(args))
+        return orig_compute(*args, **kwargs)
+    monkeypatch.setattr(paddles_dask.dask, "compute", counting_compute)
+    return calls
+
+
+def test_compute_aggregates_single_pass(pdf, ddf, compute_calls):
+    exprs = [
+        DaskDF["x"].clip(upper=DaskDF["x"].quantile(0.5)),
+        DaskDF.x > DaskDF.x.mean(),
+        DaskDF.y.max(),
+        DaskDF.x - DaskDF.x.mean(),
+    ]
+    clipped, above_mean, y_max, centered = compute_aggregates(ddf, *exprs)
+
+    # x.mean() is computed only once
+    assert compute_calls == [3]
+    assert y_max == 6
+
+    test = ddf.assign(clipped=clipped, above_mean=above_mean, centered=centered).compute()
+    expected = pdf.assign(
+        clipped=DF["x"].clip(upper=DF["x"].quantile(0.5)),
+        above_mean=DF.x > DF.x.mean(),
+        centered=DF.x - DF.x.mean(),
+    )
+    pd.testing.assert_frame_equal(test, expected)
+
+
+def test_compute_aggregates_without_aggregates(ddf, compute_calls):
+    expr = DaskDF.x + 1
+    test, = compute_aggregates(ddf, expr)
+    assert test is expr
+    assert compute_calls == []
+
+
+def test_eager_aggregates(pdf, ddf, compute_calls, monkeypatch):
+    monkeypatch.setattr(DaskDataframeContext, "eager_aggregates", True)
+    test = ddf.loc[DaskDF.x > DaskDF.x.mean()]
+    assert compute_calls == [1]
+    pd.testing.assert_frame_equal(test.compute(), pdf.loc[DF.x > DF.x.mean()])
+
+    assert DaskDF.y.max()(ddf) == 6
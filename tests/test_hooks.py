@@ -0,0 +1,128 @@
+import json
+
+import pandas as pd
+import pytest
+
+from pandas_paddles import C, DF, I, S, hooks
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]})
+
+
+class RecordingHook(hooks.EvaluationHook):
+    def __init__(self):
+        self.calls = []
+
+    def before(self, event):
+        self.calls.append(("before", event.kind, event.end))
+
+    def after(self, event):
+        self.calls.append(("after", event.kind, event.name, event.duration >= 0, event.error))
+
+
+@pytest.fixture
+def register():
+    registered = []
+    def inner(hook, **kwargs):
+        hooks.register_hook(hook, **kwargs)
+        registered.append(hook)
+        return hook
+    yield inner
+    for hook in registered:
+        hooks.unregister_hook(hook)
+    assert hooks._registry == ()
+
+
+def test_hooks_called(df, register):
+    hook = register(RecordingHook())
+    df2 = (df
+           .assign(z=DF.x.clip(upper=DF.x.mean()))
+           .loc[I[1:], C.dtype == int]
+          )
+    pd.testing.assert_frame_equal(df2, pd.DataFrame({"x": [2, 3], "z": [2, 2]}, index=[1, 2]))
+    assert df["x"].pipe(S.abs().sum()) == 6
+
+    assert hook.calls == [
+        ("before", "DF", None),
+        ("after", "DF", "DF.x .clip( upper=DF.x .mean(), )", True, None),
+        ("before", "I", None),
+        ("after", "I", "I[1:]", True, None),
+        ("before", "C", None),
+        ("after", "C", "C.dtype == int", True, None),
+        ("before", "S", None),
+        ("after", "S", "S.abs() .sum()", True, None),
+    ]
+
+
+def test_hook_sees_error(df, register):
+    hook = register(RecordingHook())
+    with pytest.raises(AttributeError):
+        DF.no_such_column(df)
+    assert isinstance(hook.calls[-1][-1], AttributeError)
+
+
+def test_failing_hook_does_not_break_evaluation(df, register, caplog):
+    class Broken(hooks.EvaluationHook):
+        def after(self, event):
+            raise RuntimeError("boom")
+
+    register(Broken())
+    pd.testing.assert_series_equal((DF.x * 2)(df), df.x * 2)
+    assert "Evaluation hook" in caplog.text
+
+
+def test_register_twice(register):
+    hook = register(RecordingHook())
+    register(hook, sample_rate=0.5)
+    assert hooks.registered_hooks() == [hook]
+    assert hooks._registry[0][1] == 0.5
+
+
+def test_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        hooks.register_hook(RecordingHook(), sample_rate=0)
+
+
+def test_sampling(df, register, monkeypatch):
+    hook = register(RecordingHook(), sample_rate=0.01)
+    values = iter([0.5, 0.001])
+    monkeypatch.setattr(hooks.random, "random", lambda: next(values))
+    DF.x(df)
+    assert hook.calls == []
+    DF.x(df)
+    assert len(hook.calls) == 2
+
+
+def test_open_metrics(df, register, tmp_path):
+    metrics = register(hooks.OpenMetricsHook(by_expression=True))
+    DF.x(df)
+    DF.x(df)
+    with pytest.raises(KeyError):
+        DF["missing"](df)
+
+    text = metrics.render()
+    assert text.endswith("# EOF\n")
+    assert 'pandas_paddles_evaluation_seconds_count{kind="DF",expr="DF.x"} 2' in text
+    assert 'pandas_paddles_evaluation_errors_total{kind="DF",expr="DF.x"} 0' in text
+    assert 'pandas_paddles_evaluation_errors_total{kind="DF",expr="DF[\'missing\']"} 1' in text
+
+    path = tmp_path / "metrics.prom"
+    metrics.write(path)
+    assert path.read_text() == text
+
+
+def test_chrome_trace(df, register, tmp_path):
+    trace = register(hooks.ChromeTraceHook(max_events=2))
+    for _ in range(3):
+        df.loc[:, C["x"]]
+
+    path = tmp_path / "trace.json"
+    trace.write(path)
+    data = json.loads(path.read_text())
+    assert len(data["traceEvents"]) == 2
+    event = data["traceEvents"][0]
+    assert event["ph"] == "X"
+    assert event["cat"] == "C"
+    assert event["dur"] >= 0
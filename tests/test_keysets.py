@@ -0,0 +1,246 @@
+from functools import reduce
+import operator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    import dask.dataframe
+    HAS_DASK = True
+except ImportError:
+    HAS_DASK = False
+
+from pandas_paddles import DF, S, paddles, serialize
+from pandas_paddles.keysets import LookupTable, RowKeys, ValueSet, table_index_cache
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "c": [1, 1, 2, 2, 3, np.nan],
+        "p": ["a", "b", "a", "b", "a", "a"],
+        "v": range(6),
+    }, index=list("uvwxyz"))
+
+
+def _expected(df, keys, columns):
+    preds = [
+        paddles.build_filter(dict(zip(columns, key)))
+        for key in keys
+    ]
+    return reduce(operator.or_, preds)(df)
+
+
+@pytest.mark.parametrize("keys", [
+    [(1, "b"), (2, "a"), (5, "a")],
+    [(3, "a")] * 3,
+    [(1.0, "a"), (2.0, "b")],
+])
+def test_isin_rows(df, keys):
+    expr = paddles.isin_rows(keys, columns=["c", "p"])
+    expected = _expected(df, keys, ["c", "p"])
+    pd.testing.assert_series_equal(expr(df), expected, check_names=False)
+    assert df.loc[expr].equals(df.loc[expected])
+
+
+def test_isin_rows_frame_keys(df):
+    keys = pd.DataFrame({"p": ["a", "b"], "c": [2, 1], "other": [0, 0]})
+    assert df.loc[paddles.isin_rows(keys, ["c", "p"])].index.tolist() == ["v", "w"]
+    assert df.loc[paddles.isin_rows(keys[["p", "c"]])].index.tolist() == ["v", "w"]
+    named = pd.MultiIndex.from_frame(keys[["c", "p"]])
+    assert df.loc[paddles.isin_rows(named)].index.tolist() == ["v", "w"]
+
+
+def test_isin_rows_single_column(df):
+    assert df.loc[paddles.isin_rows(["b"], ["p"])].index.tolist() == ["v", "x"]
+    assert df.loc[paddles.isin_rows([("b",)], ["p"])].index.tolist() == ["v", "x"]
+    # Missing values match like Series.isin()
+    expr = paddles.isin_rows([3, np.nan], ["c"])
+    pd.testing.assert_series_equal(expr(df), df["c"].isin([3, np.nan]), check_names=False)
+
+
+def test_isin_rows_missing_values(df):
+    assert df.loc[paddles.isin_rows([(np.nan, "a")], ["c", "p"])].index.tolist() == ["z"]
+
+
+def test_isin_rows_empty(df):
+    assert paddles.isin_rows([], ["c", "p"])(df).sum() == 0
+
+
+def test_isin_rows_combines(df):
+    expr = paddles.isin_rows([(1, "a"), (2, "a")], ["c", "p"]) & (DF["v"] > 0)
+    assert df.loc[expr].index.tolist() == ["w"]
+
+
+def test_row_keys_reuses_hash_table(df):
+    keys = RowKeys([(1, "a"), (2, "b")], ["c", "p"])
+    assert len(keys) == 2
+    assert repr(keys) == "<RowKeys ['c', 'p']: 2 keys>"
+    keys(df)
+    index = keys.index
+    keys(df.iloc[::-1])
+    assert keys.index is index
+    assert index._engine is index._engine
+
+
+def test_row_keys_fails():
+    with pytest.raises(ValueError, match="columns"):
+        RowKeys([(1, "a")])
+    with pytest.raises(ValueError, match="expected 3"):
+        RowKeys([(1, "a")], ["a", "b", "c"])
+    with pytest.raises(ValueError):
+        RowKeys([], [])
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_isin_rows_dask(df):
+    ddf = dask.dataframe.from_pandas(df, npartitions=3)
+    keys = [(1, "b"), (2, "a")]
+    result = ddf.loc[paddles.isin_rows(keys, ["c", "p"])].compute()
+    assert result.index.tolist() == ["v", "w"]
+
+
+@pytest.mark.parametrize("values, series", [
+    ([1, 3, 7], pd.Series([1, 2, 3, 1, 8])),
+    ([1.0, np.nan], pd.Series([1.0, np.nan, 2.0])),
+    ({"a", None}, pd.Series(["a", None, np.nan, "b", 1], dtype=object)),
+    (["1", 2], pd.Series([1, 2, 3])),
+    ([1, 2], pd.Series([1, None, 2], dtype="Int64")),
+    (["a"], pd.Series(["a", "b", None], dtype="category")),
+    (["a"], pd.Series(["a", "b", None], dtype="string[pyarrow]")),
+    (["2020-01-01"], pd.Series(pd.to_datetime(["2020-01-01", "2021-01-01"]))),
+    ([1], pd.Series([True, False])),
+    ([True], pd.Series([1, 0])),
+    ([1.0, 3.5], pd.Series([1, 2, 3])),
+])
+@pytest.mark.filterwarnings("ignore:The behavior of 'isin' with dtype=datetime64:FutureWarning")
+def test_value_set_like_isin(values, series):
+    value_set = ValueSet(values)
+    expected = series.isin(list(values))
+    pd.testing.assert_series_equal(value_set.isin(series), expected)
+    pd.testing.assert_series_equal(S.isin(value_set)(series), expected)
+    pd.testing.assert_series_equal(value_set.excludes(S)(series), ~expected)
+    pd.testing.assert_series_equal(series.isin(value_set), expected)
+
+
+def test_value_set_reuses_hash_table(df):
+    value_set = ValueSet(np.arange(100))
+    assert len(value_set) == 100
+    assert 5 in value_set and 100 not in value_set
+    assert repr(value_set) == "<ValueSet: 100 values>"
+    expr = value_set.contains(DF["v"])
+    assert df.loc[expr].equals(df)
+    index = value_set.index
+    assert df.loc[expr].equals(df)
+    assert value_set.index is index
+
+
+def test_value_set_data_frame(df):
+    value_set = ValueSet([1, 2, "a"])
+    expected = df.isin([1, 2, "a"])
+    pd.testing.assert_frame_equal(DF.isin(value_set)(df), expected)
+    result = df.loc[DF[["c", "v"]].isin(value_set).any(axis=1)]
+    assert result.index.tolist() == ["u", "v", "w", "x"]
+
+
+def test_value_set_serializes(df):
+    expr = ~DF["v"].isin(ValueSet([1, 2]))
+    with pytest.raises(TypeError):
+        serialize.to_json(expr)
+    restored = serialize.from_bytes(serialize.to_bytes(expr))
+    pd.testing.assert_series_equal(restored(df), expr(df))
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_value_set_dask(df):
+    ddf = dask.dataframe.from_pandas(df, npartitions=3)
+    expr = DF["v"].isin(ValueSet([1, 4]))
+    assert ddf.loc[expr].compute().index.tolist() == ["v", "y"]
+
+
+@pytest.fixture
+def prices():
+    return pd.DataFrame({
+        "product": ["a", "b", "a", "c"],
+        "region": ["x", "x", "y", "y"],
+        "price": [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+def test_lookup_like_map(df, prices):
+    table = prices.drop_duplicates("product").set_index("product")
+    result = df.assign(price=paddles.lookup("p", table, "price"))
+    pd.testing.assert_series_equal(result["price"], df["p"].map(table["price"]), check_names=False)
+    assert result["price"].tolist() == [1.0, 2.0, 1.0, 2.0, 1.0, 1.0]
+
+
+def test_lookup_composite_keys(df, prices):
+    df = df.assign(r=["x", "y", "y", "x", "x", "y"])
+    expr = paddles.lookup(["p", DF["r"]], prices, "price", on=["product", "region"])
+    expected = df.merge(prices, how="left", left_on=["p", "r"], right_on=["product", "region"])["price"]
+    result = expr(df)
+    assert result.name == "price"
+    assert result.index.equals(df.index)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+def test_lookup_default(df, prices):
+    table = prices.set_index(["product", "region"])
+    result = paddles.lookup(["p", "p"], table, "price", default=-1.0)(df)
+    assert result.tolist() == [-1.0] * 6
+    table = pd.DataFrame({"n": pd.array([10, 20], dtype="Int64")}, index=["a", "c"])
+    result = paddles.lookup("p", table, "n")(df)
+    assert result.dtype == "Int64"
+    assert result.isna().tolist() == [False, True, False, True, False, False]
+
+
+def test_lookup_caches_index(df, prices):
+    first = LookupTable(prices, "price", on=["product", "region"])
+    second = LookupTable(prices, "region", on=["product", "region"])
+    assert first.index is second.index
+    assert repr(first) == "<LookupTable 'price': 4 keys>"
+    index = first.index
+    first(df["p"], df["p"])
+    first(df["p"], df["p"])
+    assert first.index is index
+
+    prices.loc[0, "region"] = "z"
+    assert LookupTable(prices, "price", on=["product", "region"]).index is index
+    changed = LookupTable(prices, "price", on=["product", "region"], version=1)
+    assert changed.index is not index
+    assert ("a", "z") in changed.index
+
+    table_index_cache.clear()
+    assert LookupTable(prices, "price", on=["product", "region"]).index is not index
+
+
+def test_lookup_after_in_place_changes(prices):
+    table = prices.drop_duplicates("product").reset_index(drop=True)
+    keys = pd.DataFrame({"p": ["a", "b", "c"]})
+    expr = lambda: paddles.lookup("p", table, "price", on=["product"])
+    assert expr()(keys).tolist() == [1.0, 2.0, 4.0]
+    table.sort_values("price", ascending=False, inplace=True)
+    assert expr()(keys).tolist() == [1.0, 2.0, 4.0]
+    table.drop(index=0, inplace=True)
+    assert expr()(keys).isna().tolist() == [True, False, False]
+    table["product"] = table["product"].str.upper()
+    assert expr()(keys).isna().all()
+
+
+def test_lookup_fails(df, prices):
+    with pytest.raises(ValueError, match="not unique"):
+        paddles.lookup("p", prices, "price", on=["product"])
+    with pytest.raises(ValueError, match="2 key columns"):
+        paddles.lookup(["p", "c"], prices.drop_duplicates("product"), "price", on=["product"])
+    with pytest.raises(ValueError, match="No key"):
+        paddles.lookup([], prices, "price", on=["product"])
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_lookup_dask(df, prices):
+    df = df.assign(r=["x", "y", "y", "x", "x", "y"])
+    ddf = dask.dataframe.from_pandas(df, npartitions=3)
+    expr = paddles.lookup(["p", "r"], prices, "price", on=["product", "region"], default=0.0)
+    result = ddf.assign(price=expr).compute()["price"]
+    assert result.tolist() == expr(df).tolist() == [1.0, 0.0, 3.0, 2.0, 1.0, 3.0]
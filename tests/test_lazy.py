@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles import C, DF, I, S, paddles
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "a": np.arange(-3.0, 7.0),
+        "b": [1.0, None] * 5,
+        "c": list("abcdefghij"),
+        "d": range(10),
+    }, index=list("ABCDEFGHIJ"))
+
+
+def eager(df, steps):
+    for step in steps:
+        df = step(df)
+    return df
+
+
+CHAINS = {
+    "fused": (
+        lambda d: d.loc[DF.a > 0],
+        lambda d: d.loc[DF.b.notna()],
+        lambda d: d.assign(e=DF.a * 2),
+        lambda d: d.loc[:, C["a", "e"]],
+    ),
+    "pushdown": (
+        lambda d: d.assign(e=DF.d * 10, f="x"),
+        lambda d: d.loc[DF.a > 0],
+        lambda d: d[["e", "f", "c"]],
+    ),
+    "uses-assigned": (
+        lambda d: d.assign(e=DF.a - DF.a.mean()),
+        lambda d: d.loc[DF.e > 0],
+        lambda d: d.loc[DF.b.isna()],
+    ),
+    "aggregate-filter": (
+        lambda d: d.loc[DF.a > 0],
+        lambda d: d.loc[DF.d > DF.d.mean()],
+        lambda d: d.loc[:, C.startswith("a") | C["d"]],
+    ),
+    "aggregate-assign": (
+        lambda d: d.assign(e=DF.a - DF.a.mean()),
+        lambda d: d.loc[DF.d > 2],
+    ),
+    "callables": (
+        lambda d: d.loc[lambda x: x.d % 2 == 0],
+        lambda d: d.assign(e=lambda x: x.a + x.d),
+        lambda d: d.loc[DF.e > 0, ["e", "c"]],
+    ),
+    "labels": (
+        lambda d: d.loc["B":"H"],
+        lambda d: d.loc[DF.a != 0],
+        lambda d: d.loc[I["C":"G"]],
+    ),
+    "dtype-select": (
+        lambda d: d.assign(s=DF.c.str.upper()),
+        lambda d: d.loc[:, C.dtype == float],
+        lambda d: d.loc[DF.a > 1],
+    ),
+    "content-select": (
+        # The filter removes the missing values the selection depends on
+        lambda d: d.loc[:, C.where(S.isna().any()) | C["a"]],
+        lambda d: d.loc[DF.b.notna()],
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(CHAINS))
+def test_collect_matches_eager(df, name):
+    steps = CHAINS[name]
+    expected = eager(df, steps)
+    result = eager(paddles.lazy(df), steps).collect()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_does_not_modify_input(df):
+    orig = df.copy()
+    paddles.lazy(df).assign(a=0, z=1).collect()
+    paddles.lazy(df).loc[DF.a > 0].assign(a=0).collect()
+    pd.testing.assert_frame_equal(df, orig)
+
+
+def test_plan_fuses_and_pushes_down(df):
+    lz = (
+        paddles.lazy(df)
+        .assign(e=DF.d * 2)
+        .loc[DF.a > 0]
+        .loc[DF.b.notna()]
+        .loc[:, C["e"]]
+    )
+    kinds = [kind for kind, _ in lz.plan()]
+    assert kinds == ["filter", "assign", "select"]
+    assert len(lz.plan()[0][1]) == 2
+
+
+def test_no_pushdown_past_content_select(df):
+    lz = paddles.lazy(df).loc[:, C.where(S.isna().any())].loc[DF.b.notna()]
+    assert [kind for kind, _ in lz.plan()] == ["select", "filter"]
+    lz = paddles.lazy(df).loc[:, C["a", "b"]].loc[DF.b.notna()]
+    assert [kind for kind, _ in lz.plan()] == ["filter", "select"]
+
+
+def test_no_pushdown_past_dropped_columns(df):
+    steps = (
+        lambda d: d.loc[:, ["a"]],
+        lambda d: d.loc[DF.b > 5],
+    )
+    with pytest.raises(AttributeError):
+        eager(df, steps)
+    with pytest.raises(AttributeError):
+        eager(paddles.lazy(df), steps).collect()
+    lz = paddles.lazy(df).loc[:, C["a"]].loc[DF.b > 5]
+    assert [kind for kind, _ in lz.plan()] == ["select", "filter"]
+    lz = paddles.lazy(df).loc[:, ["a", "b"]].loc[DF.b > 5]
+    assert [kind for kind, _ in lz.plan()] == ["filter", "select"]
+
+
+def test_no_pushdown_past_aggregate(df):
+    lz = paddles.lazy(df).assign(e=DF.a - DF.a.mean()).loc[DF.a > 0]
+    assert [kind for kind, _ in lz.plan()] == ["assign", "filter"]
+
+
+def test_prunes_columns(df, monkeypatch):
+    from pandas_paddles import lazy as lazy_mod
+
+    taken = []
+    original = lazy_mod._apply_filters
+    def spy(frame, predicates, columns):
+        taken.append(columns)
+        return original(frame, predicates, columns)
+    monkeypatch.setattr(lazy_mod, "_apply_filters", spy)
+
+    paddles.lazy(df).loc[DF.c != "a"].assign(e=DF.a + 1).loc[:, C["e"]].collect()
+    assert taken == [["a"]]
+
+    taken.clear()
+    # Selection by dtype: cannot prune
+    paddles.lazy(df).loc[DF.c != "a"].loc[:, C.dtype == float].collect()
+    assert taken == [None]
+
+
+def test_getitem_rejects_predicates(df):
+    with pytest.raises(TypeError, match="loc"):
+        paddles.lazy(df)[DF.a > 0]
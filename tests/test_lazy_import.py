@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import pandas_paddles
+from pandas_paddles import DF
+from pandas_paddles.pandas import PandasDataframeContext
+
+
+def test_import_does_not_load_dask():
+    code = (
+        "import sys; import pandas_paddles; "
+        "from pandas_paddles import C, DF, I, S, paddles, report; "
+        "print('dask' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+    assert out.stderr == ""
+
+
+def test_DF_is_pandas_context():
+    assert type(DF) is PandasDataframeContext
+
+
+def test_class_doc():
+    assert PandasDataframeContext.__doc__.startswith("Build callable")
+    assert DF.__doc__ == PandasDataframeContext.__doc__
+    assert "__doc__" not in DF.x.__dict__
+
+
+def test_dask_submodule_attribute():
+    pytest.importorskip("dask.dataframe")
+    from pandas_paddles.dask import DaskDataframeContext
+    assert pandas_paddles.dask.DaskDataframeContext is DaskDataframeContext
+
+
+def test_dispatch_to_dask():
+    dd = pytest.importorskip("dask.dataframe")
+    df = pd.DataFrame({"x": range(6), "y": range(6, 12)})
+    ddf = dd.from_pandas(df, npartitions=2)
+
+    expr = (DF.x * 2 + DF.y).clip(upper=DF.y.mean())
+    result = expr(ddf)
+    assert isinstance(result, dd.Series)
+    # Fused into a single map_partitions call
+    assert "_evaluate_partition" in str(result.__dask_graph__().keys())
+    pd.testing.assert_series_equal(result.compute(), expr(df))
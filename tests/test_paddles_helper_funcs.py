@@ -1,11 +1,14 @@
+from functools import reduce
 import operator
+import re
 
+import numpy as np
 import pytest
 
 import pandas as pd
-from pandas_paddles import DF
+from pandas_paddles import DF, S
 
-from pandas_paddles.paddles import build_filter, str_join
+from pandas_paddles.paddles import build_filter, combine, str_join, str_match_any
 
 
 @pytest.fixture
@@ -29,8 +32,19 @@ def test_str_join(df, expr, expected):
     assert test.to_list() == expected
 
 
+def test_str_join_single_step(df):
+    expr = str_join("-", "x", "y", DF["y"] * 2)
+    assert len(expr._closures) == 1
+    assert expr(df).dtype == object
+    assert expr(df).to_list() == ["a-0-0", "b-1-2", "b-2-4"]
+
+    arrow = str_join("-", "x", "y", dtype="string[pyarrow]")(df)
+    assert arrow.dtype == pd.StringDtype("pyarrow")
+    assert arrow.to_list() == ["a-0", "b-1", "b-2"]
+
+
 from pandas_paddles.contexts import ClosureFactoryBase
-from pandas_paddles.closures import AttributeClosure, ItemClosure, MethodClosure
+from pandas_paddles.closures import AttributeClosure, BooleanReduceClosure, ItemClosure, MethodClosure
 
 def assert_expr_eq(a, b):
     assert type(a) == type(b)
@@ -124,3 +138,171 @@ def test_build_filter(preds, op, expected):
 def test_build_filter_fails_on_unknown_op():
     with pytest.raises(ValueError, match="Unsupported operator name: 'bad'"):
         build_filter({}, "bad")
+
+
+@pytest.mark.parametrize("op", [operator.and_, operator.or_])
+def test_combine_many(op):
+    df = pd.DataFrame({
+        "a": [0, 1, 2, 3, 4],
+        "b": [True, False, True, True, False],
+        "n": pd.array([True, None, False, True, True]),
+    })
+    preds = [DF.a > 0, DF.b, DF.a < 4, DF.a != 2]
+    expr = combine(preds, op)
+    assert len(expr._closures) == len(preds[0]._closures) + 1
+    assert isinstance(expr._closures[-1], BooleanReduceClosure)
+    pd.testing.assert_series_equal(expr(df), reduce(op, preds)(df))
+
+    # Nullable booleans are combined with the operator
+    preds = [DF.a > 0, DF.n, DF.b]
+    pd.testing.assert_series_equal(combine(preds, op)(df), reduce(op, preds)(df))
+
+
+def test_combine_does_not_modify_columns():
+    df = pd.DataFrame({"a": [True, False], "b": [False, False], "c": [True, True]})
+    orig = df.copy()
+    combine([DF.a, DF.b, DF.c], "|")(df)
+    pd.testing.assert_frame_equal(df, orig)
+
+
+def test_combine_many_flat():
+    df = pd.DataFrame({f"c{i}": np.arange(5) for i in range(10)})
+    expr = build_filter({f"c{i}": 2 for i in range(10)}, "|")
+    assert len(expr._closures) == 3
+    assert expr(df).tolist() == [False, False, True, False, False]
+
+    preds = [DF[f"c{i % 10}"] > i % 7 for i in range(3000)]
+    pd.testing.assert_series_equal(combine(preds)(df), reduce(operator.and_, preds[:100])(df))
+    # Pretty printing does not nest either
+    assert len(str(combine(preds)).splitlines()) == 4 * 3000 - 1
+
+
+def _counter(counts, key):
+    def count(value):
+        counts[key] = counts.get(key, 0) + 1
+        return value
+    return count
+
+
+@pytest.mark.parametrize("op", ["and", "or"])
+@pytest.mark.parametrize("adaptive", [False, True])
+def test_combine_short_circuit(op, adaptive):
+    df = pd.DataFrame({
+        "k": np.arange(100) % 10,
+        "s": [f"x{i}" for i in range(100)],
+        "x": np.linspace(0, 1, 100),
+    })
+    counts = {}
+    preds = [
+        DF["k"].map(_counter(counts, "k")) == 3,
+        DF["s"].map(_counter(counts, "s")).str.endswith("3"),
+        DF["x"] > DF["x"].map(_counter(counts, "mean")).mean(),
+    ]
+    expected = reduce(getattr(operator, f"{op}_"), preds)(df)
+    counts.clear()
+
+    expr = combine(preds, op, short_circuit=True, adaptive=adaptive)
+    pd.testing.assert_series_equal(expr(df), expected)
+    if not adaptive:
+        # The first predicate decides 90 rows for "and". For "or", 90 rows
+        # are left, which are evaluated with the full frame. Aggregates are
+        # evaluated with all rows.
+        assert counts["k"] == 100
+        assert counts["s"] == (10 if op == "and" else 100)
+        assert counts["mean"] == 100
+    for _ in range(2):
+        pd.testing.assert_series_equal(expr(df), expected)
+        assert df.loc[expr].equals(df.loc[expected])
+    if adaptive:
+        stats = expr._closures[0].stats
+        assert stats.to_frame()["rows"].tolist()[0] == 500
+
+
+def test_combine_short_circuit_reorders():
+    df = pd.DataFrame({"a": np.arange(1000), "b": np.arange(1000) % 2})
+    # The second predicate is more selective
+    expr = combine([DF["b"] == 0, DF["a"] < 10], adaptive=True)
+    assert expr._closures[0].stats.order("__and__") == [0, 1]
+    expected = df.loc[(DF["b"] == 0) & (DF["a"] < 10)]
+    assert df.loc[expr].equals(expected)
+    assert df.loc[expr].equals(expected)
+    assert expr._closures[0].stats.order("__and__") == [1, 0]
+
+
+def test_combine_short_circuit_fallback():
+    df = pd.DataFrame({"a": pd.array([1, None, 3, 4], dtype="Int64"), "b": [1, 2, 3, 4]})
+    preds = [DF["b"] > 1, DF["a"] > 2]
+    expected = reduce(operator.and_, preds)(df)
+    pd.testing.assert_series_equal(combine(preds, short_circuit=True)(df), expected)
+    # Evaluated masks are reused with the operators, without statistics
+    counts = {}
+    preds = [DF["b"].pipe(_counter(counts, "b")) > 1, DF["a"].pipe(_counter(counts, "a")) > 2]
+    expr = combine(preds, adaptive=True)
+    pd.testing.assert_series_equal(expr(df), expected)
+    assert counts == {"a": 1, "b": 1}
+    assert expr._closures[0].stats.to_frame()["rows"].tolist() == [0, 0]
+    # Series are not short-circuited
+    s = pd.Series([1, 2, 3])
+    expr = combine([S > 1, S < 3], short_circuit=True)
+    assert expr(s).tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize("first", ["a", "x"])
+def test_combine_short_circuit_name(first):
+    df = pd.DataFrame({"a": [1, 2, 3, 4], "x": [4, 3, 2, 1]})
+    preds = [DF[first] > 10, DF["x"] > 1, DF["x"] < 4]
+    expected = reduce(operator.and_, preds)(df)
+    # The last predicates are not evaluated
+    result = combine(preds, short_circuit=True)(df)
+    pd.testing.assert_series_equal(result, expected)
+    assert result.name == (None if first == "a" else "x")
+    pd.testing.assert_series_equal(combine(preds[1:], short_circuit=True)(df), reduce(operator.and_, preds[1:])(df))
+
+
+def test_combine_short_circuit_str():
+    preds = [DF["a"] > 1, DF["b"] < 2]
+    assert str(combine(preds, short_circuit=True)) == str(preds[0] & preds[1])
+
+
+def test_combine_short_circuit_fails():
+    with pytest.raises(ValueError):
+        combine([DF["a"] > 1], operator.xor, short_circuit=True)
+    with pytest.raises(ValueError):
+        combine([], adaptive=True)
+
+
+@pytest.mark.parametrize("dtype", [object, "string[pyarrow]"])
+@pytest.mark.parametrize("kind, check", [
+    ("prefix", lambda s, p: s.startswith(tuple(p))),
+    ("suffix", lambda s, p: s.endswith(tuple(p))),
+    ("substring", lambda s, p: any(x in s for x in p)),
+    ("regex", lambda s, p: any(re.search(x, s) for x in p)),
+])
+def test_str_match_any(dtype, kind, check):
+    patterns = ["ab", "abc", "a.b", "b$", "x\n", "(", "c"] if kind != "regex" else ["a.b", "^c+$", r"\d"]
+    values = ["abc", "xab", "a.b\n", "ccc", "x\n", "b$(", "zzz", "a1b", ""]
+    s = pd.Series(values + [None], dtype=dtype)
+    df = pd.DataFrame({"s": s})
+    result = str_match_any("s", patterns, kind)(df)
+    assert result.astype(bool).tolist() == [check(v, patterns) for v in values] + [False]
+
+
+def test_str_match_any_options():
+    df = pd.DataFrame({"s": ["Foo", "bar", None]})
+    assert str_match_any("s", ["foo", "BA"], case=False)(df).tolist() == [True, True, False]
+    assert str_match_any(DF["s"].str.lower(), ["foo"], "prefix")(df).tolist() == [True, False, False]
+    assert str_match_any("s", [])(df).tolist() == [False, False, False]
+    assert str_match_any("s", [""])(df).tolist() == [True, True, False]
+    with pytest.raises(ValueError, match="kind"):
+        str_match_any("s", ["a"], "infix")
+
+
+@pytest.mark.parametrize("dtype", [object, "string[pyarrow]"])
+def test_str_match_any_inline_flags(dtype):
+    df = pd.DataFrame({"u": ["/API/x", "/api", "/v1", "a\nb", None]}, dtype=dtype)
+    result = str_match_any("u", ["(?i)api", "^v", "(?s)a.b"], kind="regex")(df)
+    assert result.astype(bool).tolist() == [True, True, False, True, False]
+    with pytest.raises(ValueError, match="inline flags"):
+        str_match_any("u", ["(?x)a b", "c"], kind="regex")
+    with pytest.raises(ValueError, match="start of the pattern"):
+        str_match_any("u", ["a(?i)b"], kind="regex")
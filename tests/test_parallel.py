@@ -0,0 +1,147 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles import DF, paddles
+from pandas_paddles import parallel
+from pandas_paddles.pandas import PandasDataframeContext
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(2) as ex:
+        yield ex
+
+
+@pytest.fixture
+def df():
+    n = 101
+    return pd.DataFrame(
+        {
+            "x": np.linspace(-1, 1, n),
+            "i": np.arange(n),
+            "s": [f" Name{i % 7} " for i in range(n)],
+            "c": pd.Categorical(np.array(list("abc"))[np.arange(n) % 3]),
+            "t": pd.date_range("2024-01-01", periods=n, freq="h"),
+        },
+        index=pd.Index(np.arange(n) * 10 + 5, name="id"),
+    )
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        DF.x * 2 + DF.i,
+        # Aggregates are evaluated on the full frame, not per row range
+        DF.x - DF.x.mean(),
+        DF["s"].str.strip().str.lower() + "-" + DF["c"].astype(str),
+        DF.t.dt.hour.between(2, 5) & (DF.i > DF.i.quantile(0.25)),
+    ],
+    ids=str,
+)
+def test_parallel_eval(df, executor, expr):
+    result = paddles.parallel_eval(df, expr, executor=executor, workers=3)
+    pd.testing.assert_series_equal(result, expr(df))
+
+
+def test_not_row_wise(df, executor, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Should not be evaluated in parallel")
+    monkeypatch.setattr(parallel, "_evaluate_parallel", fail)
+
+    for expr in [DF.x.cumsum(), DF.x.mean(), DF.sum(numeric_only=True)]:
+        result = paddles.parallel_eval(df, expr, executor=executor)
+        expected = expr(df)
+        if isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(result, expected)
+        else:
+            assert result == expected
+
+
+def test_default_workers(df, executor, monkeypatch):
+    monkeypatch.setattr(parallel.os, "cpu_count", lambda: 4)
+    n_chunks = []
+    row_ranges = parallel._row_ranges
+    monkeypatch.setattr(parallel, "_row_ranges", lambda n, k: n_chunks.append(k) or row_ranges(n, k))
+    result = paddles.parallel_eval(df, DF.x * 2, executor=executor)
+    # Not the size of the pool
+    assert n_chunks == [4]
+    pd.testing.assert_series_equal(result, df.x * 2)
+
+
+def test_not_elementwise(df, executor):
+    for expr in [DF.s.astype("category"), DF.s.str.strip().str.get_dummies(), DF.s.str.split("e", expand=True)]:
+        result = paddles.parallel_eval(df, expr, executor=executor, workers=3)
+        expected = expr(df)
+        if isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(result, expected)
+        else:
+            pd.testing.assert_frame_equal(result, expected)
+
+
+def test_falls_back_on_different_dtypes(df, executor, monkeypatch):
+    # Only the first row range maps all values to ints
+    expr = DF.i.map({i: i * 2 for i in range(40)})
+    evaluated = []
+    original = PandasDataframeContext._evaluate
+    def spy(self, obj):
+        evaluated.append(len(obj))
+        return original(self, obj)
+    monkeypatch.setattr(PandasDataframeContext, "_evaluate", spy)
+
+    result = paddles.parallel_eval(df, expr, executor=executor, workers=3)
+    assert evaluated == [len(df)]
+    monkeypatch.undo()
+    pd.testing.assert_series_equal(result, expr(df))
+
+
+def test_concat_chunks():
+    index = pd.RangeIndex(4)
+    parts = [pd.Series(["a", "b"], dtype="category"), pd.Series(["c", "a"], dtype="category")]
+    assert parallel._concat_chunks(parts, index) is None
+    parts = [pd.DataFrame({"a": [1, 1]}), pd.DataFrame({"b": [1, 1]})]
+    assert parallel._concat_chunks(parts, index) is None
+    parts = [pd.Series([1, 2]), pd.Series([3, 4])]
+    pd.testing.assert_series_equal(parallel._concat_chunks(parts, index), pd.Series([1, 2, 3, 4]))
+
+
+def test_own_pool(df):
+    expr = DF.x.abs()
+    pd.testing.assert_series_equal(paddles.parallel_eval(df, expr, workers=2), expr(df))
+
+
+def test_single_worker(df):
+    expr = DF.x.abs()
+    pd.testing.assert_series_equal(paddles.parallel_eval(df, expr, workers=1), expr(df))
+
+
+def test_parallel_assign(df, executor):
+    kwargs = dict(
+        x=DF.x * 10,
+        # Must use the new x
+        y=DF.x + 1,
+        z=DF.s.str.len(),
+        w=lambda d: d.z * 2,
+        v=5,
+    )
+    result = paddles.parallel_assign(df, executor=executor, **kwargs)
+    pd.testing.assert_frame_equal(result, df.assign(**kwargs))
+
+
+def test_shared_memory_released(df, executor, monkeypatch):
+    created = []
+    original = parallel.shared_memory.SharedMemory
+
+    def tracking(*args, **kwargs):
+        shm = original(*args, **kwargs)
+        created.append(shm.name)
+        return shm
+
+    monkeypatch.setattr(parallel.shared_memory, "SharedMemory", tracking)
+    paddles.parallel_eval(df, DF.x + DF.i, executor=executor, workers=2)
+    assert len(created) == 2
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            original(name=name)
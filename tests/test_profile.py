@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles import DF, S
+from pandas_paddles.profiling import profile
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "s": ["1", "22", "333", "4444"],
+        "x": np.arange(4.0),
+    })
+
+
+def test_profile_result(df):
+    expr = DF["s"].str.len().astype(float) > DF.x.clip(upper=DF.x.mean())
+    prof = profile(expr, df)
+    pd.testing.assert_series_equal(prof.result, expr(df))
+
+
+def test_profile_records(df):
+    prof = profile(DF["s"].str.len() > DF.x.clip(upper=DF.x.mean()), df)
+    steps = [(r["step"], r["depth"]) for r in prof.records]
+    assert steps == [
+        ("['s']", 0),
+        (".str", 0),
+        (".len()", 0),
+        (".x", 1),
+        (".x", 2),
+        (".mean()", 2),
+        (".clip()", 1),
+        (">", 0),
+    ]
+    assert all(r["time"] >= 0 for r in prof.records)
+    assert prof.total_time == sum(r["time"] for r in prof.records)
+
+    first, accessor = prof.records[:2]
+    assert (first["type"], first["length"], first["nbytes"]) == ("Series", 4, df["s"].nbytes)
+    assert accessor["type"] == "StringMethods"
+    assert accessor["length"] is None
+    assert accessor["nbytes"] is None
+    assert prof.records[-1]["nbytes"] == 4
+
+    frame = prof.to_frame()
+    assert list(frame.columns) == ["step", "depth", "time", "type", "length", "nbytes"]
+    assert len(frame) == 8
+
+
+def test_profile_tree(df):
+    expr = DF["s"].str.len() > DF.x.clip(upper=DF.x.mean())
+    prof = profile(expr, df)
+    lines = str(prof).splitlines()
+    plain = [l.split("  #")[0].rstrip() for l in lines]
+    assert plain == str(expr).splitlines()
+    # Every step is annotated exactly once
+    assert sum(l.count(" ms, ") for l in lines) == len(prof.records)
+    assert ".str" in lines[1] and "StringMethods" in lines[1]
+
+
+def test_profile_repeated_closure(df):
+    x = DF.x
+    prof = profile(x + x, df)
+    assert "(2 calls)" in str(prof)
+
+
+def test_profile_series(df):
+    prof = profile(S.abs().sum(), df["x"])
+    assert prof.result == 6.0
+    assert [r["step"] for r in prof.records] == [".abs()", ".sum()"]
+
+
+def test_profile_wrong_type(df):
+    with pytest.raises(TypeError):
+        profile(S.abs(), df)
+
+
+def test_str_without_annotation(df):
+    expr = DF.x.clip(upper=DF.x.mean())
+    assert str(expr) == str(expr.as_tree(lambda c: None).pprint())
+    assert "#" not in str(expr)
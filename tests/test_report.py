@@ -96,3 +96,48 @@ def test_with_custom_print_func_pipe_args(df):
     df2 = df.pipe(report, print_func=custom_fn, out=out)
     assert out == {"buf":  "(3, 2)"}
     assert df2 is df
+
+def test_with_custom_print_func_persist_kwarg(df):
+    out = {}
+    def custom_fn(*args, persist=False):
+        out['persist'] = persist
+
+    df.pipe(report(print_func=custom_fn, persist=True))
+    assert out == {"persist": True}
+
+
+@pytest.fixture
+def ddf(df):
+    dd = pytest.importorskip("dask.dataframe")
+    return dd.from_pandas(df, npartitions=2)
+
+
+def test_dask_single_compute(ddf, capsys, monkeypatch):
+    import dask
+    calls = []
+    orig_compute = dask.compute
+    def counting_compute(*args, **kwargs):
+        calls.append(len(args))
+        return orig_compute(*args, **kwargs)
+    monkeypatch.setattr(dask, "compute", counting_compute)
+
+    ddf2 = ddf.pipe(report("Label", DF.shape, DF["y"].sum(), DF["x"].nunique()))
+    captured = capsys.readouterr()
+    assert captured.out == 'Label (3, 2) 3 2\n'
+    assert calls == [4]
+    assert ddf2 is ddf
+
+
+def test_dask_no_call(ddf, capsys):
+    ddf2 = ddf.pipe(report, 'Label')
+    captured = capsys.readouterr()
+    assert captured.out == 'Label (3, 2)\n'
+    assert ddf2 is ddf
+
+
+def test_dask_persist(ddf, capsys):
+    ddf2 = ddf.pipe(report(persist_dask=True))
+    captured = capsys.readouterr()
+    assert captured.out == '(3, 2)\n'
+    assert ddf2 is not ddf
+    pd.testing.assert_frame_equal(ddf2.compute(), ddf.compute())
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles.analysis import is_aggregate, referenced_columns, row_wise_prefix
+from pandas_paddles.pandas import DF
+
+HAS_DASK = False
+try:
+    import dask.dataframe
+    from pandas_paddles.dask import DF as DaskDF
+    HAS_DASK = True
+except ImportError:
+    pass
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        (DF["a"], 1),
+        (DF.a * 2 + DF.b, 3),
+        ((DF.a * 2 + DF.b).clip(0) > DF.c, 5),
+        (DF.a > DF.a.mean(), 2),
+        (DF["s"].str.lower().str.startswith("x"), 5),
+        (DF["s"].str[0], 3),
+        (DF["t"].dt.year, 3),
+        (DF.a.cumsum() + 1, 1),
+        (DF.a.mean(), 1),
+        (DF["s"].str.cat(), 1),
+        (DF["s"].str.get_dummies(), 1),
+        (DF["s"].str.split("b"), 3),
+        (DF["s"].str.split("b", expand=True), 1),
+        (DF["s"].str.rsplit("b", n=1, expand=True), 1),
+        (DF["s"].str.extract("(b)"), 1),
+        (DF["s"].str.extract("(b)", 0, False), 3),
+        (DF["s"].str.partition("b"), 1),
+        (DF["s"].str.partition("b", expand=False), 3),
+        (DF["s"].str.contains("infer"), 3),
+        (DF["s"].str.repeat([1, 2]), 1),
+        (DF["t"].dt.tz, 1),
+        (DF["t"].dt.isocalendar(), 1),
+        (DF["t"].dt.tz_localize("UTC"), 3),
+        (DF["t"].dt.tz_localize("CET", ambiguous="infer"), 1),
+        (DF.a.astype(float) + 1, 3),
+        (DF.a.astype("category"), 1),
+        (DF.a.astype(dtype=pd.CategoricalDtype()), 1),
+        (DF.a.astype(pd.CategoricalDtype([1, 2])), 2),
+        (DF.a + pd.Series([1]), 1),
+        (DF.a.fillna(method="ffill"), 1),
+        (DF.sum(), 0),
+        (DF[["a", "b"]] * 2, 0),
+    ],
+)
+def test_row_wise_prefix(expr, expected):
+    assert row_wise_prefix(expr) == expected
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        (DF.a.mean(), True),
+        (DF["a"].quantile(0.99), True),
+        ((DF.a * 2).sum(), True),
+        (DF["a"].quantile([0.5, 0.99]), False),
+        (DF.a.cumsum().sum(), False),
+        (DF.a, False),
+    ],
+)
+def test_is_aggregate(expr, expected):
+    assert is_aggregate(expr) == expected
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        ((DF.a * 2 + DF.b).clip(0) > DF.c, ["a", "b", "c"]),
+        (DF["x"].clip(upper=DF["y"].quantile(0.99)), ["x", "y"]),
+        (DF.a > DF.sum(), None),
+    ],
+)
+def test_referenced_columns(expr, expected):
+    assert referenced_columns(expr) == expected
+
+
+@pytest.fixture
+def pdf():
+    return pd.DataFrame({
+        "a": np.arange(20) - 5,
+        "b": np.arange(20) % 3,
+        "c": np.arange(20) % 7,
+        "s": list("AbCdE") * 4,
+    })
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+@pytest.mark.parametrize(
+    "expr",
+    [
+        lambda DF: (DF.a * 2 + DF.b).clip(0) > DF.c,
+        lambda DF: DF.a > DF.a.mean(),
+        lambda DF: DF["s"].str.lower().str.startswith("a"),
+    ],
+)
+def test_dask_fused(pdf, expr):
+    ddf = dask.dataframe.from_pandas(pdf, npartitions=4)
+    test = expr(DaskDF)(ddf)
+    assert type(test.expr).__name__ == "MapPartitions"
+    # dask converts strings to arrow strings which yields nullable booleans
+    pd.testing.assert_series_equal(test.compute(), expr(DF)(pdf), check_dtype=False)
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_dask_fused_prefix(pdf):
+    ddf = dask.dataframe.from_pandas(pdf, npartitions=4)
+    test = (DaskDF.a * 2).cumsum()(ddf)
+    pd.testing.assert_series_equal(test.compute(), (DF.a * 2).cumsum()(pdf))
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_dask_not_fused_category(pdf):
+    ddf = dask.dataframe.from_pandas(pdf, npartitions=4)
+    test = DaskDF.a.astype("category")(ddf)
+    assert type(test.expr).__name__ != "MapPartitions"
+    result = test.compute()
+    assert result.cat.categories.tolist() == sorted(pdf["a"].unique())
@@ -1,11 +1,20 @@
 import pickle
 import string
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from pandas_paddles import C
-from pandas_paddles.axis import OpComposerBase
+from pandas_paddles import C, S
+from pandas_paddles.axis import ColumnSelectionComposer, OpComposerBase, column_stats_cache
+
+HAS_DASK = False
+try:
+    import dask
+    import dask.dataframe
+    HAS_DASK = True
+except ImportError:
+    pass
 
 
 def cols(df: pd.DataFrame, col_sel: OpComposerBase) -> list:
@@ -275,12 +284,143 @@ def test_inversion_composition(mi_df):
     assert test == expected_composed
 
 
+def test_string_dtype(simple_df):
+    df = simple_df.astype({"z": "string"})
+    col_sel = C.dtype == str
+    assert cols(df, col_sel) == ["z"]
+
+
+@pytest.fixture
+def dask_df(simple_df):
+    df = simple_df.assign(b=b"a")
+    with dask.config.set({"dataframe.convert-string": False}):
+        return dask.dataframe.from_pandas(df, npartitions=2)
+
+
+def _no_scheduler(*args, **kwargs):
+    raise AssertionError("Tasks were scheduled")
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+@pytest.mark.parametrize(
+    "col_sel, expected",
+    [
+        (C.dtype == int, ["x", "y"]),
+        (C.dtype == float, ["u"]),
+        # object columns cannot be told apart without computing
+        (C.dtype == str, ["z", "b"]),
+        (C.dtype.isin((str, float)), ["z", "u", "b"]),
+    ],
+)
+def test_dask_dtype_uses_meta(dask_df, col_sel, expected):
+    with dask.config.set(scheduler=_no_scheduler):
+        assert cols(dask_df, col_sel) == expected
+        assert col_sel(dask_df).to_list() == expected
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_dask_dtype_sample_head(dask_df):
+    C_head = ColumnSelectionComposer(sample_dask_head=True)
+    assert (C_head.dtype == str)(dask_df).to_list() == ["z"]
+    assert (C_head.dtype == bytes)(dask_df).to_list() == ["b"]
+    assert list(dask_df[(C_head.dtype == str)(dask_df)].columns) == ["z"]
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_dask_dtype_sample_head_loc(dask_df):
+    # .loc[] passes the empty meta data: Object columns cannot be tested
+    C_head = ColumnSelectionComposer(sample_dask_head=True)
+    with pytest.warns(UserWarning, match=r"ddf\[selection\(ddf\)\]"):
+        assert list(dask_df.loc[:, C_head.dtype == str].columns) == ["z", "b"]
+    with pytest.warns(UserWarning):
+        assert list(dask_df.loc[:, C_head.dtype == bytes].columns) == ["z", "b"]
+
+
+def test_dtype_empty_frame():
+    df = pd.DataFrame({"o": pd.Series([], dtype=object), "i": pd.Series([], dtype=int)})
+    assert cols(df, C.dtype == str) == ["o"]
+    assert cols(df, C.dtype == bytes) == ["o"]
+    assert cols(df, C.dtype == int) == ["i"]
+
+
+@pytest.fixture
+def sparse_df():
+    return pd.DataFrame(
+        {
+            "x": [1.0, 2.0, np.nan, np.nan, np.nan],
+            "y": [1, 1, 1, 1, 1],
+            "z": list("abcde"),
+        }
+    )
+
+
+def test_where_isna(sparse_df):
+    col_sel = C.where(S.isna().mean() > 0.5)
+    assert cols(sparse_df, col_sel) == ["x"]
+
+
+def test_where_nunique(sparse_df):
+    col_sel = ~C.where(S.nunique() <= 1)
+    assert cols(sparse_df, col_sel) == ["x", "z"]
+
+
+def test_where_callable(sparse_df):
+    col_sel = C.where(lambda df: df.nunique() > 2)
+    assert cols(sparse_df, col_sel) == ["z"]
+
+
+def test_where_composition(sparse_df):
+    col_sel = C.where(S.nunique() > 2) | ...
+    assert cols(sparse_df, col_sel) == ["z", "x", "y"]
+
+
+def test_where_caches_statistics(sparse_df):
+    cols(sparse_df, C.where(S.isna().mean() > 0.5))
+    stats = column_stats_cache.get(sparse_df)
+    cached = [v for v in stats.values() if v.dtype != bool]
+    assert len(cached) == 1
+
+    # Other predicate on the same statistic reuses it
+    assert cols(sparse_df, C.where(S.isna().mean() < 0.1)) == ["y", "z"]
+    cached = [v for v in stats.values() if v.dtype != bool]
+    assert len(cached) == 1
+
+
+def test_where_after_adding_column(sparse_df):
+    assert cols(sparse_df, C.where(S.isna().mean() > 0.5)) == ["x"]
+    sparse_df["w"] = np.nan
+    assert cols(sparse_df, C.where(S.isna().mean() > 0.5)) == ["x", "w"]
+    del sparse_df["x"]
+    assert cols(sparse_df, C.where(S.isna().mean() > 0.5)) == ["w"]
+
+
+def test_where_after_replacing_column(sparse_df):
+    assert cols(sparse_df, C.where(S.nunique() <= 1)) == ["y"]
+    sparse_df["y"] = range(5)
+    assert cols(sparse_df, C.where(S.nunique() <= 1)) == []
+
+
+def test_where_after_in_place_edit(sparse_df):
+    assert cols(sparse_df, C.where(S.isna().mean() > 0.5)) == ["x"]
+    sparse_df.loc[2:, "x"] = 0.0
+    column_stats_cache.invalidate(sparse_df)
+    assert cols(sparse_df, C.where(S.isna().mean() > 0.5)) == []
+
+
+def test_where_fails_on_index():
+    df = pd.DataFrame({"x": [1, 2]})
+    sel = OpComposerBase("index", C.where(S.isna().mean() > 0).op)
+    with pytest.raises(ValueError, match="only supported for column selection"):
+        df.loc[sel]
+
+
 @pytest.mark.parametrize(
     "sel",
     [
         C["y", "z", "x"],
         C.dtype.isin((str, float)),
         ... & ~C.levels[1]["Y", "Z"],
+        C.where(S.isna().mean() > 0.5),
     ],
 )
 def test_serializable(sel):
@@ -5,6 +5,13 @@ import pytest
 from pandas_paddles import I
 from pandas_paddles.axis import OpComposerBase
 
+HAS_DASK = False
+try:
+    import dask.dataframe
+    HAS_DASK = True
+except ImportError:
+    pass
+
 
 def rows(df: pd.DataFrame, idx_sel: OpComposerBase) -> list:
     return df.loc[idx_sel].index.to_list()
@@ -221,3 +228,53 @@ def test_inversion_composition(mi_df):
 def test_serializable(sel):
     buf = pickle.dumps(sel)
     pickle.loads(buf)
+
+
+@pytest.fixture
+def dask_df():
+    df = pd.DataFrame(
+        {"a": range(100)},
+        index=[f"k{i:03d}" for i in range(100)],
+    )
+    return dask.dataframe.from_pandas(df, npartitions=10)
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+@pytest.mark.parametrize(
+    "idx_sel, expected, npartitions",
+    [
+        (I["k005", "k057"], ["k005", "k057"], 2),
+        (I["k011":"k013"], ["k011", "k012", "k013"], 1),
+        (I["k001"] | I["k090", "k091"], ["k001", "k090", "k091"], 2),
+        (I["zzz"], [], 1),
+    ],
+)
+def test_dask_partition_pruning(dask_df, idx_sel, expected, npartitions):
+    selected = dask_df.loc[idx_sel]
+    assert selected.optimize().npartitions == npartitions
+    assert selected.compute().index.to_list() == expected
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+@pytest.mark.parametrize(
+    "idx_sel",
+    [
+        I.startswith("k00"),
+        I["k001"] | ...,
+        ~I["k001"],
+    ],
+)
+def test_dask_unsupported(dask_df, idx_sel):
+    with pytest.raises(ValueError, match="Cannot select rows of dask data frames"):
+        dask_df.loc[idx_sel]
+
+
+@pytest.mark.skipif(not HAS_DASK, reason="dask not available")
+def test_dask_incomparable_labels():
+    ddf = dask.dataframe.from_pandas(pd.DataFrame({"a": range(10)}), npartitions=2)
+    # Labels not comparable with the divisions are left to dask
+    with pytest.raises(TypeError) as native:
+        ddf.loc[["x", 3]].compute()
+    with pytest.raises(TypeError) as selected:
+        ddf.loc[I["x", 3]].compute()
+    assert str(selected.value) == str(native.value)
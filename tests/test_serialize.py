@@ -0,0 +1,139 @@
+import json
+import pickle
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles import DF, S, paddles, serialize
+from pandas_paddles.closures import MethodClosure
+from pandas_paddles.pandas import PandasDataframeContext
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "x": [1.0, -2.0, 3.0, np.nan],
+        "y": [4, 5, 6, 7],
+        "s": ["a", "bb", "a", "c"],
+        ("m", "i"): [1, 2, 3, 4],
+    })
+
+
+JSON_EXPRESSIONS = [
+    DF["x"],
+    DF.x.fillna(0).astype(int),
+    (DF["x"].clip(upper=DF["y"].max()) > 0) & ~DF["s"].str.startswith("b"),
+    DF["s"].isin(["a", "c"]),
+    DF["y"].astype("float32").between(4, 6, inclusive="left"),
+    DF[("m", "i")] + DF["y"].iloc[1:3].sum(),
+    DF["s"].map({"a": 1, "bb": 2}).fillna(-1),
+    DF["y"].astype(pd.Int64Dtype()) * np.int64(2),
+    paddles.combine([DF.x > 0, DF.y < 7, DF.s != "c"], "|"),
+    paddles.combine([DF.y < 7, DF.x > DF.x.mean()], short_circuit=True),
+    paddles.combine([DF.y < 7, DF.s != "c"], "|", adaptive=True),
+    paddles.str_join("/", "s", DF.y * 2, dtype="string[pyarrow]"),
+]
+
+
+@pytest.mark.parametrize("expr", JSON_EXPRESSIONS, ids=str)
+def test_json_roundtrip(df, expr):
+    payload = serialize.to_json(expr)
+    restored = serialize.from_json(payload)
+    assert serialize.to_json(restored) == payload
+    pd.testing.assert_series_equal(restored(df), expr(df))
+
+
+@pytest.mark.parametrize("expr", JSON_EXPRESSIONS, ids=str)
+def test_bytes_roundtrip(df, expr):
+    restored = serialize.from_bytes(serialize.to_bytes(expr))
+    pd.testing.assert_series_equal(restored(df), expr(df))
+
+
+def test_json_format():
+    tree = json.loads(serialize.to_json(DF["x"].clip(upper=DF.y.max())))
+    assert tree == [
+        serialize.FORMAT_VERSION,
+        "DF",
+        [
+            ["i", "x"],
+            ["m", "clip", [], {"upper": {"$expr": ["DF", [["a", "y"], ["m", "max", [], {}]]]}}],
+        ],
+    ]
+
+
+def test_series_context():
+    expr = serialize.from_json(serialize.to_json(S.abs().max() - S.min()))
+    assert expr(pd.Series([-3, 1, 2])) == 6
+
+
+def test_json_rejects_unsupported_arguments():
+    expr = DF["s"].str.contains(re.compile("a"))
+    with pytest.raises(TypeError, match="to_bytes"):
+        serialize.to_json(expr)
+    # Categorical with categories cannot be reconstructed from its name
+    with pytest.raises(TypeError):
+        serialize.to_json(DF["s"].astype(pd.CategoricalDtype(["a", "c"])))
+
+
+def test_bytes_supports_any_argument(df):
+    expr = DF["s"].str.contains(re.compile("a")) | DF["y"].isin(np.array([5]))
+    restored = serialize.from_bytes(serialize.to_bytes(expr))
+    pd.testing.assert_series_equal(restored(df), expr(df))
+
+
+def test_unsupported_version():
+    tree = serialize.to_tree(DF.x)
+    tree[0] = serialize.FORMAT_VERSION + 1
+    with pytest.raises(ValueError, match="version"):
+        serialize.from_tree(tree)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        paddles.combine([DF.x > 0, DF.y > 0, DF.x < 5]),
+        paddles.str_join("-", "s", "x"),
+    ],
+    ids=str,
+)
+def test_too_new_payload(expr):
+    tree = serialize.to_tree(expr)
+    assert tree[0] == serialize.FORMAT_VERSION == 2
+    tree[0] += 1
+    with pytest.raises(ValueError, match=r"version 3 \(supported: <= 2\)"):
+        serialize.from_json(json.dumps(tree))
+    with pytest.raises(ValueError, match="version 3"):
+        serialize.from_bytes(serialize._MAGIC + pickle.dumps(tree))
+
+
+def test_version_1_payload(df):
+    payload = '[1,"DF",[["i","x"],["m","clip",[],{"upper":2}]]]'
+    pd.testing.assert_series_equal(serialize.from_json(payload)(df), DF["x"].clip(upper=2)(df))
+
+
+def test_invalid_bytes():
+    with pytest.raises(ValueError):
+        serialize.from_bytes(pickle.dumps(DF.x))
+
+
+def test_pickle_is_compact(df):
+    expr = (DF["x"].clip(upper=DF["y"].max()) > 0) & DF["s"].str.contains("a")
+    payload = pickle.dumps(expr)
+    assert b"MethodClosure" not in payload
+    assert b"__doc__" not in payload
+    assert len(payload) < 300
+    pd.testing.assert_series_equal(pickle.loads(payload)(df), expr(df))
+
+
+def test_method_context_is_preserved():
+    dask = pytest.importorskip("pandas_paddles.dask")
+    # Closures of a pandas expression evaluated with the dask context
+    expr = dask.DaskDataframeContext((DF.x + DF.y)._closures)
+    restored = serialize.from_tree(serialize.to_tree(expr))
+    assert type(restored) is dask.DaskDataframeContext
+    closure, = restored._closures[1:]
+    assert isinstance(closure, MethodClosure)
+    assert closure._factory_cls is PandasDataframeContext
+    assert type(closure.args[0]) is PandasDataframeContext
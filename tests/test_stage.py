@@ -0,0 +1,79 @@
+import json
+import logging
+
+import pandas as pd
+import pytest
+
+from pandas_paddles import paddles
+from pandas_paddles.pipe import CollectorSink, JsonLinesSink, StageTracker, stage
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'x': ['a', 'b', 'b'],
+        'y': range(3),
+    })
+
+
+def test_stage_records(df):
+    collector = CollectorSink()
+    with StageTracker(collector, deep=True, trace_malloc=True):
+        df2 = (df
+               .pipe(stage("start"))
+               .drop_duplicates("x")
+               .pipe(stage, "dedupe")
+              )
+    assert [r["stage"] for r in collector.records] == ["start", "dedupe"]
+
+    start, dedupe = collector.records
+    assert (start["rows"], start["columns"]) == (3, 2)
+    assert (dedupe["rows"], dedupe["columns"]) == (2, 2)
+    assert start["memory_delta"] is None
+    assert dedupe["memory_delta"] == dedupe["memory"] - start["memory"] < 0
+    for r in collector.records:
+        assert r["wall_time"] >= 0
+        assert r["cpu_time"] >= 0
+        assert r["tracemalloc_peak"] > 0
+
+    pd.testing.assert_frame_equal(df2, df.drop_duplicates("x"))
+
+
+def test_stage_returns_input(df):
+    with StageTracker(CollectorSink()):
+        assert df.pipe(paddles.stage("a")) is df
+        assert df.pipe(stage, "a") is df
+
+
+def test_json_lines_sink(df, tmp_path):
+    path = tmp_path / "stages.jsonl"
+    with StageTracker(JsonLinesSink(path)):
+        df.pipe(stage("a")).pipe(stage("b"))
+
+    records = [json.loads(l) for l in path.read_text().splitlines()]
+    assert [r["stage"] for r in records] == ["a", "b"]
+    assert records[0]["rows"] == 3
+
+
+def test_default_logging(df, caplog):
+    with caplog.at_level(logging.INFO, logger="pandas_paddles.pipe"):
+        df.pipe(stage("logged"))
+    assert "stage logged: " in caplog.text
+    assert "rows=3" in caplog.text
+
+
+def test_nested_trackers(df):
+    outer = CollectorSink()
+    inner = CollectorSink()
+    with StageTracker(outer):
+        df.pipe(stage("outer-1"))
+        with StageTracker(inner):
+            df.pipe(stage("inner"))
+        df.pipe(stage("outer-2"))
+    assert [r["stage"] for r in outer.records] == ["outer-1", "outer-2"]
+    assert [r["stage"] for r in inner.records] == ["inner"]
+
+
+def test_stage_fails_without_name(df):
+    with pytest.raises(TypeError, match="stage name"):
+        stage()
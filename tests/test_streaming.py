@@ -0,0 +1,146 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from pandas_paddles import C, DF
+from pandas_paddles.streaming import Pipeline
+
+
+def make_batch(i):
+    return pd.DataFrame({
+        "x": range(i * 4, i * 4 + 4),
+        "s": ["a", "b", "a", "c"],
+    })
+
+
+async def source(n, read=None):
+    for i in range(n):
+        if read is not None:
+            read.append(i)
+        yield make_batch(i)
+        await asyncio.sleep(0)
+
+
+async def collect(aiter):
+    return [b async for b in aiter]
+
+
+pipeline = (
+    Pipeline()
+    .filter(DF.s != "c")
+    .assign(y=DF.x * 2)
+    .select(C["y", "s"])
+)
+
+
+def test_pipeline_call():
+    df = make_batch(0)
+    expected = df.loc[df.s != "c"].assign(y=df.x * 2).loc[:, ["y", "s"]]
+    pd.testing.assert_frame_equal(pipeline(df), expected)
+    pd.testing.assert_frame_equal(df.pipe(pipeline), expected)
+    assert len(pipeline) == 3
+    assert len(Pipeline()) == 0
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_stream_ordered(concurrency):
+    result = asyncio.run(collect(pipeline.stream(source(10), concurrency=concurrency)))
+    assert len(result) == 10
+    for i, batch in enumerate(result):
+        pd.testing.assert_frame_equal(batch, pipeline(make_batch(i)))
+
+
+def test_stream_unordered():
+    def slow_first(df):
+        if df.x.iloc[0] == 0:
+            threading.Event().wait(0.05)
+        return df
+
+    slow = Pipeline().pipe(slow_first)
+    result = asyncio.run(collect(slow.stream(source(3), concurrency=3, ordered=False)))
+    assert sorted(b.x.iloc[0] for b in result) == [0, 4, 8]
+    assert result[-1].x.iloc[0] == 0
+
+
+def test_stream_backpressure():
+    read = []
+
+    async def main():
+        stream = pipeline.stream(source(100, read), concurrency=2)
+        first = await stream.__anext__()
+        # Nothing is read ahead beyond the batches in flight
+        assert read == [0, 1]
+        await stream.aclose()
+        return first
+
+    first = asyncio.run(main())
+    pd.testing.assert_frame_equal(first, pipeline(make_batch(0)))
+
+
+def test_stream_runs_in_executor():
+    threads = set()
+    def record(df):
+        threads.add(threading.get_ident())
+        return df
+
+    p = Pipeline().pipe(record)
+
+    async def main():
+        await collect(p.stream(source(2)))
+
+    asyncio.run(main())
+    assert threading.get_ident() not in threads
+
+
+def _pid(df):
+    return df.assign(pid=os.getpid())
+
+
+def test_stream_process_pool():
+    p = pipeline.pipe(_pid)
+
+    async def main():
+        with ProcessPoolExecutor(2) as executor:
+            return await collect(p.stream(source(4), concurrency=2, executor=executor))
+
+    result = asyncio.run(main())
+    assert len(result) == 4
+    for i, batch in enumerate(result):
+        assert (batch.pid != os.getpid()).all()
+        pd.testing.assert_frame_equal(batch.drop(columns="pid"), pipeline(make_batch(i)))
+
+
+def test_stream_process_pool_not_picklable():
+    p = pipeline.pipe(lambda df: df)
+
+    async def main():
+        with ProcessPoolExecutor(1) as executor:
+            return await collect(p.stream(source(1), executor=executor))
+
+    with pytest.raises(TypeError, match="picklable"):
+        asyncio.run(main())
+
+
+def test_stream_error():
+    def fail(df):
+        if df.x.iloc[0] == 4:
+            raise RuntimeError("bad batch")
+        return df
+
+    async def main():
+        results = []
+        with pytest.raises(RuntimeError, match="bad batch"):
+            async for b in Pipeline().pipe(fail).stream(source(5), concurrency=2):
+                results.append(b)
+        return results
+
+    assert len(asyncio.run(main())) == 1
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError, match="concurrency"):
+        asyncio.run(collect(pipeline.stream(source(1), concurrency=0)))
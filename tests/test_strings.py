@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from pandas_paddles import DF, strings
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "o": ["x", None, "z"],
+        "i": [1, -2, 3],
+        "f": [1.0, np.nan, 2.5],
+        "b": [True, False, True],
+        "s": pd.array(["p", None, "r"], dtype="string[pyarrow]"),
+        "a": pd.Series(["u", "v", None], dtype=pd.ArrowDtype(pa.string())),
+        "c": pd.Categorical(["k", "l", "k"]),
+        "n": pd.array([1, None, 3], dtype="Int64"),
+        "m": [{"k": 1}, [2], (3,)],
+    }, index=[10, 5, 7])
+
+
+def _chained(sep, values):
+    result = values[0].astype(str)
+    for v in values[1:]:
+        result = result + sep + v.astype(str)
+    return result
+
+
+@pytest.mark.parametrize("columns", [list("oifbsacn"), list("oim"), ["i"], ["s", "a"]])
+def test_join_like_astype_str(df, columns):
+    values = [df[c] for c in columns]
+    result = strings.join("|", values)
+    expected = _chained("|", values)
+    assert result.dtype == object
+    pd.testing.assert_series_equal(result, expected)
+
+
+@pytest.mark.parametrize("dtype", [
+    "string[pyarrow]",
+    "string[python]",
+    pd.ArrowDtype(pa.string()),
+    pd.ArrowDtype(pa.large_string()),
+])
+def test_join_dtype(df, dtype):
+    result = strings.join("|", [df["o"], df["i"]], dtype=dtype)
+    assert result.dtype == pd.api.types.pandas_dtype(dtype)
+    assert result.tolist() == ["x|1", "None|-2", "z|3"]
+
+
+def test_join_misaligned_falls_back(df):
+    other = df["i"].sort_index()
+    pd.testing.assert_series_equal(strings.join("|", [df["o"], other]), _chained("|", [df["o"], other]))
+
+
+def test_is_arrow_string(df):
+    assert strings.is_arrow_string(df["s"].dtype)
+    assert strings.is_arrow_string(df["a"].dtype)
+    assert not strings.is_arrow_string(df["o"].dtype)
+    assert not strings.is_arrow_string(pd.StringDtype("python"))
+    assert not strings.is_arrow_string(pd.ArrowDtype(pa.int64()))
+
+
+ARROW_STRING_DTYPES = ["string[pyarrow]", pd.ArrowDtype(pa.string())]
+
+CHAINS = [
+    (DF["s"].str.lower().str.strip().str.startswith("x"), lambda s: s.str.lower().str.strip().str.startswith("x")),
+    (DF["s"].str.upper().str.len(), lambda s: s.str.upper().str.len()),
+    (DF["s"].str.strip("_ ").str.endswith("B"), lambda s: s.str.strip("_ ").str.endswith("B")),
+    (DF["s"].str.lstrip().str.rstrip("_"), lambda s: s.str.lstrip().str.rstrip("_")),
+    (DF["s"].str.replace("a", "o").str.contains("O", case=False), lambda s: s.str.replace("a", "o").str.contains("O", case=False)),
+    (DF["s"].str.replace(r"\s+", "", regex=True).str.count("[ab]"), lambda s: s.str.replace(r"\s+", "", regex=True).str.count("[ab]")),
+    (DF["s"].str.slice(1, 3).str.isalpha(), lambda s: s.str.slice(1, 3).str.isalpha()),
+    (DF["s"].str.strip().str.match("x[a-z]"), lambda s: s.str.strip().str.match("x[a-z]")),
+    (DF["s"].str.strip().str.fullmatch(r"\w+"), lambda s: s.str.strip().str.fullmatch(r"\w+")),
+    (DF["s"].str.lower().str.contains("b", regex=False), lambda s: s.str.lower().str.contains("b", regex=False)),
+    # Not supported: Evaluated by pandas
+    (DF["s"].str.lower().str.title().str.strip(), lambda s: s.str.lower().str.title().str.strip()),
+    (DF["s"].str.contains("a", na=False), lambda s: s.str.contains("a", na=False)),
+    (DF["s"].str.slice(1).str.upper(), lambda s: s.str.slice(1).str.upper()),
+    (DF["s"].str.strip().str.len() > 2, lambda s: s.str.strip().str.len() > 2),
+]
+
+
+@pytest.fixture
+def strings_df():
+    values = [" xAb ", None, "Xyz_", "  ab  ", "x", "ǅzß", "", "_B"]
+    return pd.DataFrame({"s": values}, index=range(10, 18))
+
+
+@pytest.mark.parametrize("dtype", ARROW_STRING_DTYPES, ids=str)
+@pytest.mark.parametrize("expr, func", CHAINS, ids=[str(i) for i in range(len(CHAINS))])
+def test_arrow_chain_same_result(strings_df, dtype, expr, func):
+    df = strings_df.astype({"s": dtype})
+    pd.testing.assert_series_equal(expr(df), func(df["s"]))
+
+
+def test_arrow_chain_in_one_go(strings_df):
+    s = strings_df["s"].astype("string[pyarrow]")
+    closures = (DF.str.lower().str.strip().str.startswith("x") & DF.str.len())._closures
+    result, n = strings.apply_arrow_chain(s, closures)
+    assert n == 6
+    pd.testing.assert_series_equal(result, s.str.lower().str.strip().str.startswith("x"))
+
+    # Expression arguments are evaluated by the closures
+    result, n = strings.apply_arrow_chain(s, DF.str.strip().str.startswith(DF["p"])._closures)
+    assert n == 2
+    pd.testing.assert_series_equal(result, s.str.strip())
+
+    # Only for Arrow-backed strings
+    assert strings.apply_arrow_chain(s.astype(object), closures)[1] == 0
+    assert strings.apply_arrow_chain(s.astype("string[python]"), closures)[1] == 0
+
+
+def test_trie_pattern():
+    assert strings._trie_pattern(["abc", "abd", "x", "ab"]) == "(?:ab(?:c|d)?|x)"
+    assert strings._trie_pattern(["a.b"]) == r"a\.b"
+    assert strings._trie_pattern(["a", ""]) == ""
+
+
+def test_match_any_pattern_is_cached():
+    pattern = strings.match_any_pattern("substring", ("a", "b"))
+    assert strings.match_any_pattern("substring", ("a", "b")) is pattern
+    assert strings.match_any_pattern("regex", ("a+", "b")) == "(?:a+)|(?:b)"
@@ -0,0 +1,103 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles import DF, S, paddles, threads
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "x": rng.normal(size=200),
+        "y": rng.normal(size=200),
+        "s": rng.choice(["a", "b", "ab"], size=200),
+    })
+
+
+def thread_recorder():
+    seen = {}
+    def record(obj, key):
+        seen[key] = threading.get_ident()
+        return obj
+    return seen, record
+
+
+def test_filter(df):
+    expr = paddles.combine([DF.x.abs() > 0.5, DF.y.clip(upper=1) < 0.5, DF.s.str.contains("a")])
+    with threads.use_threads(max_workers=2):
+        result = df.loc[expr]
+    pd.testing.assert_frame_equal(result, df.loc[expr(df)])
+
+
+def test_args_in_worker_threads(df):
+    seen, record = thread_recorder()
+    expr = (DF.x.pipe(record, 0) > 0) & (DF.y.pipe(record, 1) > 0) & (DF.y.pipe(record, 2) < 1)
+
+    expr(df)
+    assert set(seen.values()) == {threading.get_ident()}
+
+    seen.clear()
+    with threads.use_threads(max_workers=2):
+        expr(df)
+    assert seen[0] == threading.get_ident()
+    assert threading.get_ident() not in (seen[1], seen[2])
+
+
+def test_nested_no_deadlock(df):
+    expr = DF.x.clip(lower=DF.y.clip(lower=DF.x.min() - 1).min(), upper=DF.y.abs().max())
+    with threads.use_threads(max_workers=1):
+        result = expr(df)
+    pd.testing.assert_series_equal(result, expr(df))
+
+
+def test_error_order(df):
+    expr = DF.x.no_such_method() + DF.y.also_missing()
+    with threads.use_threads(max_workers=2):
+        with pytest.raises(AttributeError, match="no_such_method"):
+            expr(df)
+
+
+def test_series_context():
+    s = pd.Series([3.0, -1.0, 2.0])
+    expr = S.clip(lower=S.min() + 1) * S.abs().max()
+    with threads.use_threads(max_workers=2):
+        result = s.pipe(expr)
+    pd.testing.assert_series_equal(result, expr(s))
+
+
+def test_evaluate_all(df):
+    exprs = [DF.x.rank(), DF.y * 2, DF.s.str.len()]
+    with threads.use_threads(max_workers=2):
+        results = threads.evaluate_all(df, exprs)
+    for result, expr in zip(results, exprs):
+        pd.testing.assert_series_equal(result, expr(df))
+
+
+def test_assign(df):
+    kwargs = dict(
+        a=DF.x.rank(),
+        b=DF.y.rolling(5).mean(),
+        x=DF.x * 2,
+        # Uses the new x
+        c=DF.x + 1,
+        d=lambda d: d.c - d.a,
+    )
+    with threads.use_threads(max_workers=2):
+        result = threads.assign(df, **kwargs)
+    pd.testing.assert_frame_equal(result, df.assign(**kwargs))
+
+
+def test_external_executor(df):
+    from concurrent.futures import ThreadPoolExecutor
+
+    expr = (DF.x > 0) & (DF.y.abs() > 0.5)
+    with ThreadPoolExecutor(2) as ex:
+        with threads.use_threads(executor=ex) as used:
+            assert used is ex
+            result = expr(df)
+        # Still usable
+        ex.submit(int).result()
+    pd.testing.assert_series_equal(result, expr(df))
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_paddles import DF, uniques
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    country = rng.choice(np.array(["de_x", " fr", "Us ", "dk"], dtype=object), n)
+    country[[3, 50]] = None
+    return pd.DataFrame({
+        "country": country,
+        "id": np.arange(n).astype(str).astype(object),
+        "x": rng.random(n),
+    }, index=np.arange(n)[::-1])
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(uniques, "min_rows", 10_000)
+
+
+@pytest.fixture
+def no_shortcut():
+    def evaluate(expr, df):
+        min_rows = uniques.min_rows
+        uniques.min_rows = None
+        try:
+            return expr(df)
+        finally:
+            uniques.min_rows = min_rows
+    return evaluate
+
+
+EXPRESSIONS = [
+    DF["country"].str.upper().str.replace("_", "-") == "DE-X",
+    DF["country"].str.strip().str.len() + DF["x"],
+    DF["country"].map({"de_x": 1, "dk": 2}),
+    DF["country"].str.upper().str.strip(),
+    DF["country"].astype(str).str.cat(sep="|"),
+    DF["country"].str.len() > DF["country"].str.strip().str.len().mean(),
+]
+
+
+@pytest.mark.parametrize("dtype", [object, "string[python]", "string[pyarrow]"])
+@pytest.mark.parametrize("expr", EXPRESSIONS, ids=[str(i) for i in range(len(EXPRESSIONS))])
+def test_same_result(df, enabled, no_shortcut, dtype, expr):
+    df = df.astype({"country": dtype})
+    expected = no_shortcut(expr, df)
+    result = expr(df)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+def _counting(counts):
+    def count(value):
+        counts.append(value)
+        return value
+    return count
+
+
+def test_disabled_by_default(df):
+    assert uniques.min_rows is None
+    counts = []
+    DF["country"].map(_counting(counts))(df)
+    # Called for every row, in order
+    assert counts == df["country"].tolist()
+
+
+def test_evaluates_on_uniques(df, enabled):
+    counts = []
+    result = (DF["country"].map(_counting(counts)).str.upper() == "DK")(df)
+    # 4 countries and None
+    assert len(counts) == 5
+    assert result.sum() == (df["country"] == "dk").sum()
+
+
+def test_high_cardinality(df, enabled):
+    counts = []
+    DF["id"].map(_counting(counts))(df)
+    assert len(counts) == len(df)
+
+
+def test_small_frames(df, enabled):
+    counts = []
+    DF["country"].map(_counting(counts))(df.head(100))
+    assert len(counts) == 100
+
+
+def test_unique_prefix():
+    assert uniques.unique_prefix(DF["a"].str.lower().str.strip() == "x") == 6
+    assert uniques.unique_prefix(DF["a"].str.lower() == DF["b"]) == 3
+    assert uniques.unique_prefix(DF["a"].map(str.lower).str) == 2
+    # Nothing worth evaluating on the unique values
+    assert uniques.unique_prefix(DF["a"] == "x") == 0
+    assert uniques.unique_prefix(DF["a"].sum()) == 0
+    assert uniques.unique_prefix(DF.sum()) == 0
+
+
+def test_factorize_mixed_missing_values():
+    assert uniques.factorize(np.array(["a", None, np.nan, "a"], dtype=object)) is None
+    codes, values = uniques.factorize(np.array(["a", None, "b", None], dtype=object))
+    assert codes.tolist() == [0, 2, 1, 2]
+    assert values.tolist() == ["a", "b", None]